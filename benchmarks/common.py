@@ -0,0 +1,163 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+性能测试公共函数，可以在主机 (CPython) 和设备 (MicroPython) 上运行
+"""
+import gc
+import sys
+
+
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+# 主机上始终使用实际时间计时，不使用模拟器的虚拟时钟
+if IS_MICROPYTHON:
+	from utime import ticks_us, ticks_diff
+
+	tracemalloc = None
+else:
+	from time import perf_counter_ns
+	import tracemalloc
+
+	def ticks_us():
+		return perf_counter_ns() // 1000
+
+	def ticks_diff(end, start):
+		return end - start
+
+
+def setup_path():
+	'''在主机上运行时将项目根目录加入模块搜索路径'''
+	if IS_MICROPYTHON:
+		return
+
+	import os
+	root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+	if root not in sys.path:
+		sys.path.insert(0, root)
+
+def setup_hardware(world_time:int=None):
+	'''
+	在主机上运行时使用模拟器代替固件模块，返回模拟开发板，设备上返回 None
+
+	参数：
+	- world_time：模拟的 UTC 时间（从 2000 年开始的秒数），默认使用电脑当前时间
+	'''
+	if IS_MICROPYTHON:
+		return None
+
+	setup_path()
+
+	import simulator
+	return simulator.install(world_time=world_time)
+
+def private_name(name:str) -> str:
+	'''获取类私有成员的实际名称，模拟器会统一改写 __xxx 名称'''
+	if IS_MICROPYTHON:
+		return name
+
+	from simulator.loader import PRIVATE_PREFIX
+	return PRIVATE_PREFIX + name
+
+def measure_time(func, count:int, *params) -> float:
+	'''测量函数平均执行时长，单位 微秒'''
+	func(*params)
+	gc.collect()
+
+	start = ticks_us()
+	for _ in range(count):
+		func(*params)
+
+	return ticks_diff(ticks_us(), start) / count
+
+def measure_alloc(func, count:int, *params) -> float:
+	'''
+	测量函数单次调用分配的内存，单位 字节
+
+	- 设备上关闭 gc 后统计 gc.mem_alloc() 的增量
+	- 主机上使用 tracemalloc 统计单次调用的内存峰值增量
+	'''
+	func(*params)
+	gc.collect()
+
+	if IS_MICROPYTHON:
+		gc.disable()
+		before = gc.mem_alloc()
+
+		for _ in range(count):
+			func(*params)
+
+		after = gc.mem_alloc()
+		gc.enable()
+		gc.collect()
+
+		return (after - before) / count
+
+	if tracemalloc is None:
+		return -1
+
+	tracemalloc.start()
+	peak = 0
+
+	for _ in range(count):
+		tracemalloc.reset_peak()
+		before = tracemalloc.get_traced_memory()[0]
+		func(*params)
+		peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+
+	tracemalloc.stop()
+
+	return peak
+
+def bench(name:str, func, count:int=1000, *params) -> dict:
+	'''测量函数执行时长和内存分配'''
+	return {
+		'name'  : name,
+		'us'    : measure_time(func, count, *params),
+		'bytes' : measure_alloc(func, min(count, 20), *params),
+	}
+
+def report(results:list):
+	'''输出测试结果'''
+	print(f'{"benchmark":<40}{"us/call":>12}{"bytes/call":>12}')
+
+	for result in results:
+		print(f'{result["name"]:<40}{result["us"]:>12.2f}{result["bytes"]:>12.1f}')
+
+def check_budgets(results:list, budgets:dict) -> list:
+	'''
+	检查测试结果是否超出预算，返回超出预算的说明列表
+
+	参数：
+	- budgets：{name: (最长时长 us, 最多分配 bytes)}，设置为 None 的项目不检查
+	'''
+	failures = []
+
+	for result in results:
+		max_us, max_bytes = budgets.get(result['name'], (None, None))
+
+		if max_us is not None and result['us'] > max_us:
+			failures.append(f'{result["name"]}: {result["us"]:.2f} us/call > {max_us} us')
+
+		if max_bytes is not None and result['bytes'] > max_bytes:
+			failures.append(f'{result["name"]}: {result["bytes"]:.1f} bytes/call > {max_bytes} bytes')
+
+	return failures
+
+def dump_json(results:list, failures:list=(), path:str=None):
+	'''以 json 格式输出测试结果，path 为 None 时输出到终端'''
+	import json
+
+	content = json.dumps({
+		'implementation': sys.implementation.name,
+		'platform'      : sys.platform,
+		'results'       : results,
+		'failures'      : list(failures),
+	})
+
+	if path is None:
+		print(content)
+	else:
+		with open(path, 'w') as output:
+			output.write(content)
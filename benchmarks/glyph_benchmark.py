@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+对比时钟模式数字的字符串绘制方法和位图掩码绘制方法
+
+主机上运行：python3 benchmarks/glyph_benchmark.py
+"""
+from common import setup_path, bench, report
+
+setup_path()
+
+from array import array
+from matrix.blitter import Blitter
+
+
+# 与 ModelClock 相同的分区和字形
+HOUR_TENS_RANGE = (range(0, 5), range(6, 11), range(12, 17))
+HOUR_ONES_RANGE = (range(24, 29), range(30, 35), range(36, 41))
+MINUTE_TENS_RANGE = range(48, 53)
+MINUTE_ONES_RANGE = (5, 11, 17, 23, 29, 35, 41, 47, 53)
+NUMBERS_GLYPH = (0x7e3f, 0x27e1, 0x5ebd, 0x56bf, 0x709f, 0x76b7, 0x7eb7, 0x421f, 0x7ebf, 0x76bf)
+
+BLACK       = (0, 0, 0)
+HOUR        = (204, 204, 204)
+MINUTE_TENS = (16, 76, 151)
+MINUTE_ONES = ((123, 164, 40), (51, 179, 166), (148, 68, 168))
+
+HOUR_VALUE   = 13
+MINUTE_VALUE = 35
+
+
+class PixelBuffer(object):
+	'''与 neopixel.NeoPixel 相同的像素写入方法'''
+	ORDER = (1, 0, 2, 3)
+
+	def __init__(self, n:int, bpp:int=3):
+		self.n = n
+		self.bpp = bpp
+		self.buf = bytearray(n * bpp)
+
+	def __setitem__(self, index, value):
+		offset = index * self.bpp
+		for channel in range(self.bpp):
+			self.buf[offset + self.ORDER[channel]] = value[channel]
+
+
+def legacy_refresh():
+	'''原有的绘制方法'''
+	hour = f'{HOUR_VALUE:0>2}'
+	hour_tens = f'{NUMBERS_GLYPH[int(hour[0])]:0>15b}'
+	hour_ones = f'{NUMBERS_GLYPH[int(hour[1])]:0>15b}'
+
+	for index, bit in enumerate(hour_tens):
+		pixels[hour_tens_list[index]] = HOUR if bit == '1' else BLACK
+
+	for index, bit in enumerate(hour_ones):
+		pixels[hour_ones_list[index]] = HOUR if bit == '1' else BLACK
+
+	minute = f'{MINUTE_VALUE:0>2}'
+	minute_tens = int(minute[0])
+	minute_ones = int(minute[1])
+
+	minute_ones_colors = {
+		0: MINUTE_ONES[0],
+		1: MINUTE_ONES[1],
+		2: MINUTE_ONES[2]
+	}
+
+	for count, index in enumerate(minute_tens_list):
+		pixels[index] = MINUTE_TENS if count < minute_tens else BLACK
+
+	for count, index in enumerate(minute_ones_list):
+		minute_ones_color = minute_ones_colors[int((count + 1) // 3.1)]
+		pixels[index] = minute_ones_color if count < minute_ones else BLACK
+
+def blitter_refresh():
+	'''位图掩码绘制方法'''
+	blitter.blit(hour_tens_table, NUMBERS_GLYPH[HOUR_VALUE // 10], HOUR)
+	blitter.blit(hour_ones_table, NUMBERS_GLYPH[HOUR_VALUE % 10], HOUR)
+
+	minute_ones = MINUTE_VALUE % 10
+
+	blitter.blit_bar(minute_tens_table, MINUTE_VALUE // 10, MINUTE_TENS)
+	blitter.blit_bar(minute_ones_groups[0], minute_ones, MINUTE_ONES[0])
+	blitter.blit_bar(minute_ones_groups[1], minute_ones - 3, MINUTE_ONES[1])
+	blitter.blit_bar(minute_ones_groups[2], minute_ones - 6, MINUTE_ONES[2])
+
+
+hour_tens_list = [index for _ in HOUR_TENS_RANGE for index in _]
+hour_ones_list = [index for _ in HOUR_ONES_RANGE for index in _]
+minute_tens_list = list(MINUTE_TENS_RANGE)
+minute_ones_list = list(MINUTE_ONES_RANGE)
+
+hour_tens_table = array('H', hour_tens_list)
+hour_ones_table = array('H', hour_ones_list)
+minute_tens_table = array('H', minute_tens_list)
+minute_ones_groups = tuple(array('H', minute_ones_list[index:index + 3]) for index in range(0, 9, 3))
+
+pixels  = PixelBuffer(54)
+blitter = Blitter(memoryview(pixels.buf), pixels.bpp, pixels.ORDER)
+
+
+if __name__ == '__main__':
+	legacy_refresh()
+	legacy_frame = bytes(pixels.buf)
+
+	pixels.buf[:] = bytes(len(pixels.buf))
+	blitter_refresh()
+	assert legacy_frame == bytes(pixels.buf), 'blitter output differs from legacy output'
+
+	report([
+		bench('clock refresh (legacy strings)', legacy_refresh, 1000),
+		bench('clock refresh (bitmask blitter)', blitter_refresh, 1000),
+	])
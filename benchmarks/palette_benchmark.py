@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+对比颜色亮度转换的 hsv 计算方法和查找表方法
+
+主机上运行：python3 benchmarks/palette_benchmark.py
+"""
+from common import setup_path, bench, report
+
+setup_path()
+
+from matrix.palette import Palette, hsv_convert
+
+
+# 与 config.py 中 COLORS 相同的颜色
+COLORS = (
+	(0, 0, 0), (255, 255, 255), (2, 79, 195), (204, 0, 0), (54, 54, 54),
+	(9, 171, 255), (121, 234, 0), (154, 205, 50), (64, 224, 208), (186, 85, 211),
+	(1, 121, 111), (2, 2, 2), (2, 3, 0), (21, 96, 189), (229, 43, 80), (255, 32, 82)
+)
+MAX_PERCENT = 80
+PERCENT = 40
+
+
+def convert_hsv():
+	for color in COLORS:
+		hsv_convert(color, PERCENT, MAX_PERCENT)
+
+def convert_palette():
+	for color in COLORS:
+		palette.convert(color)
+
+def rebuild_palette():
+	global percent
+	percent = percent % 100 + 1
+	palette.update(percent, MAX_PERCENT)
+
+def max_deviation() -> int:
+	'''统计两种方法转换结果的最大差值'''
+	result = 0
+
+	for percent in range(1, 101):
+		palette.update(percent, MAX_PERCENT)
+
+		for color in COLORS:
+			for expected, actual in zip(hsv_convert(color, percent, MAX_PERCENT), palette.convert(color)):
+				result = max(result, abs(expected - actual))
+
+	return result
+
+
+palette = Palette()
+percent = PERCENT
+
+
+if __name__ == '__main__':
+	deviation = max_deviation()
+	palette.update(PERCENT, MAX_PERCENT)
+
+	report([
+		bench(f'hsv convert ({len(COLORS)} colors)', convert_hsv, 1000),
+		bench(f'palette convert ({len(COLORS)} colors)', convert_palette, 1000),
+		bench('palette rebuild', rebuild_palette, 100),
+	])
+
+	print(f'max deviation between hsv and palette: {deviation}')
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+对比像素操作的纯 Python 实现和 viper/native 实现，
+主机上只测试纯 Python 实现，设备固件支持时同时测试 viper/native 实现
+
+主机上运行：python3 benchmarks/pixelops_benchmark.py
+"""
+from common import setup_path, bench, report
+
+setup_path()
+
+from array import array
+from matrix import pixelops
+
+
+LED_COUNT = 54
+BPP       = 3
+ORDER     = (1, 0, 2, 3)
+
+GLYPH     = 0x7ebf
+INDICES   = array('H', range(0, 15))
+LIT_MASK  = array('H', range(0, LED_COUNT, 2))
+PIXEL     = bytes((171, 9, 255))
+BLACK     = bytes(BPP)
+TABLE     = bytes(index * 80 // 100 for index in range(256)) * BPP
+START     = (255, 0, 0)
+END       = (0, 0, 255)
+STEPS     = 10
+WEIGHT    = 100
+
+buffer = memoryview(bytearray(LED_COUNT * BPP))
+output = bytearray(LED_COUNT * BPP)
+colors = bytearray(STEPS * BPP)
+layer  = bytes(range(LED_COUNT * BPP))
+alpha  = bytes(index * 255 // (LED_COUNT - 1) for index in range(LED_COUNT))
+
+
+def run_benchmarks(prefix:str, ops:tuple) -> list:
+	fill, paint, blit_mask, scale, interpolate, composite, blend = ops
+
+	return [
+		bench(f'{prefix} fill', fill, 1000, buffer, PIXEL),
+		bench(f'{prefix} paint ({len(LIT_MASK)} pixels)', paint, 1000, buffer, LIT_MASK, PIXEL),
+		bench(f'{prefix} blit_mask (15 pixels)', blit_mask, 1000, buffer, INDICES, GLYPH, PIXEL, BLACK),
+		bench(f'{prefix} scale', scale, 1000, output, buffer, TABLE, BPP),
+		bench(f'{prefix} interpolate ({STEPS} steps)', interpolate, 1000, colors, 0, START, END, STEPS, ORDER, BPP),
+		bench(f'{prefix} composite', composite, 1000, output, layer, alpha, BPP),
+		bench(f'{prefix} blend', blend, 1000, output, buffer, layer, WEIGHT),
+	]
+
+
+if __name__ == '__main__':
+	results = run_benchmarks('python', pixelops.PYTHON_OPS)
+
+	if pixelops.NATIVE_OPS is not None:
+		# 两种实现的结果必须相同
+		for ops in (pixelops.PYTHON_OPS, pixelops.NATIVE_OPS):
+			ops[0](buffer, BLACK)
+			ops[2](buffer, INDICES, GLYPH, PIXEL, BLACK)
+			ops[1](buffer, LIT_MASK[8:], PIXEL)
+			ops[3](output, buffer, TABLE, BPP)
+			ops[4](colors, 0, START, END, STEPS, ORDER, BPP)
+			ops[5](output, layer, alpha, BPP)
+			ops[6](output, output, layer, WEIGHT)
+
+			if ops is pixelops.PYTHON_OPS:
+				expected = (bytes(output), bytes(colors))
+
+		assert expected == (bytes(output), bytes(colors)), 'native output differs from python output'
+
+		results += run_benchmarks('native', pixelops.NATIVE_OPS)
+	else:
+		print('native emitter not available, only python implementation tested\n')
+
+	report(results)
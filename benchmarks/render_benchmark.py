@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+测试显示刷新相关函数的执行时长和内存分配，超出预算时返回失败
+
+主机上使用模拟器代替固件模块运行：
+	python3 benchmarks/render_benchmark.py [--json results.json] [--no-budgets]
+
+设备上上传 benchmarks 目录中的 common.py 和本文件后，在 REPL 中运行：
+	import render_benchmark
+	render_benchmark.run()
+"""
+import sys
+
+from common import IS_MICROPYTHON, setup_hardware, private_name, bench, report, check_budgets, dump_json
+
+# 主机上模拟的时间为 2023-06-01 05:35:20 UTC，校时后为 13:35:20，刷新时间不会触发整点报时或消除动画
+board = setup_hardware(world_time=738999320)
+
+from utime import ticks_ms, ticks_add
+
+try:
+	from matrix.matrix_clock import MatrixClock
+except ImportError:
+	MatrixClock = __import__('matrix/matrix_clock').MatrixClock
+
+try:
+	from matrix.animation import Animation
+except ImportError:
+	Animation = __import__('matrix/animation').Animation
+
+try:
+	from matrix.keyframes import Keyframes
+except ImportError:
+	Keyframes = __import__('matrix/keyframes').Keyframes
+
+try:
+	from utils.dispatcher import Dispatcher
+except ImportError:
+	Dispatcher = __import__('utils/dispatcher').Dispatcher
+
+try:
+	from utils.utilities import Utilities
+except ImportError:
+	Utilities = __import__('utils/utilities').Utilities
+
+
+CONFIG = Utilities.import_config()
+
+# 调度器测试的任务数量
+WORKER_COUNTS = (1, 4, 16)
+
+'''
+预算：{name: (最长时长 us, 最多分配 bytes)}，设置为 None 的项目不检查
+
+主机的预算只用于发现明显的退化，设备的时长预算按照 ESP32-C3 160MHz 估算，
+在设备上实测后应根据结果收紧；关键帧动画的一帧（计算、合成和输出）需要在
+MatrixClock.KEYFRAME_FPS 对应的帧周期内完成，并为其它任务留出余量
+'''
+HOST_BUDGETS = {
+	'MatrixClock.show_time'          : (400, 2048),
+	'MatrixClock.show_calendar_1'    : (400, 2048),
+	'MatrixClock.show_calendar_2'    : (400, 2048),
+	'MatrixClock.switch_display_mode': (400, 8192),
+	'MatrixClock.__show_animation_cb': (200, 1024),
+	'KeyframePlayer.__render_cb'     : (200, 1024),
+	'Keyframes.render'               : (100, 512),
+	'WS2812.output_color'            : (10, 256),
+	'Animation.get_frame_and_color'  : (10, 256),
+	'Dispatcher.__worker_callback/1' : (50, 1024),
+	'Dispatcher.__worker_callback/4' : (100, 1024),
+	'Dispatcher.__worker_callback/16': (300, 2048),
+}
+
+DEVICE_BUDGETS = {
+	'MatrixClock.show_time'          : (6000, 256),
+	'MatrixClock.show_calendar_1'    : (6000, 256),
+	'MatrixClock.show_calendar_2'    : (8000, 512),
+	'MatrixClock.switch_display_mode': (8000, 2048),
+	'MatrixClock.__show_animation_cb': (3000, 64),
+	'KeyframePlayer.__render_cb'     : (5000, 64),
+	'Keyframes.render'               : (1500, 32),
+	'WS2812.output_color'            : (60, 32),
+	'Animation.get_frame_and_color'  : (60, 32),
+	'Dispatcher.__worker_callback/1' : (300, 128),
+	'Dispatcher.__worker_callback/4' : (800, 256),
+	'Dispatcher.__worker_callback/16': (3000, 1024),
+}
+
+
+def forced(clock:MatrixClock, show):
+	'''每次调用前使显示内容失效，保证测试包含输出过程'''
+	invalidate = clock.invalidate
+
+	def run():
+		invalidate()
+		show()
+
+	return run
+
+def bench_clock() -> list:
+	results = []
+	clock = MatrixClock(timer_id=None)
+	clock.hourly_chime = False
+
+	# 不限制帧率，每次调用都包含完整的输出过程
+	clock.max_fps = None
+
+	# 先刷新一次，记录当前小时和分钟
+	clock.switch_working_mode(MatrixClock.MODE_CLOCK)
+	clock.show_time()
+	results.append(bench('MatrixClock.show_time', forced(clock, clock.show_time), 200))
+
+	# 在时钟和台历1之间切换，两种模式的画面缓存后切换只复制像素数据
+	setattr(clock, private_name('__time_synced'), True)
+	clock.start()
+	results.append(bench('MatrixClock.switch_display_mode', clock.switch_display_mode, 50))
+	clock.stop()
+
+	clock.switch_working_mode(MatrixClock.MODE_CALENDAR_1)
+	results.append(bench('MatrixClock.show_calendar_1', forced(clock, clock.show_calendar_1), 200))
+
+	clock.switch_working_mode(MatrixClock.MODE_CALENDAR_2)
+	results.append(bench('MatrixClock.show_calendar_2', forced(clock, clock.show_calendar_2), 200))
+
+	getattr(clock, private_name('__animation')).select_animation(Animation.HEARTBEAT, (CONFIG.COLORS.RED,))
+	clock.overlay.set_opaque()
+	show_animation_cb = getattr(clock, private_name('__show_animation_cb'))
+	results.append(bench('MatrixClock.__show_animation_cb', forced(clock, show_animation_cb), 200))
+	clock.overlay.visible = False
+
+	# 交叉淡入淡出的一帧，时长足够长，测试期间不会结束
+	crossfade = getattr(clock, private_name('__minute_crossfade'))
+	crossfade.play(clock.effects, Keyframes(bytes(clock.buffer)).add(bytearray(len(clock.buffer)), 3_600_000))
+	crossfade_render_cb = getattr(crossfade, private_name('__render_cb'))
+	results.append(bench('KeyframePlayer.__render_cb', forced(clock, crossfade_render_cb), 200))
+	crossfade.stop()
+
+	# 颜色经过亮度查找表转换为实际输出的颜色，每次返回新的 tuple
+	results.append(bench('WS2812.output_color', clock.output_color, 1000, CONFIG.COLORS.TIME_HOUR))
+
+	clock.stop()
+	clock.tasks.deinit()
+
+	return results
+
+def bench_animation() -> list:
+	animation = Animation()
+	animation.select_animation(Animation.CONNECT_WIFI, (CONFIG.COLORS.SKYBLUE, CONFIG.COLORS.LIGHTGREEN, CONFIG.COLORS.BLUE))
+
+	# 菜单动画转换的关键帧序列，测试中间帧的插值
+	animation.select_animation(Animation.MENU_CLOCK, (CONFIG.COLORS.SKYBLUE,))
+	keyframes = animation.to_keyframes()
+	output = bytearray(54 * 3) # Animation 默认的灯珠数量和字节数
+
+	return [
+		bench('Animation.get_frame_and_color', animation.get_frame_and_color, 1000),
+		bench('Keyframes.render', keyframes.render, 1000, output, keyframes.duration // 2),
+	]
+
+def bench_dispatcher(count:int) -> dict:
+	'''
+	每次调用定时器回调前将调度器内部时钟的上次读数回退 1 毫秒，
+	保证所有间隔 1 毫秒的任务在每次回调中都会执行，结果包含回退时钟的少量开销
+	'''
+	dispatcher = Dispatcher(timer_id=None)
+	worker_callback = getattr(dispatcher, private_name('__worker_callback'))
+	last_ticks = private_name('__last_ticks')
+
+	def make_work():
+		def work():
+			pass
+
+		return work
+
+	for _ in range(count):
+		dispatcher.add_work(make_work(), 1)
+
+	def run():
+		setattr(dispatcher, last_ticks, ticks_add(ticks_ms(), -1))
+		worker_callback(None)
+
+	result = bench(f'Dispatcher.__worker_callback/{count}', run, 500)
+	dispatcher.deinit()
+
+	return result
+
+def collect() -> list:
+	results = bench_clock() + bench_animation()
+
+	for count in WORKER_COUNTS:
+		results.append(bench_dispatcher(count))
+
+	return results
+
+def run(budgets:dict=None, json_path:str=None, json_output:bool=True) -> bool:
+	'''
+	运行全部测试，输出结果，全部在预算以内时返回 True
+
+	参数：
+	- budgets：预算，默认按照运行平台选择 HOST_BUDGETS 或 DEVICE_BUDGETS
+	- json_path：json 结果文件路径，默认输出到终端
+	- json_output：是否输出 json 结果
+	'''
+	if budgets is None:
+		budgets = DEVICE_BUDGETS if IS_MICROPYTHON else HOST_BUDGETS
+
+	if IS_MICROPYTHON:
+		results = collect()
+	else:
+		import contextlib
+		import io
+
+		# 被测代码的打印信息不混入测试结果
+		with contextlib.redirect_stdout(io.StringIO()):
+			results = collect()
+
+	failures = check_budgets(results, budgets)
+
+	report(results)
+
+	for failure in failures:
+		print(f'over budget: {failure}')
+
+	if json_output:
+		dump_json(results, failures, json_path)
+
+	return not failures
+
+
+if __name__ == '__main__':
+	if IS_MICROPYTHON:
+		passed = run()
+	else:
+		import argparse
+
+		parser = argparse.ArgumentParser(description='render path benchmarks')
+		parser.add_argument('--json', default=None, help='write json results to this file (default: print to stdout)')
+		parser.add_argument('--no-budgets', action='store_true', help='report results without checking budgets')
+		args = parser.parse_args()
+
+		passed = run({} if args.no_budgets else None, args.json)
+
+	sys.exit(0 if passed else 1)
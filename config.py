@@ -20,10 +20,19 @@ esp32.RMT.bitstream_channel(0)
 class Config(object):
 	TIMEZONE = 8
 
+	# 使用 asyncio 运行所有任务，联网和校时期间不会阻塞屏幕显示和按键
+	ASYNC_RUNTIME = False
+
 	class BRIGHTNESS(object):
 		# 根据实际情况设置亮度最大值百分比，取值范围 (1~100)
 		MAX = 80
 
+		# gamma 校正值，None 表示不做校正（例如 2.2）
+		GAMMA = None
+
+		# 白平衡，(r, g, b) 各通道亮度百分比，None 表示不做调整（例如 (100, 90, 80)）
+		WHITE_BALANCE = None
+
 
 	class PINS(object):
 		BRIGHTNESS_ADC = 1
@@ -49,16 +58,36 @@ class Config(object):
 			KEY_BOOT: 'BOOT'
 		}
 
+		IRQ_MODE = True # 使用引脚中断检测按键，空闲时停止扫描
+
 
 	class PERIOD(object):
-		UPDATE_ADC_MS     = 100    # 光敏电阻检测间隔时间
+		UPDATE_ADC_MS     = 100    # 光敏电阻检测间隔时间，每次检测采样一次
 		SWITCH_DISPLAY_MS = 20_000 # 临时切换显示内容持续时长
 
 
 	class WS2812_MATRIX(object):
+		# 单块面板安装后的显示尺寸
 		HEIGHT = ROWS = 6
 		WIDTH = COLUMNS = 9
 
+		# 面板布线和拼接方式，详见 matrix/geometry.py，修改后第一次启动会重新编译表盘
+		WIRING          = 'columns' # 面板内灯珠排列方式，'columns' 按列，'rows' 按行
+		SERPENTINE      = False     # 相邻的列（行）方向相反
+		ROTATION        = 0         # 面板安装角度，顺时针 0/90/180/270 度
+		MIRROR_X        = False     # 水平镜像
+		MIRROR_Y        = False     # 垂直镜像
+		TILES           = (1, 1)    # 面板拼接数量 (横向, 纵向)
+		TILE_SERPENTINE = False     # 面板按行串联，相邻行方向相反
+		OUTPUTS         = None      # 每路输出串联的面板数量，例如 (1, 1)，此时 PINS.DIN_MATRIX 设置为引脚 tuple
+
+		# 使用 esp32.RMT 异步发送像素数据，每路输出一个通道，例如 (1,)，不能使用上面 bitstream_channel() 设置的通道
+		# 异步发送时上一帧发送期间可以继续准备下一帧，但需要额外的内存保存脉冲数据（每个灯珠约 200 字节），None 为阻塞发送
+		RMT_CHANNELS    = None
+
+		# 最高帧率，同一帧周期内的多次刷新合并为一次输出，None 为不限制
+		MAX_FPS         = 50
+
 
 	# https://www.colorhexa.com/color-names
 	# https://www.rapidtables.com/web/color/RGB_Color.html
@@ -5,10 +5,28 @@ Gitee: https://gitee.com/walkline/micropython-drivers
 
 # IMPORTANT: THIS MODULE ONLY TESTED ON ESP32 & ESP32C3 BOARD
 """
-__version__ = 'v1.2'
+__version__ = 'v1.7'
 
 from machine import Pin, Timer
-from utime import ticks_ms
+from utime import ticks_ms, ticks_diff
+from array import array
+
+# GPIO 输入寄存器地址，可以一次读取 GPIO0~31 的电平
+try:
+	from machine import mem32
+	from os import uname
+
+	__machine = uname().machine
+
+	if 'ESP32C3' in __machine:
+		GPIO_IN_REG = 0x6000403C
+	elif 'ESP32' in __machine and 'ESP32S' not in __machine:
+		GPIO_IN_REG = 0x3FF4403C
+	else:
+		GPIO_IN_REG = None
+except ImportError:
+	mem32 = None
+	GPIO_IN_REG = None
 
 
 class ButtonException(BaseException):
@@ -34,6 +52,23 @@ class Button(object):
 	    timeout:	长按触发超时时间（ms）
 		default:	按键未按下时状态，高电平或低电平
 		behavior:	长按触发模式选择
+		timer_id:	扫描定时器 ID，设置为 None 时需要手动调用 timer_callback() 或运行 run_async()
+		irq:		使用引脚中断检测按键，只在按键按下期间启动扫描定时器
+		debounce:	中断模式下的消抖时长（ms）
+		queue_size:	事件队列长度，大于 0 时按键事件写入队列，在中断外调用 get_event() 读取
+		double_click:	双击间隔时长（ms），0 表示不检测双击
+		repeat:		长按后持续按住时重复触发的间隔时长（ms），0 表示不重复触发
+		chords:		组合键列表，每个组合键为引脚元组，如 ((2, 3),)
+
+	按键状态使用整型位掩码保存，第 n 位对应第 n 个按键，
+	所有按键均未按下并且状态已复位时扫描直接返回
+
+	事件队列中每个事件为 (event, pin, value)：
+	    EVENT_CLICK:		单击，value 为 0
+	    EVENT_DOUBLE_CLICK:	双击，value 为 0
+	    EVENT_LONG_PRESS:	长按，value 为按下时长（ms）
+	    EVENT_REPEAT:		长按后持续按住，value 为重复次数
+	    EVENT_CHORD:		组合键，pin 为组合键第一个引脚，value 为组合键序号
 	"""
 
 	# __BUTTON_RESPONSE_INTERVAL = 20 # 目前使用定时器实现按钮点击并不需要消除抖动
@@ -50,44 +85,54 @@ class Button(object):
 	# trigger long press after release button
 	BEHAVIOR_RELEASE = 1
 
+	SCAN_PERIOD = 20
+
+	EVENT_CLICK        = 1
+	EVENT_DOUBLE_CLICK = 2
+	EVENT_LONG_PRESS   = 3
+	EVENT_REPEAT       = 4
+	EVENT_CHORD        = 5
+
 	def __init__(self, pin=None, hold_cb=None, release_cb=None, click_cb=None, press_cb=None,
 				 timeout=3000,
 				 default=DEFAULT_HIGH,
 				 behavior=BEHAVIOR_HOLD,
-				 timer_id=10):
+				 timer_id=10,
+				 irq=False,
+				 debounce=20,
+				 queue_size=0,
+				 double_click=0,
+				 repeat=0,
+				 chords=None):
 		assert pin is not None, ButtonException('pin must be specified')
 		assert hold_cb is not None or \
 			   release_cb is not None or\
 			   click_cb is not None or\
-			   press_cb is not None, ButtonException('at least set one event callback')
+			   press_cb is not None or\
+			   queue_size > 0, ButtonException('at least set one event callback or event queue')
 
 		self.button_list = []
 		self.__pin_list = []
-		self.__button_holding_list = []
-		self.__button_status_list = []
-		self.__is_button_holding_list = []
-		self.__button_pressed_list = []
-		self.__last_ticks_list = []
+		self.__last_ticks = array('L')
+
+		self.__holding_mask = 0		# bit set: holding, clear: releasing
+		self.__status_mask = 0		# bit set: holded, clear: released
+		self.__pressed_mask = 0		# bit set: pressed once, clear: never pressed
+		self.__is_holding_mask = 0	# bit set: hold_cb fired, clear: release_cb fired
+		self.__click_mask = 0		# bit set: waiting for double click
+		self.__chord_mask = 0		# bit set: consumed by a fired chord
+
+		self.__click_ticks = array('L')
+		self.__repeat_counts = array('H')
+
+		# 输入寄存器中按键对应的位，为 0 时逐个读取引脚
+		self.__gpio_mask = 0
+		self.__gpio_default = 0
 
 		self.__default = default
 
-		if isinstance(pin, (list, tuple)):
-			for _ in pin:
-				self.button_list.append(Pin(_, Pin.IN, Pin.PULL_UP if self.__default else Pin.PULL_DOWN))
-				self.__pin_list.append(_)
-				self.__button_holding_list.append(False)	# true: holding, false: releasing
-				self.__button_status_list.append(False)		# true: holded, false: released
-				self.__button_pressed_list.append(False)	# true: pressed once, false: never pressed
-				self.__is_button_holding_list.append(False)	# true: holded, false: released
-				self.__last_ticks_list.append(ticks_ms())
-		else:
-			self.button_list.append(Pin(pin, Pin.IN, Pin.PULL_UP if self.__default else Pin.PULL_DOWN))
-			self.__pin_list.append(pin)
-			self.__button_holding_list.append(False)
-			self.__button_status_list.append(False)
-			self.__button_pressed_list.append(False)
-			self.__is_button_holding_list.append(False)
-			self.__last_ticks_list.append(ticks_ms())
+		for _ in pin if isinstance(pin, (list, tuple)) else (pin,):
+			self.__append_button(_)
 
 		self.__click_cb = click_cb		# button clicked callback
 		self.__press_cb = press_cb		# button pressed callback
@@ -95,18 +140,54 @@ class Button(object):
 		self.__release_cb = release_cb	# button released callback
 		self.__timeout = timeout		# press callback acting if timed out
 		self.__behavior = behavior
+		self.__timer = None
+
+		self.__double_click = double_click
+		self.__repeat = repeat
+
+		# 组合键按照按键序号转换为位掩码
+		self.__chords = []
+		self.__chord_pins = []
+
+		for chord in chords or ():
+			mask = 0
+
+			for _ in chord:
+				assert _ in self.__pin_list, ButtonException(f'chord pin {_} not found')
+				mask |= 1 << self.__pin_list.index(_)
+
+			self.__chords.append(mask)
+			self.__chord_pins.append(chord[0])
+
+		# 预先分配的单生产者单消费者事件队列，扫描时只写入不分配内存
+		self.__event_types  = bytearray(queue_size + 1)
+		self.__event_pins   = bytearray(queue_size + 1)
+		self.__event_values = array('L', [0] * (queue_size + 1))
+		self.__event_head = 0
+		self.__event_tail = 0
+		self.__events_dropped = 0
+
+		# 中断模式下只在按键按下期间扫描
+		self.__irq = irq
+		self.__debounce = debounce
+		self.__scanning = not irq
+		self.__edge_ticks = ticks_ms()
+
+		if irq:
+			for button in self.button_list:
+				self.__enable_irq(button)
 
 		if timer_id is not None:
 			self.__timer = Timer(timer_id)
 
-			self.__timer.init(
-				mode=Timer.PERIODIC,
-				period=20,
-				callback=self.timer_callback
-			)
+			if not irq:
+				self.__start_scan()
 
 	def deinit(self):
 		for _ in self.button_list:
+			if self.__irq:
+				_.irq(handler=None)
+
 			_ = None
 
 		if self.__timer is not None:
@@ -114,57 +195,263 @@ class Button(object):
 			self.__timer = None
 
 	def add_button(self, pin):
+		self.__append_button(pin)
+
+		if self.__irq:
+			self.__enable_irq(self.button_list[-1])
+
+	def __append_button(self, pin):
 		self.button_list.append(Pin(pin, Pin.IN, Pin.PULL_UP if self.__default else Pin.PULL_DOWN))
 		self.__pin_list.append(pin)
-		self.__button_holding_list.append(False)
-		self.__button_status_list.append(False)
-		self.__button_pressed_list.append(False)
-		self.__is_button_holding_list.append(False)
-		self.__last_ticks_list.append(ticks_ms())
+		self.__last_ticks.append(ticks_ms())
+		self.__click_ticks.append(0)
+		self.__repeat_counts.append(0)
+
+		# 所有引脚都在输入寄存器范围内才使用寄存器读取
+		if GPIO_IN_REG is not None and isinstance(pin, int) and 0 <= pin < 32 and\
+		   (self.__gpio_mask or len(self.__pin_list) == 1):
+			self.__gpio_mask |= 1 << pin
+
+			if self.__default:
+				self.__gpio_default |= 1 << pin
+		else:
+			self.__gpio_mask = 0
+			self.__gpio_default = 0
 
-	def __time_diff(self, index):
-		return ticks_ms() - self.__last_ticks_list[index]
+	def __enable_irq(self, button:Pin):
+		button.irq(trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING, handler=self.__irq_callback)
+
+	def __irq_callback(self, pin):
+		'''引脚电平变化时记录时间，并在空闲时启动扫描'''
+		self.__edge_ticks = ticks_ms()
+
+		if not self.__scanning:
+			self.__scanning = True
+			self.__start_scan()
+
+	def __start_scan(self):
+		if self.__timer is not None:
+			self.__timer.init(
+				mode=Timer.PERIODIC,
+				period=Button.SCAN_PERIOD,
+				callback=self.timer_callback
+			)
+
+	def __is_idle(self) -> bool:
+		'''所有按键均已释放并且状态已复位'''
+		return not (self.__holding_mask | self.__status_mask | self.__pressed_mask |
+					self.__is_holding_mask | self.__click_mask)
+
+	def __read_buttons(self) -> int:
+		'''读取所有按键，返回按下状态位掩码'''
+		holding = 0
+
+		if self.__gpio_mask:
+			gpio = (mem32[GPIO_IN_REG] ^ self.__gpio_default) & self.__gpio_mask
+
+			if gpio:
+				for index, pin in enumerate(self.__pin_list):
+					if gpio >> pin & 1:
+						holding |= 1 << index
+		else:
+			default = self.__default
+
+			for index, button in enumerate(self.button_list):
+				if button.value() != default:
+					holding |= 1 << index
+
+		return holding
 
 	def timer_callback(self, timer=None):
+		if self.__irq:
+			if not self.__scanning:
+				return
+
+			# 最后一次电平变化后等待消抖时长再读取按键状态
+			if ticks_diff(ticks_ms(), self.__edge_ticks) < self.__debounce:
+				return
+
+		self.__scan()
+
+		if self.__irq and self.__is_idle():
+			self.__scanning = False
+
+			if self.__timer is not None:
+				self.__timer.deinit()
+
+	def __scan(self):
+		holding = self.__read_buttons()
+		active = holding | self.__holding_mask | self.__status_mask | self.__pressed_mask |\
+				 self.__is_holding_mask | self.__click_mask
+		self.__holding_mask = holding
+
+		# 没有按键按下，上次扫描时也没有，直接返回
+		if not active:
+			return
+
+		now = ticks_ms()
+		last_ticks = self.__last_ticks
+		click_ticks = self.__click_ticks
+		status = self.__status_mask
+		pressed = self.__pressed_mask
+		is_holding = self.__is_holding_mask
+		clicking = self.__click_mask
+
+		# 组合键按下后，组合内的按键不再触发单击和长按，直到松开
+		self.__chord_mask &= holding
+
+		for index, chord in enumerate(self.__chords):
+			if holding & chord == chord and not self.__chord_mask & chord:
+				self.__chord_mask |= chord
+				status &= ~chord
+				pressed |= chord
+				clicking &= ~chord
+				self.__push_event(Button.EVENT_CHORD, self.__chord_pins[index], index)
+
 		for index in range(len(self.button_list)):
-			self.__button_holding_list[index] = abs(self.__default - self.button_list[index].value())
-			# print("hold" if self.__button_holding_list[index] else "release")
+			bit = 1 << index
+
+			if not active & bit:
+				continue
 
-			if self.__button_holding_list[index]:
-				if self.__hold_cb is not None and not self.__is_button_holding_list[index]:
-					self.__hold_cb(self.__pin_list[index])
-					self.__is_button_holding_list[index] = True
+			pin = self.__pin_list[index]
+
+			if holding & bit:
+				if self.__hold_cb is not None and not is_holding & bit:
+					self.__hold_cb(pin)
+					is_holding |= bit
 			else:
-				if self.__release_cb is not None and self.__is_button_holding_list[index]:
-					self.__release_cb(self.__pin_list[index])
-					self.__is_button_holding_list[index] = False
+				if self.__release_cb is not None and is_holding & bit:
+					self.__release_cb(pin)
+					is_holding &= ~bit
+
+			if holding & bit:
+				if status & bit:
+					duration = ticks_diff(now, last_ticks[index])
 
-			if self.__button_holding_list[index]:
-				if self.__button_status_list[index] == self.__button_holding_list[index]:
-					if self.__time_diff(index) >= self.__timeout and self.__behavior == self.BEHAVIOR_HOLD:
-						if self.__press_cb is not None:
-							self.__press_cb(self.__time_diff(index), self.__pin_list[index])
+					if duration >= self.__timeout and self.__behavior == self.BEHAVIOR_HOLD:
+						if clicking & bit:
+							clicking &= ~bit
+							self.__click(pin)
 
-						self.__button_status_list[index] = False
-						self.__button_pressed_list[index] = True
+						self.__long_press(duration, pin)
 
-						self.__last_ticks_list[index] = ticks_ms()
+						status &= ~bit
+						pressed |= bit
+
+						last_ticks[index] = now
+						self.__repeat_counts[index] = 0
 				else:
-					if not self.__button_pressed_list[index]:
-						self.__button_status_list[index] = True
+					if not pressed & bit:
+						# 空闲时不再更新计时，以检测到按下的时间作为计时起点
+						status |= bit
+						last_ticks[index] = now
+
+						# 超出双击间隔后再次按下，先补发上一次单击
+						if clicking & bit and ticks_diff(now, click_ticks[index]) >= self.__double_click:
+							clicking &= ~bit
+							self.__click(pin)
+					elif self.__repeat and not self.__chord_mask & bit and\
+						 ticks_diff(now, last_ticks[index]) >= self.__repeat:
+						last_ticks[index] = now
+						self.__repeat_counts[index] += 1
+						self.__push_event(Button.EVENT_REPEAT, pin, self.__repeat_counts[index])
 			else:
-				if self.__button_status_list[index]:
-					if self.__time_diff(index) >= self.__timeout and self.__behavior == self.BEHAVIOR_RELEASE:
-						if self.__press_cb is not None:
-							self.__press_cb(self.__time_diff(index), self.__pin_list[index])
+				if status & bit:
+					duration = ticks_diff(now, last_ticks[index])
+
+					if duration >= self.__timeout and self.__behavior == self.BEHAVIOR_RELEASE:
+						self.__long_press(duration, pin)
+					elif not self.__double_click:
+						self.__click(pin)
+					elif clicking & bit:
+						clicking &= ~bit
+						self.__push_event(Button.EVENT_DOUBLE_CLICK, pin, 0)
 					else:
-						if self.__click_cb is not None:
-							self.__click_cb(self.__pin_list[index])
+						clicking |= bit
+						click_ticks[index] = now
 
-					self.__button_status_list[index] = False
+					status &= ~bit
 				else:
-					self.__last_ticks_list[index] = ticks_ms()
-					self.__button_pressed_list[index] = False
+					last_ticks[index] = now
+					pressed &= ~bit
+
+					if clicking & bit and ticks_diff(now, click_ticks[index]) >= self.__double_click:
+						clicking &= ~bit
+						self.__click(pin)
+
+		self.__status_mask = status
+		self.__pressed_mask = pressed
+		self.__is_holding_mask = is_holding
+		self.__click_mask = clicking
+
+	def __click(self, pin):
+		if self.__click_cb is not None:
+			self.__click_cb(pin)
+
+		self.__push_event(Button.EVENT_CLICK, pin, 0)
+
+	def __long_press(self, duration, pin):
+		if self.__press_cb is not None:
+			self.__press_cb(duration, pin)
+
+		self.__push_event(Button.EVENT_LONG_PRESS, pin, duration)
+
+	def __push_event(self, event, pin, value):
+		'''写入事件队列，队列已满时丢弃新事件'''
+		size = len(self.__event_types)
+
+		if size == 1:
+			return
+
+		tail = self.__event_tail
+		next_tail = (tail + 1) % size
+
+		if next_tail == self.__event_head:
+			self.__events_dropped += 1
+			return
+
+		self.__event_types[tail]  = event
+		self.__event_pins[tail]   = pin
+		self.__event_values[tail] = value
+		self.__event_tail = next_tail
+
+	def get_event(self):
+		'''
+		从事件队列中读取一个事件，需要在中断外调用
+
+		@return: (event, pin, value)，队列为空时返回 None
+		'''
+		head = self.__event_head
+
+		if head == self.__event_tail:
+			return None
+
+		event = (self.__event_types[head], self.__event_pins[head], self.__event_values[head])
+		self.__event_head = (head + 1) % len(self.__event_types)
+
+		return event
+
+	async def run_async(self, period:int=SCAN_PERIOD):
+		'''在 asyncio 事件循环中轮询按键状态，初始化时需要将 timer_id 设置为 None'''
+		try:
+			import uasyncio as asyncio
+		except ImportError:
+			import asyncio
+
+		while True:
+			self.timer_callback()
+			await asyncio.sleep(period / 1000)
+
+	@property
+	def pending_events(self) -> int:
+		'''事件队列中未读取的事件数量'''
+		return (self.__event_tail - self.__event_head) % len(self.__event_types)
+
+	@property
+	def dropped_events(self) -> int:
+		'''队列已满时丢弃的事件数量'''
+		return self.__events_dropped
 
 	@property
 	def timeout(self):
@@ -4,48 +4,121 @@ Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
 """
 from machine import Pin, ADC
 from utime import sleep_ms
+from array import array
 
 
 class Photoresistor(object):
 	'''
 	光敏电阻驱动
+
+	每次读取只采样一次，使用指数平滑或中值滤波得到稳定的采样值
+
+	采样频率由调用 update() 的频率决定
+
+	参数：
+	- pin：ADC 引脚
+	- filter_mode：滤波方式，FILTER_EMA 或 FILTER_MEDIAN
+	- ema_shift：指数平滑系数，新采样值权重为 1 / 2^ema_shift
+	- median_size：中值滤波窗口大小
+	- read_mode：读取方式，READ_RAW 使用 read()，READ_U16 使用 read_u16()，READ_UV 使用校准后的 read_uv()
 	'''
-	LEVEL_1 = 1 # 最大亮度
-	LEVEL_2 = 2
-	LEVEL_3 = 3
-	LEVEL_4 = 4
-	LEVEL_5 = 5
-	LEVEL_6 = 6
-
-	LEVELS_RANGE = {
-		LEVEL_1: [0, 450],
-		LEVEL_2: [451, 900],
-		LEVEL_3: [901, 1300],
-		LEVEL_4: [1301, 1900],
-		LEVEL_5: [1901, 3000],
-		LEVEL_6: [3001, 4095]
-	}
-
-	def __init__(self, pin:int):
+	FILTER_EMA    = 0
+	FILTER_MEDIAN = 1
+
+	READ_RAW = 0
+	READ_U16 = 1
+	READ_UV  = 2
+
+	# ATTN_11DB 衰减时 read() 最大值 4095 对应的电压（uV）
+	FULL_SCALE_UV = 2_500_000
+
+	def __init__(self, pin:int, filter_mode:int=FILTER_EMA, ema_shift:int=3, median_size:int=5, read_mode:int=READ_RAW):
 		self.__adc = ADC(Pin(pin))
 		self.__adc.atten(ADC.ATTN_11DB) # ATTN_2_5DB
 
-	@property
-	def level(self):
-		sample_avg = 0
+		if read_mode == Photoresistor.READ_U16 and not hasattr(self.__adc, 'read_u16') or\
+		   read_mode == Photoresistor.READ_UV and not hasattr(self.__adc, 'read_uv'):
+			read_mode = Photoresistor.READ_RAW
+
+		self.__read_mode  = read_mode
+		self.__filter     = filter_mode
+		self.__ema_shift  = ema_shift
+
+		# 指数平滑累加值，保存为采样值左移 ema_shift 位
+		self.__ema_sum = -1
+
+		# 中值滤波的环形窗口和排序窗口
+		self.__window = array('H', [0] * median_size)
+		self.__sorted = array('H', [0] * median_size)
+		self.__window_index = 0
+		self.__window_count = 0
+
+		self.__value = 0
+
+	def __read(self) -> int:
+		'''读取一次采样值，统一转换为 0~4095'''
+		if self.__read_mode == Photoresistor.READ_U16:
+			return self.__adc.read_u16() >> 4
+		elif self.__read_mode == Photoresistor.READ_UV:
+			return min(self.__adc.read_uv() * 4095 // Photoresistor.FULL_SCALE_UV, 4095)
+		else:
+			return self.__adc.read()
 
-		for _ in range(20):
-			sample_avg += self.__adc.read()
+	def __median(self, sample:int) -> int:
+		'''更新中值滤波窗口，排序窗口使用插入方式维护，不分配内存'''
+		window = self.__window
+		ordered = self.__sorted
+		count = self.__window_count
+		size = len(window)
 
-		sample_avg //= 20
+		if count == size:
+			# 从排序窗口中移除最早的采样值
+			index = 0
+			oldest = window[self.__window_index]
 
-		# print(f'sample: {sample_avg}')
+			while ordered[index] != oldest:
+				index += 1
 
-		for level, level_range in Photoresistor.LEVELS_RANGE.items():
-			if level_range[0] <= sample_avg <= level_range[1]:
-				return level
+			while index < count - 1:
+				ordered[index] = ordered[index + 1]
+				index += 1
 
-		return Photoresistor.LEVEL_6
+			count -= 1
+
+		index = count
+
+		while index > 0 and ordered[index - 1] > sample:
+			ordered[index] = ordered[index - 1]
+			index -= 1
+
+		ordered[index] = sample
+
+		window[self.__window_index] = sample
+		self.__window_index = (self.__window_index + 1) % size
+		self.__window_count = count + 1
+
+		return ordered[self.__window_count // 2]
+
+	def update(self) -> int:
+		'''采样一次并更新滤波值，返回滤波后的采样值'''
+		sample = self.__read()
+
+		if self.__filter == Photoresistor.FILTER_MEDIAN:
+			self.__value = self.__median(sample)
+		else:
+			if self.__ema_sum < 0:
+				self.__ema_sum = sample << self.__ema_shift
+			else:
+				self.__ema_sum += sample - (self.__ema_sum >> self.__ema_shift)
+
+			self.__value = self.__ema_sum >> self.__ema_shift
+
+		return self.__value
+
+	@property
+	def value(self) -> int:
+		'''获取滤波后的采样值'''
+		return self.__value
 
 
 if __name__ == '__main__':
@@ -54,5 +127,5 @@ if __name__ == '__main__':
 	adc = Photoresistor(Config.PINS.BRIGHTNESS_ADC)
 
 	for _ in range(10000):
-		print(f'adc level: {adc.level}')
+		print(f'adc value: {adc.update()}')
 		sleep_ms(200)
@@ -18,7 +18,11 @@ CONFIG = Utilities.import_config()
 
 class HardwareTest(object):
 	def __init__(self):
-		self.__neopixel = NeoPixel(Pin(CONFIG.PINS.DIN_MATRIX), CONFIG.WS2812_MATRIX.WIDTH * CONFIG.WS2812_MATRIX.HEIGHT)
+		# 多路输出时只测试第一路输出的第一块面板
+		pin = CONFIG.PINS.DIN_MATRIX
+		pin = pin[0] if isinstance(pin, tuple) else pin
+
+		self.__neopixel = NeoPixel(Pin(pin), CONFIG.WS2812_MATRIX.WIDTH * CONFIG.WS2812_MATRIX.HEIGHT)
 
 		self.__buttons = Button(
 			CONFIG.KEYS.KEY_LIST,
@@ -2,10 +2,27 @@
 Copyright © 2023 Walkline Wang (https://walkline.wang)
 Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
 """
-__version__ = '0.1.1'
-__version_info__ = (0, 1, 1)
+__version__ = '0.1.7'
+__version_info__ = (0, 1, 7)
 print('module animation version:', __version__)
 
+from array import array
+
+try:
+	from matrix import pixelops
+except ImportError:
+	pixelops = __import__('matrix/pixelops')
+
+try:
+	from matrix.geometry import Geometry
+except ImportError:
+	Geometry = __import__('matrix/geometry').Geometry
+
+try:
+	from matrix import keyframes
+except ImportError:
+	keyframes = __import__('matrix/keyframes')
+
 
 class AnimationException(Exception):
 	pass
@@ -25,6 +42,10 @@ class Animation(object):
 	MENU_CALENDAR_2 = 8 # 台历2菜单
 	MENU_UPDATE     = 9 # 在线更新菜单
 
+	# 帧数据按照 9x6 点阵绘制，最高位为坐标 (0, 0)，按列排列（先从上到下，再从左到右）
+	FRAME_WIDTH  = 9
+	FRAME_HEIGHT = 6
+
 	DEFAULT_PERIOD = 50
 	DEFAULT_STEPS  = 10
 	DEFAULT_LOOPS  = True
@@ -185,77 +206,182 @@ class Animation(object):
 		}
 	}
 
-	def __init__(self):
+	def __init__(self, led_count:int=54, bpp:int=3, order:tuple=(1, 0, 2, 3), geometry:Geometry=None):
+		'''
+		参数：
+		- led_count：灯珠数量，默认值 54，指定 geometry 时不使用
+		- bpp：每个灯珠的字节数，默认值 3
+		- order：颜色通道在像素缓冲区中的顺序，默认值 GRB
+		- geometry：面板几何，帧数据按照几何换算为灯珠序号，显示在点阵左上角，
+		  默认为一块按列排列的 9x6 面板
+		'''
+		width, height = Animation.FRAME_WIDTH, Animation.FRAME_HEIGHT
+
+		if geometry is None:
+			if led_count != width * height:
+				raise AnimationException(f'{led_count} leds need a panel geometry, animation frames are {width}x{height}')
+
+			geometry = Geometry(width, height)
+
+		if geometry.width < width or geometry.height < height:
+			raise AnimationException(f'animation frames are {width}x{height}, {geometry.width}x{geometry.height} matrix is too small')
+
+		# 帧数据第 n 位（从最高位开始）对应的灯珠序号
+		self.__pixel_map = array('H', [geometry.index(pixel // height, pixel % height) for pixel in range(width * height)])
+		led_count = geometry.led_count
+
 		self.__period = Animation.DEFAULT_PERIOD
 		self.__loops  = Animation.DEFAULT_LOOPS
 		self.__steps  = Animation.DEFAULT_STEPS
 		self.__frames = None
 		self.__colors = None
 
-		self.__frames_gen = None
-		self.__colors_gen = None
+		self.__led_count = led_count
+		self.__bpp       = bpp
+		self.__order     = order
+
+		# 预编译的帧数据
+		self.__frame_index   = 0
+		self.__frame_masks   = None # 每一帧点亮的灯珠序号
+		self.__frame_buffers = None # 单一颜色时每一帧的像素缓冲区数据
+		self.__blank_buffer  = bytes(led_count * bpp)
+
+		# 预编译的颜色数据
+		self.__color_index = 0
+		self.__color_cycle = None # 循环显示的颜色列表
+		self.__color_pixels = None # 按通道顺序排列的每种颜色的像素数据
 
 	def select_animation(self, animation:int, colors:tuple):
-		'''选择一个动画效果'''
+		'''选择一个动画效果，并预编译帧数据和颜色数据'''
 		if animation not in Animation.ANIMATION_LIST:
 			raise AnimationException('invalid animation')
 
 		resource = Animation.RESOURCES[animation]
 		frames = resource.get('frames')
 
-		if frames and len(frames) > 0:
-			self.__frames = frames
-			self.__frames_gen = self.__frame_generator()
-		else:
+		if not (frames and len(frames) > 0):
 			raise AnimationException('invalid frames')
 
-		if isinstance(colors, (tuple, list)) and len(colors) > 0:
-			self.__colors = colors
-			self.__colors_gen = self.__color_generator()
-		else:
+		if not (isinstance(colors, (tuple, list)) and len(colors) > 0):
 			raise AnimationException('invalid colors')
 
 		self.__period = resource.get('period', Animation.DEFAULT_PERIOD)
 		self.__loops  = resource.get('loops', Animation.DEFAULT_LOOPS)
 		self.__steps  = resource.get('steps', Animation.DEFAULT_STEPS)
 
+		self.__frames = frames
+		self.__colors = colors
+		self.__compile_frames()
+		self.__compile_colors()
+
 	def get_frame_and_color(self) -> tuple:
 		'''
 		获取当前帧数据和颜色
 
 		@return: 剩余帧数, 当前帧数据, 当前颜色数据
 		'''
-		remains, frame = next(self.__frames_gen)
-		return remains, frame, next(self.__colors_gen)
-
-	def __frame_generator(self) -> tuple:
-		'''帧数据生成器'''
-		index = 0
-		count = len(self.__frames)
-
-		while True:
-			yield count - index - 1, self.__frames[index]
-			index = (index + 1) % count
-
-	def __color_generator(self) -> tuple:
-		'''颜色数据生成器'''
-		while True:
-			if isinstance(self.colors[0], int):
-				yield self.colors
-			elif isinstance(self.colors[0], tuple):
-				if len(self.colors) == 1:
-					yield self.colors[0]
-				else:
-					for index, color in enumerate(self.colors):
-						next_index = (index + 1) % len(self.colors)
-						next_color = self.colors[next_index]
-
-						for step in range(1, self.steps + 1):
-							r = int(color[0] + (next_color[0] - color[0]) * step / self.steps)
-							g = int(color[1] + (next_color[1] - color[1]) * step / self.steps)
-							b = int(color[2] + (next_color[2] - color[2]) * step / self.steps)
-
-							yield (r, g, b)
+		index = self.__frame_index
+		color = self.__color_cycle[self.__color_index]
+		self.__next_frame()
+
+		return len(self.__frames) - index - 1, self.__frames[index], color
+
+	def render_frame(self, buffer) -> int:
+		'''
+		将当前帧写入像素缓冲区，并切换到下一帧
+
+		参数：
+		- buffer：像素缓冲区，建议使用 NeoPixel.buf 的 memoryview
+
+		@return: 剩余帧数
+		'''
+		index = self.__frame_index
+
+		if self.__frame_buffers is not None:
+			buffer[:] = self.__frame_buffers[index]
+		else:
+			buffer[:] = self.__blank_buffer
+			pixelops.paint(buffer, self.__frame_masks[index], self.__color_pixels[self.__color_index])
+
+		self.__next_frame()
+
+		return len(self.__frame_masks) - index - 1
+
+	def to_keyframes(self, start=None, fade_ms:int=0):
+		'''
+		将当前动画的全部帧转换为关键帧序列，相邻帧之间线性过渡，每一帧的时长为显示间隔时长
+
+		参数：
+		- start：过渡的起始画面，None 表示直接从第一帧开始
+		- fade_ms：从起始画面缓入缓出到第一帧的时长
+		'''
+		frames = []
+
+		for _ in range(len(self.__frame_masks)):
+			buffer = bytearray(len(self.__blank_buffer))
+			self.render_frame(buffer)
+			frames.append(buffer)
+
+		if start is None:
+			sequence = keyframes.Keyframes(frames[0])
+		else:
+			sequence = keyframes.Keyframes(bytes(start)).add(frames[0], fade_ms, keyframes.EASE_IN_OUT)
+
+		for frame in frames[1:]:
+			sequence.add(frame, self.__period, keyframes.EASE_LINEAR)
+
+		return sequence
+
+	def __next_frame(self):
+		self.__frame_index = (self.__frame_index + 1) % len(self.__frame_masks)
+		self.__color_index = (self.__color_index + 1) % len(self.__color_cycle)
+
+	def __compile_frames(self):
+		'''将帧数据转换为每一帧点亮的灯珠序号列表'''
+		pixel_map = self.__pixel_map
+		count = len(pixel_map)
+		masks = []
+
+		for index in range(len(self.__frames)):
+			frame = self.__frames[index]
+			masks.append(array('H', [pixel_map[pixel] for pixel in range(count) if (frame >> (count - 1 - pixel)) & 1]))
+
+		self.__frame_masks = tuple(masks)
+		self.__frame_index = 0
+
+	def __compile_colors(self):
+		'''将颜色渐变数据展开为每种颜色的像素数据，只有一种颜色时直接生成每一帧的像素缓冲区数据'''
+		bpp    = self.__bpp
+		order  = self.__order
+		colors = self.__colors
+
+		if isinstance(colors[0], int):
+			colors = (colors,)
+
+		# 每种颜色渐变到下一种颜色，不包含起始颜色，包含结束颜色
+		steps = 1 if len(colors) == 1 else self.__steps
+		table = bytearray(len(colors) * steps * bpp)
+
+		for index, color in enumerate(colors):
+			pixelops.interpolate(table, index * steps * bpp, color, colors[(index + 1) % len(colors)], steps, order, bpp)
+
+		cycle_length = len(table) // bpp
+
+		self.__color_pixels = tuple(bytes(table[index * bpp:(index + 1) * bpp]) for index in range(cycle_length))
+		self.__color_cycle  = tuple(tuple(pixel[order[channel]] for channel in range(3)) for pixel in self.__color_pixels)
+		self.__color_index  = 0
+
+		self.__frame_buffers = None
+
+		if cycle_length == 1:
+			buffers = []
+
+			for mask in self.__frame_masks:
+				buffer = bytearray(self.__blank_buffer)
+				pixelops.paint(buffer, mask, self.__color_pixels[0])
+				buffers.append(bytes(buffer))
+
+			self.__frame_buffers = tuple(buffers)
 
 
 	#region class properties
@@ -295,7 +421,14 @@ class Animation(object):
 		'''设置/获取要显示的颜色'''
 		if isinstance(value, (tuple, list)) and len(value) > 0:
 			self.__colors = value
-			self.__colors_gen = self.__color_generator(value)
+
+			if self.__frame_masks is not None:
+				self.__compile_colors()
+
+	@property
+	def frame_count(self) -> int:
+		'''获取当前动画的帧数'''
+		return len(self.__frames) if self.__frames else 0
 	#endregion
 
 
@@ -308,15 +441,8 @@ if __name__ == '__main__':
 	CONFIG = Utilities.import_config()
 	current_animation = 0
 
-	def zfill_54bin(value:int):
-		return f'{value:054b}'
-
 	def show_animation():
-		remains, frame, color = animation.get_frame_and_color()
-
-		for index, bit in enumerate(zfill_54bin(frame)):
-			ws2812.__neopixel[index] = color if bit == '1' else CONFIG.COLORS.BLACK
-
+		remains = animation.render_frame(ws2812.buffer)
 		ws2812.show()
 
 		if not animation.loops and remains == 0:
@@ -326,9 +452,9 @@ if __name__ == '__main__':
 		animation.select_animation(
 			Animation.SUCCESS,
 			(
-				# ws2812.convert_color(CONFIG.COLORS.BLACK),
-				# ws2812.convert_color(CONFIG.COLORS.LIGHTGREEN),
-				ws2812.convert_color((0, 128, 0))
+				# CONFIG.COLORS.BLACK,
+				# CONFIG.COLORS.LIGHTGREEN,
+				(0, 128, 0)
 			)
 		)
 
@@ -340,28 +466,28 @@ if __name__ == '__main__':
 
 		if current_animation == Animation.CONFIG_WIFI:
 			colors = (
-				ws2812.convert_color((255, 0, 0)),
-				ws2812.convert_color((0, 255, 0)),
-				ws2812.convert_color((0, 0, 255))
+				(255, 0, 0),
+				(0, 255, 0),
+				(0, 0, 255)
 			)
 		elif current_animation == Animation.CONNECT_WIFI:
-			colors = ws2812.convert_color((0, 255, 0))
+			colors = (0, 255, 0)
 		elif current_animation == Animation.HEARTBEAT:
-			colors = ws2812.convert_color((255, 0, 0))
+			colors = (255, 0, 0)
 		elif current_animation == Animation.MENU_CLOCK:
-			colors = ws2812.convert_color((128, 128, 128))
+			colors = (128, 128, 128)
 		elif current_animation == Animation.MENU_CALENDAR_1:
-			colors = ws2812.convert_color((128, 0, 128))
+			colors = (128, 0, 128)
 		elif current_animation == Animation.MENU_CALENDAR_2:
-			colors = ws2812.convert_color((0, 128, 128))
+			colors = (0, 128, 128)
 		elif current_animation == Animation.MENU_UPDATE:
-			colors = ws2812.convert_color((0, 128, 128))
+			colors = (0, 128, 128)
 		elif current_animation == Animation.UPDATING:
-			colors = ws2812.convert_color((128, 128, 128))
+			colors = (128, 128, 128)
 		elif current_animation == Animation.SUCCESS:
-			colors = ws2812.convert_color((0, 128, 0))
+			colors = (0, 128, 0)
 		elif current_animation == Animation.FAILED:
-			colors = ws2812.convert_color((128, 0, 0))
+			colors = (128, 0, 0)
 
 		animation.select_animation(current_animation, colors)
 		tasks.add_work(show_animation, animation.period)
@@ -372,7 +498,7 @@ if __name__ == '__main__':
 
 	ws2812    = WS2812(CONFIG.WS2812_MATRIX.WIDTH, CONFIG.WS2812_MATRIX.HEIGHT, CONFIG.PINS.DIN_MATRIX)
 	tasks     = Dispatcher()
-	animation = Animation()
+	animation = Animation(ws2812.led_count, ws2812.led_bpp, ws2812.led_order, ws2812.geometry)
 
 	ws2812.brightness = 40
 
@@ -0,0 +1,65 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+"""
+__version__ = '0.1.2'
+__version_info__ = (0, 1, 2)
+
+from array import array
+
+try:
+	from matrix import pixelops
+except ImportError:
+	pixelops = __import__('matrix/pixelops')
+
+
+class Blitter(object):
+	'''
+	按位图掩码将颜色直接写入像素缓冲区
+
+	灯珠序号表使用 array('H') 保存，序号表第一项对应掩码的最高位，
+	颜色转换为按通道顺序排列的像素数据后缓存，由 pixelops 完成绘制
+
+	参数：
+	- buffer：像素缓冲区
+	- bpp：每个灯珠的字节数，默认值 3
+	- order：颜色通道在像素缓冲区中的顺序，默认值 GRB
+	'''
+	def __init__(self, buffer, bpp:int=3, order:tuple=(1, 0, 2, 3)):
+		self.__buffer = buffer
+		self.__bpp    = bpp
+		self.__order  = order
+		self.__pixels = {}
+
+	def to_pixel(self, color:tuple) -> bytes:
+		'''将 (r, g, b) 颜色转换为按通道顺序排列的像素数据，相同颜色返回同一个 bytes 对象'''
+		pixel = self.__pixels.get(color)
+
+		if pixel is None:
+			pixel = bytearray(self.__bpp)
+
+			for channel in range(len(color)):
+				pixel[self.__order[channel]] = color[channel]
+
+			pixel = self.__pixels[color] = bytes(pixel)
+
+		return pixel
+
+	def blit(self, indices:array, mask:int, color:tuple, background:tuple=(0, 0, 0)):
+		'''
+		按掩码绘制指定区域
+
+		参数：
+		- indices：灯珠序号表
+		- mask：位图掩码，置位的灯珠显示 color，否则显示 background
+		'''
+		pixelops.blit_mask(self.__buffer, indices, mask, self.to_pixel(color), self.to_pixel(background))
+
+	def blit_bar(self, indices:array, count:int, color:tuple, background:tuple=(0, 0, 0)):
+		'''
+		绘制进度条，点亮序号表的前 count 个灯珠
+		'''
+		length = len(indices)
+		count  = 0 if count < 0 else (length if count > length else count)
+
+		self.blit(indices, ((1 << count) - 1) << (length - count), color, background)
@@ -0,0 +1,167 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+"""
+__version__ = '0.1.2'
+__version_info__ = (0, 1, 2)
+
+from array import array
+
+try:
+	from matrix.blitter import Blitter
+except ImportError:
+	Blitter = __import__('matrix/blitter').Blitter
+
+try:
+	from matrix import pixelops
+except ImportError:
+	pixelops = __import__('matrix/pixelops')
+
+
+class Layer(object):
+	'''
+	叠加图层
+
+	每个图层有自己的像素缓冲区和不透明度掩码（每个灯珠一个字节，0 为透明，255 为不透明），
+	直接写入 buffer 或 mask 后需要调用 touch() 标记图层内容已变化
+
+	参数：
+	- led_count：灯珠数量
+	- bpp：每个灯珠的字节数，默认值 3
+	- order：颜色通道在像素缓冲区中的顺序，默认值 GRB
+	'''
+	OPAQUE      = 255
+	TRANSPARENT = 0
+
+	def __init__(self, led_count:int, bpp:int=3, order:tuple=(1, 0, 2, 3)):
+		self.__buffer  = memoryview(bytearray(led_count * bpp))
+		self.__mask    = bytearray(led_count)
+		self.__blitter = Blitter(self.__buffer, bpp, order)
+		self.__visible = False
+
+		# 图层内容或可见状态变化后需要重新合成
+		self.dirty = False
+
+	def touch(self):
+		'''标记图层内容已变化'''
+		self.dirty = True
+
+	def clear(self):
+		'''清除图层内容，全部灯珠透明'''
+		pixelops.fill(self.__mask, bytes((Layer.TRANSPARENT,)))
+		self.dirty = True
+
+	def fill(self, color:tuple, alpha:int=OPAQUE):
+		'''使用同一种颜色和不透明度填充整个图层'''
+		pixelops.fill(self.__buffer, self.__blitter.to_pixel(color))
+		pixelops.fill(self.__mask, bytes((alpha,)))
+		self.dirty = True
+
+	def paint(self, indices:array, color:tuple, alpha:int=OPAQUE):
+		'''设置序号表中灯珠的颜色和不透明度，其它灯珠不变'''
+		pixelops.paint(self.__buffer, indices, self.__blitter.to_pixel(color))
+		pixelops.paint(self.__mask, indices, bytes((alpha,)))
+		self.dirty = True
+
+	def set_alpha(self, indices:array, alpha:int):
+		'''只设置序号表中灯珠的不透明度，颜色不变'''
+		pixelops.paint(self.__mask, indices, bytes((alpha,)))
+		self.dirty = True
+
+	def set_opaque(self):
+		'''全部灯珠不透明，用于整幅画面覆盖下层内容的动画'''
+		pixelops.fill(self.__mask, bytes((Layer.OPAQUE,)))
+		self.dirty = True
+
+	@property
+	def buffer(self) -> memoryview:
+		'''获取图层像素缓冲区，按通道顺序排列'''
+		return self.__buffer
+
+	@property
+	def mask(self) -> bytearray:
+		'''获取图层不透明度掩码'''
+		return self.__mask
+
+	@property
+	def visible(self) -> bool:
+		return self.__visible
+
+	@visible.setter
+	def visible(self, value:bool):
+		'''获取/设置图层是否显示'''
+		value = bool(value)
+
+		if value != self.__visible:
+			self.__visible = value
+			self.dirty = True
+
+
+class Compositor(object):
+	'''
+	图层合成器
+
+	底层（表盘）使用外部的像素缓冲区，上层图层按照添加顺序从下到上叠加，
+	没有显示的上层图层时直接返回底层缓冲区，不复制数据；
+	只有底层内容变化或上层图层有变化时才重新合成
+
+	参数：
+	- base：底层像素缓冲区（bytearray）
+	- bpp：每个灯珠的字节数，默认值 3
+	'''
+	def __init__(self, base:bytearray, bpp:int=3):
+		self.__base   = base
+		self.__bpp    = bpp
+		self.__layers = []
+
+		# 合成结果，以及合成时底层内容的副本
+		self.__frame     = bytearray(len(base))
+		self.__last_base = bytearray(len(base))
+		self.__composed  = False
+
+	def add_layer(self, layer:Layer) -> Layer:
+		'''在最上层添加一个图层'''
+		self.__layers.append(layer)
+		layer.dirty = True
+
+		return layer
+
+	def compose(self) -> bytearray:
+		'''
+		合成所有可见图层
+
+		@return: 没有可见的上层图层时返回底层缓冲区，否则返回合成结果
+		'''
+		layers  = self.__layers
+		visible = False
+		dirty   = False
+
+		for layer in layers:
+			visible = visible or layer.visible
+			dirty   = dirty or layer.dirty
+			layer.dirty = False
+
+		if not visible:
+			self.__composed = False
+			return self.__base
+
+		base = self.__base
+
+		if dirty or not self.__composed or base != self.__last_base:
+			frame = self.__frame
+			bpp   = self.__bpp
+
+			self.__last_base[:] = base
+			frame[:] = base
+
+			for layer in layers:
+				if layer.visible:
+					pixelops.composite(frame, layer.buffer, layer.mask, bpp)
+
+			self.__composed = True
+
+		return self.__frame
+
+	@property
+	def layers(self) -> list:
+		return self.__layers
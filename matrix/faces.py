@@ -0,0 +1,29 @@
+# automatic generated file by matrix/layout_compiler.py, do not edit
+from array import array
+
+FORMAT   = 2
+WIDTH    = 9
+HEIGHT   = 6
+GEOMETRY = '9x6,columns,0,0,0,0,1x1,0'
+
+
+class CALENDAR_1(object):
+	day_ones = array('H', (25, 26, 27, 28, 29, 31, 32, 33, 34, 35, 37, 38, 39, 40, 41))
+	day_tens = array('H', (1, 2, 3, 4, 5, 7, 8, 9, 10, 11, 13, 14, 15, 16, 17))
+	month = array('H', (48, 49, 50, 51, 52, 53, 42, 43, 44, 45, 46, 47))
+	month_groups = (array('H', (48, 49, 50)), array('H', (51, 52, 53)), array('H', (42, 43, 44)), array('H', (45, 46, 47)))
+	weekday = array('H', (0, 6, 12, 18, 24, 30, 36))
+
+
+class CALENDAR_2(object):
+	days = array('H', (25, 31, 37, 2, 8, 14, 20, 26, 32, 38, 3, 9, 15, 21, 27, 33, 39, 4, 10, 16, 22, 28, 34, 40, 5, 11, 17, 23, 29, 35, 41))
+	month = array('H', (42, 48, 43, 49, 44, 50, 45, 51, 46, 52, 47, 53))
+	weekday = array('H', (0, 6, 12, 18, 24, 30, 36))
+
+
+class CLOCK(object):
+	hour_ones = array('H', (24, 25, 26, 27, 28, 30, 31, 32, 33, 34, 36, 37, 38, 39, 40))
+	hour_tens = array('H', (0, 1, 2, 3, 4, 6, 7, 8, 9, 10, 12, 13, 14, 15, 16))
+	minute_ones = array('H', (5, 11, 17, 23, 29, 35, 41, 47, 53))
+	minute_ones_groups = (array('H', (5, 11, 17)), array('H', (23, 29, 35)), array('H', (41, 47, 53)))
+	minute_tens = array('H', (48, 49, 50, 51, 52))
@@ -0,0 +1,163 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+点阵面板几何
+
+描述灯珠在面板上的布线方式、面板安装角度和镜像，以及多块面板的拼接方式，
+初始化时计算全部坐标 (x, y) 对应的灯珠序号并保存在 array('H') 中，查询时直接取表
+
+坐标原点为整个显示区域的左上角，x 向右，y 向下；
+灯珠序号按照面板串联顺序连续编号，多路输出时按输出顺序继续编号
+"""
+__version__ = '0.1'
+__version_info__ = (0, 1)
+
+from array import array
+
+
+class Geometry(object):
+	'''
+	点阵几何映射
+
+	参数：
+	- width, height：单块面板安装后的显示尺寸（列数、行数）
+	- wiring：面板内灯珠排列方式，WIRING_COLUMNS 按列排列，WIRING_ROWS 按行排列
+	- serpentine：相邻的列（行）方向相反（蛇形布线）
+	- rotation：面板安装角度，顺时针 0/90/180/270 度
+	- mirror_x, mirror_y：水平、垂直镜像
+	- tiles：面板拼接数量 (横向, 纵向)
+	- tile_serpentine：面板按行串联，相邻行方向相反
+	- outputs：每路输出串联的面板数量，默认全部面板串联在一路输出上
+	'''
+	WIRING_COLUMNS = 'columns'
+	WIRING_ROWS    = 'rows'
+
+	ROTATIONS = (0, 90, 180, 270)
+
+	def __init__(self, width:int, height:int, wiring:str=WIRING_COLUMNS, serpentine:bool=False,
+			rotation:int=0, mirror_x:bool=False, mirror_y:bool=False,
+			tiles:tuple=(1, 1), tile_serpentine:bool=False, outputs:tuple=None):
+		if wiring not in (Geometry.WIRING_COLUMNS, Geometry.WIRING_ROWS):
+			raise ValueError(f'unknown wiring {wiring}')
+
+		if rotation not in Geometry.ROTATIONS:
+			raise ValueError(f'rotation must be one of {Geometry.ROTATIONS}')
+
+		tiles_x, tiles_y = tiles
+		panel_count = tiles_x * tiles_y
+
+		if outputs is None:
+			outputs = (panel_count,)
+
+		if sum(outputs) != panel_count:
+			raise ValueError(f'outputs drive {sum(outputs)} panels, but {panel_count} panels are tiled')
+
+		self.__panel_width  = width
+		self.__panel_height = height
+		self.__panel_size   = width * height
+		self.__width        = width * tiles_x
+		self.__height       = height * tiles_y
+		self.__outputs      = tuple(count * self.__panel_size for count in outputs)
+		self.__signature    = f'{width}x{height},{wiring},{int(serpentine)},{rotation},{int(mirror_x)},{int(mirror_y)},{tiles_x}x{tiles_y},{int(tile_serpentine)}'
+
+		# 安装角度为 90/270 度时，面板的物理列数和行数与显示尺寸相反
+		if rotation in (90, 270):
+			panel_columns, panel_rows = height, width
+		else:
+			panel_columns, panel_rows = width, height
+
+		index_map = array('H', bytes(2 * self.__width * self.__height))
+
+		for y in range(self.__height):
+			tile_y, line = divmod(y, height)
+
+			for x in range(self.__width):
+				tile_x, column = divmod(x, width)
+				row = line
+
+				if tile_serpentine and tile_y & 1:
+					tile_x = tiles_x - 1 - tile_x
+
+				if mirror_x:
+					column = width - 1 - column
+
+				if mirror_y:
+					row = height - 1 - row
+
+				# 显示坐标转换为面板物理坐标
+				if rotation == 0:
+					panel_x, panel_y = column, row
+				elif rotation == 90:
+					panel_x, panel_y = row, width - 1 - column
+				elif rotation == 180:
+					panel_x, panel_y = width - 1 - column, height - 1 - row
+				else:
+					panel_x, panel_y = height - 1 - row, column
+
+				if wiring == Geometry.WIRING_COLUMNS:
+					if serpentine and panel_x & 1:
+						panel_y = panel_rows - 1 - panel_y
+
+					index = panel_x * panel_rows + panel_y
+				else:
+					if serpentine and panel_y & 1:
+						panel_x = panel_columns - 1 - panel_x
+
+					index = panel_y * panel_columns + panel_x
+
+				index_map[y * self.__width + x] = (tile_y * tiles_x + tile_x) * self.__panel_size + index
+
+		self.__index_map = index_map
+
+	@staticmethod
+	def from_config(matrix) -> 'Geometry':
+		'''根据配置文件中的 WS2812_MATRIX 创建几何映射，未设置的项目使用默认值'''
+		return Geometry(
+			matrix.WIDTH,
+			matrix.HEIGHT,
+			wiring=getattr(matrix, 'WIRING', Geometry.WIRING_COLUMNS),
+			serpentine=getattr(matrix, 'SERPENTINE', False),
+			rotation=getattr(matrix, 'ROTATION', 0),
+			mirror_x=getattr(matrix, 'MIRROR_X', False),
+			mirror_y=getattr(matrix, 'MIRROR_Y', False),
+			tiles=getattr(matrix, 'TILES', (1, 1)),
+			tile_serpentine=getattr(matrix, 'TILE_SERPENTINE', False),
+			outputs=getattr(matrix, 'OUTPUTS', None)
+		)
+
+	def index(self, x:int, y:int) -> int:
+		'''获取坐标对应的灯珠序号'''
+		if not (0 <= x < self.__width and 0 <= y < self.__height):
+			raise IndexError(f'({x}, {y}) is outside {self.__width}x{self.__height} matrix')
+
+		return self.__index_map[y * self.__width + x]
+
+	@property
+	def width(self) -> int:
+		'''获取显示区域总列数'''
+		return self.__width
+
+	@property
+	def height(self) -> int:
+		'''获取显示区域总行数'''
+		return self.__height
+
+	@property
+	def led_count(self) -> int:
+		return self.__width * self.__height
+
+	@property
+	def index_map(self) -> array:
+		'''获取坐标到灯珠序号的映射表，坐标 (x, y) 对应第 y * width + x 项'''
+		return self.__index_map
+
+	@property
+	def outputs(self) -> tuple:
+		'''获取每路输出的灯珠数量'''
+		return self.__outputs
+
+	@property
+	def signature(self) -> str:
+		'''获取几何参数的文字描述，用于判断编译好的表盘是否适用'''
+		return self.__signature
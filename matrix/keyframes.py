@@ -0,0 +1,197 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+关键帧动画
+
+关键帧为完整的像素缓冲区数据，相邻关键帧之间按照缓动曲线逐个字节插值，
+每个灯珠的亮度和颜色同时平滑变化；插值和缓动曲线全部使用整数运算，缓动曲线预先计算为查找表
+"""
+__version__ = '0.1'
+__version_info__ = (0, 1)
+
+from utime import ticks_ms, ticks_us, ticks_diff
+
+try:
+	from matrix import pixelops
+except ImportError:
+	pixelops = __import__('matrix/pixelops')
+
+
+# 缓动表的进度分段数量，表长度为 EASING_RESOLUTION + 1，表中数值为 0~255 的权重
+EASING_RESOLUTION = 64
+
+def __easing_table(numerator) -> bytes:
+	'''生成缓动表，numerator(t, r) 返回进度 t / r 对应权重乘以 r³ 的整数值'''
+	resolution  = EASING_RESOLUTION
+	denominator = resolution ** 3
+
+	return bytes((numerator(t, resolution) * 255 + denominator // 2) // denominator for t in range(resolution + 1))
+
+EASE_LINEAR = __easing_table(lambda t, r: t * r * r)
+EASE_IN     = __easing_table(lambda t, r: t * t * r)
+EASE_OUT    = __easing_table(lambda t, r: r * r * r - (r - t) * (r - t) * r)
+EASE_IN_OUT = __easing_table(lambda t, r: t * t * (3 * r - 2 * t))
+
+
+class Keyframes(object):
+	'''
+	关键帧序列
+
+	关键帧数据在播放期间不能修改
+
+	参数：
+	- first：第一个关键帧
+	'''
+	def __init__(self, first):
+		self.__frames    = [first]
+		self.__durations = []
+		self.__easings   = []
+		self.__duration  = 0
+
+	def add(self, frame, duration:int, easing:bytes=EASE_IN_OUT):
+		'''
+		添加关键帧，从上一个关键帧经过 duration 毫秒按照缓动曲线变化到该帧
+
+		@return: 关键帧序列本身，便于连续添加
+		'''
+		self.__frames.append(frame)
+		self.__durations.append(duration if duration > 0 else 1)
+		self.__easings.append(easing)
+		self.__duration += duration
+
+		return self
+
+	def render(self, output, elapsed:int) -> bool:
+		'''
+		将播放 elapsed 毫秒时的画面写入输出缓冲区
+
+		@return: 播放是否仍未结束
+		'''
+		frames    = self.__frames
+		durations = self.__durations
+
+		for index in range(len(durations)):
+			duration = durations[index]
+
+			if elapsed < duration:
+				weight = self.__easings[index][elapsed * EASING_RESOLUTION // duration]
+				pixelops.blend(output, frames[index], frames[index + 1], weight)
+
+				return True
+
+			elapsed -= duration
+
+		output[:] = frames[-1]
+
+		return False
+
+	@property
+	def duration(self) -> int:
+		'''获取总时长（毫秒）'''
+		return self.__duration
+
+
+class KeyframePlayer(object):
+	'''
+	关键帧动画播放器
+
+	按照固定帧率在图层上播放关键帧动画，画面按照实际经过的时间计算，
+	由调度器驱动，不阻塞其它任务；记录每一帧的计算耗时，用于检查每帧的 CPU 预算
+
+	参数：
+	- dispatcher：任务调度器
+	- show：输出画面的函数
+	- fps：帧率，默认值 40
+	'''
+	DEFAULT_FPS = 40
+
+	def __init__(self, dispatcher, show, fps:int=DEFAULT_FPS):
+		self.__dispatcher = dispatcher
+		self.__show       = show
+		self.__period     = 1000 // fps
+
+		self.__layer     = None
+		self.__keyframes = None
+		self.__done_cb   = None
+		self.__start_ms  = 0
+
+		# 最后一帧和最长一帧的计算耗时（us），不包含输出
+		self.__render_us     = 0
+		self.__render_us_max = 0
+
+		# 保存绑定方法以保证任务 id 不变
+		self.__task_render = self.__render_cb
+
+	def play(self, layer, keyframes:Keyframes, done_cb=None):
+		'''
+		在图层上播放关键帧动画，正在播放的动画立即结束，图层的不透明度由调用者设置
+
+		参数：
+		- done_cb：结束回调函数，播放完成或被中断时调用
+		'''
+		self.stop()
+
+		self.__layer     = layer
+		self.__keyframes = keyframes
+		self.__done_cb   = done_cb
+		self.__start_ms  = ticks_ms()
+
+		layer.visible = True
+
+		if self.__render_cb():
+			self.__dispatcher.add_work(self.__task_render, self.__period)
+
+	def stop(self):
+		'''中断正在播放的动画，画面停留在当前帧，结束回调函数仍然会被调用'''
+		if self.__keyframes is None:
+			return
+
+		self.__finish()
+
+	def __finish(self):
+		self.__dispatcher.del_work(self.__task_render)
+
+		done_cb = self.__done_cb
+
+		self.__layer     = None
+		self.__keyframes = None
+		self.__done_cb   = None
+
+		if done_cb is not None:
+			done_cb()
+
+	def __render_cb(self) -> bool:
+		'''计算并输出当前帧，播放结束时返回 False'''
+		layer = self.__layer
+		start = ticks_us()
+
+		running = self.__keyframes.render(layer.buffer, ticks_diff(ticks_ms(), self.__start_ms))
+		layer.touch()
+
+		self.__render_us = ticks_diff(ticks_us(), start)
+
+		if self.__render_us > self.__render_us_max:
+			self.__render_us_max = self.__render_us
+
+		self.__show()
+
+		if not running:
+			self.__finish()
+
+		return running
+
+	@property
+	def playing(self) -> bool:
+		'''是否正在播放'''
+		return self.__keyframes is not None
+
+	@property
+	def render_us(self) -> int:
+		'''获取最后一帧的计算耗时（us）'''
+		return self.__render_us
+
+	@property
+	def render_us_max(self) -> int:
+		'''获取最长一帧的计算耗时（us）'''
+		return self.__render_us_max
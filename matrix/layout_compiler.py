@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+表盘布局编译器
+
+将 layouts.py 中的布局描述按照面板几何（matrix/geometry.py）编译为每个区域的灯珠序号表（array('H')），
+输出到 faces.py，运行时直接导入 faces.py，不需要在设备上展开区域
+
+主机上在项目根目录运行：python3 -m matrix.layout_compiler，按照 config.py 中的 WS2812_MATRIX 设置编译
+"""
+__version__ = '0.2.2'
+__version_info__ = (0, 2, 2)
+
+import sys
+from array import array
+
+try:
+	from matrix.geometry import Geometry
+except ImportError:
+	Geometry = __import__('matrix/geometry').Geometry
+
+
+FACES_FILENAME = 'matrix/faces.py'
+
+# faces.py 的格式版本，序号表格式变化时增加，旧格式的文件会重新编译
+FACES_FORMAT = 2
+
+
+class LayoutException(Exception):
+	pass
+
+
+def compile_region(name:str, segments:tuple, geometry:Geometry) -> array:
+	'''将区域描述展开为灯珠序号表'''
+	width, height = geometry.width, geometry.height
+	cells = []
+
+	for segment in segments:
+		kind = segment[0]
+
+		if kind == 'cols':
+			_, left, top, columns, rows = segment
+			points = [(x, y) for x in range(left, left + columns) for y in range(top, top + rows)]
+		elif kind == 'rows':
+			_, left, top, columns, rows = segment
+			points = [(x, y) for y in range(top, top + rows) for x in range(left, left + columns)]
+		elif kind == 'points':
+			points = segment[1]
+		else:
+			raise ValueError(f'{name}: unknown segment type {kind}')
+
+		for x, y in points:
+			if not (0 <= x < width and 0 <= y < height):
+				raise ValueError(f'{name}: ({x}, {y}) is outside {width}x{height} matrix')
+
+			index = geometry.index(x, y)
+
+			if index in cells:
+				raise ValueError(f'{name}: ({x}, {y}) is used more than once')
+
+			cells.append(index)
+
+	return array('H', cells)
+
+def compile_face(regions:dict, geometry:Geometry) -> dict:
+	'''编译一个表盘，返回 {区域名称: 序号表或分组序号表}'''
+	tables = {}
+
+	for name, region in regions.items():
+		groups = None
+
+		if isinstance(region, dict):
+			groups = region.get('groups')
+			region = region['segments']
+
+		table = tables[name] = compile_region(name, region, geometry)
+
+		if groups:
+			tables[f'{name}_groups'] = tuple(table[index:index + groups] for index in range(0, len(table), groups))
+
+	return tables
+
+def compile_layouts(geometry:Geometry, layouts:dict=None) -> dict:
+	'''按照面板几何编译对应点阵尺寸的全部表盘，返回 {表盘名称: {区域名称: 序号表}}'''
+	if layouts is None:
+		try:
+			from matrix.layouts import LAYOUTS
+		except ImportError:
+			LAYOUTS = __import__('matrix/layouts').LAYOUTS
+
+		layouts = LAYOUTS
+
+	width, height = geometry.width, geometry.height
+	faces = layouts.get((width, height))
+
+	if faces is None:
+		sizes = ', '.join(f'{w}x{h}' for w, h in sorted(layouts.keys()))
+		raise LayoutException(
+			f'no face layout for {width}x{height} matrix (WS2812_MATRIX size x TILES in config.py), '
+			f'supported sizes: {sizes}, add a layout to matrix/layouts.py for other sizes')
+
+	return {name: compile_face(regions, geometry) for name, regions in faces.items()}
+
+def format_table(table) -> str:
+	'''将序号表格式化为 array('H') 表达式，分组表格式化为 tuple'''
+	if isinstance(table, tuple):
+		return '(' + ', '.join(format_table(item) for item in table) + (',)' if len(table) == 1 else ')')
+
+	return "array('H', (" + ', '.join(str(index) for index in table) + (',))' if len(table) == 1 else '))')
+
+def output_faces(filename:str, geometry:Geometry, layouts:dict=None):
+	'''编译表盘并输出为 python 模块，每个表盘为一个类，区域为类属性'''
+	faces = compile_layouts(geometry, layouts)
+
+	with open(filename, 'w') as output:
+		output.write(
+f'''# automatic generated file by matrix/layout_compiler.py, do not edit
+from array import array
+
+FORMAT   = {FACES_FORMAT}
+WIDTH    = {geometry.width}
+HEIGHT   = {geometry.height}
+GEOMETRY = '{geometry.signature}'
+''')
+
+		for face in sorted(faces.keys()):
+			output.write(f'\n\nclass {face.upper()}(object):\n')
+
+			for name, table in sorted(faces[face].items()):
+				output.write(f'\t{name} = {format_table(table)}\n')
+
+def __import_faces():
+	try:
+		from matrix import faces
+	except ImportError:
+		try:
+			faces = __import__('matrix/faces')
+		except ImportError:
+			faces = None
+
+	return faces
+
+def load_faces(geometry:Geometry):
+	'''
+	导入编译好的表盘模块，模块不存在、格式版本或面板几何不一致时重新编译，
+	layouts.py 中没有对应点阵尺寸的布局时抛出 LayoutException
+
+	@return: faces 模块
+	'''
+	faces = __import_faces()
+
+	if faces is not None and getattr(faces, 'FORMAT', None) == FACES_FORMAT and\
+	   getattr(faces, 'GEOMETRY', None) == geometry.signature:
+		return faces
+
+	print(f'compiling layouts for {geometry.signature} matrix...')
+	output_faces(FACES_FILENAME, geometry)
+
+	# 移除已导入的旧模块，重新导入新生成的文件
+	for name in ('matrix.faces', 'matrix/faces'):
+		if name in sys.modules:
+			del sys.modules[name]
+
+	package = sys.modules.get('matrix')
+
+	if package is not None and hasattr(package, 'faces'):
+		try:
+			delattr(package, 'faces')
+		except (AttributeError, TypeError):
+			pass
+
+	return __import_faces()
+
+
+if __name__ == '__main__':
+	import os
+
+	root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+	sys.path.insert(0, root)
+
+	# 使用模拟器提供的固件模块导入 config.py
+	import simulator
+	simulator.install()
+
+	from config import Config
+
+	geometry = Geometry.from_config(Config.WS2812_MATRIX)
+
+	output_faces(os.path.join(root, FACES_FILENAME), geometry)
+	print(f'{FACES_FILENAME} generated for {geometry.signature} matrix')
@@ -0,0 +1,76 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+表盘布局描述
+
+LAYOUTS 按照点阵尺寸 (width, height) 保存表盘，每个表盘由若干区域组成，
+区域由一个或多个片段按顺序拼接，坐标原点为左上角，x 向右，y 向下：
+
+- ('cols', x, y, width, height)：矩形区域，按列扫描（先从上到下，再从左到右）
+- ('rows', x, y, width, height)：矩形区域，按行扫描（先从左到右，再从上到下）
+- ('points', ((x, y), ...))：逐个列出的灯珠
+
+区域也可以写成 {'segments': (片段, ...), 'groups': n}，编译时额外生成每 n 个灯珠一组的分组表 <区域名称>_groups
+
+本文件只在编译时使用，修改后在主机上运行 python3 -m matrix.layout_compiler 重新生成 faces.py，
+设备上找不到 faces.py 或者尺寸不一致时，第一次启动会自动编译
+"""
+
+
+def translate(faces:dict, dx:int, dy:int) -> dict:
+	'''将全部表盘的区域整体平移 (dx, dy)，用于在较大的点阵上复用较小尺寸的布局'''
+	def move(segment):
+		if segment[0] == 'points':
+			return ('points', tuple((x + dx, y + dy) for x, y in segment[1]))
+
+		kind, x, y, width, height = segment
+		return (kind, x + dx, y + dy, width, height)
+
+	result = {}
+
+	for face, regions in faces.items():
+		result[face] = {}
+
+		for name, region in regions.items():
+			if isinstance(region, dict):
+				region = dict(region)
+				region['segments'] = tuple(move(segment) for segment in region['segments'])
+			else:
+				region = tuple(move(segment) for segment in region)
+
+			result[face][name] = region
+
+	return result
+
+LAYOUTS = {
+	(9, 6): {
+		'clock': {
+			# 时、分各占 3x5 字形区域，字形掩码最高位对应区域第一个灯珠
+			'hour_tens'  : (('cols', 0, 0, 3, 5),),
+			'hour_ones'  : (('cols', 4, 0, 3, 5),),
+			'minute_tens': (('cols', 8, 0, 1, 5),),
+			# 分钟个位数每 3 个灯珠使用一种颜色
+			'minute_ones': {'segments': (('rows', 0, 5, 9, 1),), 'groups': 3},
+		},
+		'calendar_1': {
+			'day_tens': (('cols', 0, 1, 3, 5),),
+			'day_ones': (('cols', 4, 1, 3, 5),),
+			'weekday' : (('rows', 0, 0, 7, 1),),
+			# 月份每 3 个灯珠使用一种颜色
+			'month'   : {'segments': (('cols', 8, 0, 1, 6), ('cols', 7, 0, 1, 6)), 'groups': 3},
+		},
+		'calendar_2': {
+			# 日期按照日历排列，第一行只有 3 天
+			'days'   : (('rows', 4, 1, 3, 1), ('rows', 0, 2, 7, 4)),
+			'weekday': (('rows', 0, 0, 7, 1),),
+			'month'  : (('rows', 7, 0, 2, 6),),
+		},
+	},
+}
+
+# 32x8 点阵（例如一块 8x32 软屏或者 4 块 8x8 面板横向拼接），9x6 表盘居中显示
+LAYOUTS[(32, 8)] = translate(LAYOUTS[(9, 6)], 11, 1)
+
+# 32x16 点阵（例如 2 块 16x16 面板横向拼接，共 512 个灯珠），9x6 表盘居中显示，跨越两块面板
+LAYOUTS[(32, 16)] = translate(LAYOUTS[(9, 6)], 11, 5)
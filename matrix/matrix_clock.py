@@ -2,13 +2,14 @@
 Copyright © 2023 Walkline Wang (https://walkline.wang)
 Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
 """
-__version__ = '0.1.4'
-__version_info__ = (0, 1, 4)
+__version__ = '0.1.22'
+__version_info__ = (0, 1, 22)
 print('module matrix_clock version:', __version__)
 
 
 #region import modules
 from machine import RTC
+from array import array
 import utime
 import gc
 
@@ -39,6 +40,37 @@ try:
 except ImportError:
 	Animation = __import__('matrix/animation').Animation
 
+try:
+	from matrix.palette import lightness_curve
+except ImportError:
+	lightness_curve = __import__('matrix/palette').lightness_curve
+
+try:
+	from matrix.layout_compiler import load_faces
+except ImportError:
+	load_faces = __import__('matrix/layout_compiler').load_faces
+
+try:
+	from matrix.geometry import Geometry
+except ImportError:
+	Geometry = __import__('matrix/geometry').Geometry
+
+try:
+	from matrix.compositor import Layer
+except ImportError:
+	Layer = __import__('matrix/compositor').Layer
+
+try:
+	from matrix.sequencer import Sequencer
+except ImportError:
+	Sequencer = __import__('matrix/sequencer').Sequencer
+
+try:
+	from matrix.keyframes import Keyframes, KeyframePlayer, EASE_IN_OUT
+except ImportError:
+	_keyframes = __import__('matrix/keyframes')
+	Keyframes, KeyframePlayer, EASE_IN_OUT = _keyframes.Keyframes, _keyframes.KeyframePlayer, _keyframes.EASE_IN_OUT
+
 gc.collect()
 
 
@@ -122,115 +154,80 @@ class DateTime(object):
 #region matrix model classes
 class ModelClock(object):
 	'''
-	时钟模式，分区显示当前时间的时、分信息
+	时钟模式，分区显示当前时间的时、分信息，分区序号表见 layouts.py
 	'''
-	# Led 点阵分区列表
-	HOUR_TENS_RANGE = (range(0, 5), range(6, 11), range(12, 17))
-	HOUR_ONES_RANGE = (range(24, 29), range(30, 35), range(36, 41))
-	MINUTE_TENS_RANGE = range(48, 53)
-	MINUTE_ONES_RANGE = (5, 11, 17, 23, 29, 35, 41, 47, 53)
-
 	# 字形列表
 	NUMBERS_GLYPH = {
-		'0': 0x7e3f, # '111111000111111'
-		'1': 0x27e1, # '010011111100001'
-		'2': 0x5ebd, # '101111010111101'
-		'3': 0x56bf, # '101011010111111'
-		'4': 0x709f, # '111000010011111'
-		'5': 0x76b7, # '111011010110111'
-		'6': 0x7eb7, # '111111010110111'
-		'7': 0x421f, # '100001000011111'
-		'8': 0x7ebf, # '111111010111111'
-		'9': 0x76bf, # '111011010111111'
+		0: 0x7e3f, # '111111000111111'
+		1: 0x27e1, # '010011111100001'
+		2: 0x5ebd, # '101111010111101'
+		3: 0x56bf, # '101011010111111'
+		4: 0x709f, # '111000010011111'
+		5: 0x76b7, # '111011010110111'
+		6: 0x7eb7, # '111111010110111'
+		7: 0x421f, # '100001000011111'
+		8: 0x7ebf, # '111111010111111'
+		9: 0x76bf, # '111011010111111'
 	}
 
-	def __init__(self):
-		self.hour_tens_list = []
-		self.hour_ones_list = []
-		self.minute_tens_list = list(ModelClock.MINUTE_TENS_RANGE)
-		self.minute_ones_list = list(ModelClock.MINUTE_ONES_RANGE)
-
-		self.__fill_range_list()
+	def __init__(self, face):
+		self.hour_tens_list = face.hour_tens
+		self.hour_ones_list = face.hour_ones
+		self.minute_tens_list = face.minute_tens
+		self.minute_ones_list = face.minute_ones
 
-	def __fill_range_list(self):
-		for _ in ModelClock.HOUR_TENS_RANGE:
-			self.hour_tens_list += list(_)
-		for _ in ModelClock.HOUR_ONES_RANGE:
-			self.hour_ones_list += list(_)
+		# 分钟个位数每 3 个灯珠使用一种颜色
+		self.minute_ones_groups = face.minute_ones_groups
 
 
 class ModelCalendar_1(object):
 	'''
-	台历模式1，分区显示当前日期的月、日、周信息，日期用数字展示
+	台历模式1，分区显示当前日期的月、日、周信息，日期用数字展示，分区序号表见 layouts.py
 	'''
-	# Led 点阵分区列表
-	DAY_TENS_RANGE = (range(1, 6), range(7, 12), range(13, 18))
-	DAY_ONES_RANGE = (range(25, 30), range(31, 36), range(37, 42))
-	MONTH_RANGE = (range(48, 54), range(42, 48))
-	WEEKDAY_RANGE = (0, 6, 12, 18, 24, 30, 36)
-
 	# 字形列表
 	# NUMBERS_GLYPH = {
-	# 	'0': 0x7e3f, # '111111000111111'
-	# 	'1': 0x27e1, # '010011111100001'
-	# 	'2': 0x5ebd, # '101111010111101'
-	# 	'3': 0x56bf, # '101011010111111'
-	# 	'4': 0x709f, # '111000010011111'
-	# 	'5': 0x76b7, # '111011010110111'
-	# 	'6': 0x7eb7, # '111111010110111'
-	# 	'7': 0x421f, # '100001000011111'
-	# 	'8': 0x7ebf, # '111111010111111'
-	# 	'9': 0x76bf, # '111011010111111'
+	# 	0: 0x7e3f, # '111111000111111'
+	# 	1: 0x27e1, # '010011111100001'
+	# 	2: 0x5ebd, # '101111010111101'
+	# 	3: 0x56bf, # '101011010111111'
+	# 	4: 0x709f, # '111000010011111'
+	# 	5: 0x76b7, # '111011010110111'
+	# 	6: 0x7eb7, # '111111010110111'
+	# 	7: 0x421f, # '100001000011111'
+	# 	8: 0x7ebf, # '111111010111111'
+	# 	9: 0x76bf, # '111011010111111'
 	# }
 	NUMBERS_GLYPH = {
-		'0': 0x7e3f, # '111111000111111'
-		'1': 0x43e0, # '100001111100000'
-		'2': 0x4ebd, # '100111010111101'
-		'3': 0x56ae, # '101011010101110'
-		'4': 0x705f, # '111000001011111'
-		'5': 0x36b7, # '011011010110111'
-		'6': 0x7aa7, # '111101010100111'
-		'7': 0x429f, # '100001010011111'
-		'8': 0x6ebb, # '110111010111011'
-		'9': 0x72bf, # '111001010111111'
+		0: 0x7e3f, # '111111000111111'
+		1: 0x43e0, # '100001111100000'
+		2: 0x4ebd, # '100111010111101'
+		3: 0x56ae, # '101011010101110'
+		4: 0x705f, # '111000001011111'
+		5: 0x36b7, # '011011010110111'
+		6: 0x7aa7, # '111101010100111'
+		7: 0x429f, # '100001010011111'
+		8: 0x6ebb, # '110111010111011'
+		9: 0x72bf, # '111001010111111'
 	}
 
-	def __init__(self):
-		self.__day_tens_list = []
-		self.__day_ones_list = []
-		self.__month_list = []
-		self.__weekday_list = list(ModelCalendar_1.WEEKDAY_RANGE)
-
-		self.__fill_range_list()
+	def __init__(self, face):
+		self.__day_tens_list = face.day_tens
+		self.__day_ones_list = face.day_ones
+		self.__month_list = face.month
+		self.__weekday_list = face.weekday
 
-	def __fill_range_list(self):
-		for _ in ModelCalendar_1.DAY_TENS_RANGE:
-			self.__day_tens_list += list(_)
-		for _ in ModelCalendar_1.DAY_ONES_RANGE:
-			self.__day_ones_list += list(_)
-		for _ in ModelCalendar_1.MONTH_RANGE:
-			self.__month_list += list(_)
+		# 月份每 3 个灯珠使用一种颜色
+		self.__month_groups = face.month_groups
 
 
 class ModelCalendar_2(object):
 	'''
-	台历模式2，分区显示当前日期的月、日、周信息，日期全部展示，需要额外的面板
+	台历模式2，分区显示当前日期的月、日、周信息，日期全部展示，需要额外的面板，分区序号表见 layouts.py
 	'''
-	# Led 点阵分区列表
-	DAYS_RANGE = (
-					   25, 31, 37,
-		2,  8, 14, 20, 26, 32, 38,
-		3,  9, 15, 21, 27, 33, 39,
-		4, 10, 16, 22, 28, 34, 40,
-		5, 11, 17, 23, 29, 35, 41
-	)
-	MONTH_RANGE = (42, 48, 43, 49, 44, 50, 45, 51, 46, 52, 47, 53)
-	WEEKDAY_RANGE = (0, 6, 12, 18, 24, 30, 36)
-
-	def __init__(self):
-		self.__days_list = list(ModelCalendar_2.DAYS_RANGE)
-		self.__month_list = list(ModelCalendar_2.MONTH_RANGE)
-		self.__weekday_list = list(ModelCalendar_2.WEEKDAY_RANGE)
+	def __init__(self, face):
+		self.__days_list = face.days
+		self.__month_list = face.month
+		self.__weekday_list = face.weekday
 #endregion matrix model classes
 
 
@@ -256,30 +253,93 @@ class MatrixClock(WS2812, DateTime):
 		MODE_UPDATE    : Animation.MENU_UPDATE
 	}
 
-	BRIGHTNESS_LEVEL = {
-		Photoresistor.LEVEL_1: 60,
-		Photoresistor.LEVEL_2: 50,
-		Photoresistor.LEVEL_3: 40,
-		Photoresistor.LEVEL_4: 30,
-		Photoresistor.LEVEL_5: 20,
-		Photoresistor.LEVEL_6: 10
-	}
+	# 环境光最亮和最暗时的亮度百分比，中间按照 CIE L* 感知亮度连续变化
+	BRIGHTNESS_RANGE = (60, 10)
+
+	# 亮度曲线查找表每段对应的采样值位数，采样值 0~4095 分为 32 段
+	BRIGHTNESS_CURVE_SHIFT = 7
+
+	# 输出级亮度变化超过该数值时才开始渐变
+	BRIGHTNESS_THRESHOLD = 3
+
+	# 亮度渐变每帧间隔时长
+	FADE_PERIOD_MS = 40
+
+	# 消除效果每一步间隔时长
+	ERASE_STEP_MS = 50
+
+	# 关键帧动画帧率
+	KEYFRAME_FPS = 40
+
+	# 分钟变化时新旧画面交叉淡入淡出时长
+	CROSSFADE_MS = 300
+
+	# 切换菜单时从当前画面过渡到菜单动画第一帧的时长
+	MENU_FADE_MS = 200
+
+	# 整点报时闪烁，每一步为 (颜色, 时长 ms)
+	BLINK_STEPS = (
+		(CONFIG.COLORS.WHITE, 100),
+		(CONFIG.COLORS.BLACK, 100),
+		(CONFIG.COLORS.WHITE, 100),
+		(CONFIG.COLORS.BLACK, 100),
+		(CONFIG.COLORS.WHITE, 500),
+	)
+
+	def __init__(self, defer_mode:int=Dispatcher.DEFER_SCHEDULE, timer_id:int=0):
+		'''
+		参数：
+		- defer_mode：耗时任务的执行方式，使用 Dispatcher.DEFER_LOOP 时需要在主循环中调用 run_pending()
+		- timer_id：任务调度定时器 ID，设置为 None 时需要在 asyncio 事件循环中运行 run_async()
+		'''
+		# 面板几何，以及按照面板几何预先编译的表盘区域序号表，配置不支持时在初始化硬件之前报错
+		geometry = Geometry.from_config(CONFIG.WS2812_MATRIX)
+		faces    = load_faces(geometry)
 
-	def __init__(self):
 		WS2812.__init__(self,
-			CONFIG.WS2812_MATRIX.WIDTH,
-			CONFIG.WS2812_MATRIX.HEIGHT,
-			CONFIG.PINS.DIN_MATRIX)
+			geometry.width,
+			geometry.height,
+			CONFIG.PINS.DIN_MATRIX,
+			geometry,
+			getattr(CONFIG.WS2812_MATRIX, 'RMT_CHANNELS', None))
 		DateTime.__init__(self)
 
-		self.__tasks     = Dispatcher()
+		self.__tasks     = Dispatcher(timer_id=timer_id, defer_mode=defer_mode)
+
+		# 非阻塞效果序列，分别用于表盘消除效果、整点报时闪烁和单次播放的动画
+		self.__erase_effect     = Sequencer(self.__tasks)
+		self.__blink_effect     = Sequencer(self.__tasks)
+		self.__animation_effect = Sequencer(self.__tasks)
+
+		# 关键帧动画，分别用于分钟变化的交叉淡入淡出（效果图层）和菜单切换（动画图层）
+		self.__minute_crossfade = KeyframePlayer(self.__tasks, self.show, MatrixClock.KEYFRAME_FPS)
+		self.__menu_transition  = KeyframePlayer(self.__tasks, self.show, MatrixClock.KEYFRAME_FPS)
+
 		self.__adc       = Photoresistor(CONFIG.PINS.BRIGHTNESS_ADC)
-		self.__animation = Animation()
 
-		# 模式对象实例
+		# 环境光采样值到输出级亮度的曲线，多一项用于插值
+		self.__brightness_curve = lightness_curve((4096 >> MatrixClock.BRIGHTNESS_CURVE_SHIFT) + 1, *MatrixClock.BRIGHTNESS_RANGE)
+		self.__animation = Animation(self.led_count, self.led_bpp, self.led_order, geometry)
+
+		# 模式对象实例，启动时全部创建，切换模式时不再重新创建
+		self.__models = {
+			MatrixClock.MODE_CLOCK     : ModelClock(faces.CLOCK),
+			MatrixClock.MODE_CALENDAR_1: ModelCalendar_1(faces.CALENDAR_1),
+			MatrixClock.MODE_CALENDAR_2: ModelCalendar_2(faces.CALENDAR_2),
+		}
 		self.__model_clock    = None
 		self.__model_calendar = None
 
+		# 每种模式最后一次绘制的像素数据，{mode: [显示内容对应的分钟或日期, 像素数据]}
+		# 像素缓冲区保存全亮度颜色，缓存内容与亮度无关
+		self.__frame_cache = {mode: [None, bytearray(len(self.buffer))] for mode in MatrixClock.MODE_LIST.keys()}
+		self.__content_mode = None # 表盘缓冲区中当前内容对应的模式
+
+		# 交叉淡入淡出的起止画面，关键帧序列只创建一次
+		self.__crossfade_from = bytearray(len(self.buffer))
+		self.__crossfade_to   = bytearray(len(self.buffer))
+		self.__crossfade_keyframes = Keyframes(self.__crossfade_from).add(self.__crossfade_to, MatrixClock.CROSSFADE_MS, EASE_IN_OUT)
+
 		'''
 		设备工作模式
 		  工作模式就是 MODE_LIST 列出来的三种
@@ -290,7 +350,7 @@ class MatrixClock(WS2812, DateTime):
 		self.__display_mode   = self.__working_mode
 		self.__menu_mode      = False
 		self.__last_menu      = self.__working_mode
-		self.__last_adc_level = 0     # 记录当前 adc 等级
+		self.__auto_level     = None  # 记录自动亮度目标输出级亮度
 		self.__last_hour      = 0     # 记录当前小时
 		self.__last_minute    = 0     # 记录当前分钟
 		self.__started        = False # 设备运行状态
@@ -298,14 +358,19 @@ class MatrixClock(WS2812, DateTime):
 		self.__hourly_chime   = True  # 整点报时开关
 		self.__powered_on     = True  # 屏幕显示开关
 
-		# 定时器任务
-		self.__task_sync_ntp_time    = lambda: self.__sync_time_cb()
-		self.__task_auto_brightness  = lambda: self.__auto_brightness_cb()
-		self.__task_refresh_time     = lambda: self.__refresh_time_cb()
-		self.__task_refresh_calendar = lambda: self.__refresh_calendar_cb()
-		self.__task_show_animation   = lambda: self.__show_animation_cb()
-		self.__task_switch_display   = lambda: self.__switch_display_cb()
-		self.__task_checking_update  = lambda: self.__online_update_check_cb()
+		# 定时器任务，保存绑定方法以保证任务 id 不变，统计数据使用方法名称显示
+		self.__task_sync_ntp_time    = self.__sync_time_cb
+		self.__task_auto_brightness  = self.__auto_brightness_cb
+		self.__task_refresh_time     = self.__refresh_time_cb
+		self.__task_refresh_calendar = self.__refresh_calendar_cb
+		self.__task_show_animation   = self.__show_animation_cb
+		self.__task_fade_brightness  = self.__fade_brightness_cb
+		self.__task_switch_display   = self.__switch_display_cb
+		self.__task_checking_update  = self.__online_update_check_cb
+		self.__task_present_frame    = self.__present_frame_cb
+
+		# 限制帧率，同一帧周期内的多次刷新合并，由调度器在下一个帧周期输出
+		self.frame_pending_cb = self.__schedule_frame_cb
 
 		self.switch_working_mode(self.mode)
 		self.__start_auto_brightness()
@@ -314,7 +379,12 @@ class MatrixClock(WS2812, DateTime):
 		print(f'starting {MatrixClock.MODE_LIST[self.mode]} mode')
 
 		if not self.__time_synced:
-			self.sync_time()
+			if self.__tasks.is_async:
+				# asyncio 运行方式下不能阻塞事件循环，由校时任务稍后异步重试
+				if not self.__tasks.has_work(self.__task_sync_ntp_time):
+					self.__start_sync_time()
+			else:
+				self.sync_time()
 
 		self.__started = True
 
@@ -325,34 +395,88 @@ class MatrixClock(WS2812, DateTime):
 			MatrixClock.MODE_CALENDAR_2):
 			self.__refresh_calendar_cb()
 
-	def stop(self):
+	def stop(self, clean:bool=True):
+		'''
+		停止刷新显示内容
+
+		参数：
+		- clean：是否清除屏幕，切换模式时保留当前画面直到新模式的内容显示
+		'''
 		self.__started = False
 
 		self.__tasks.del_work(self.__task_refresh_time)
 		self.__tasks.del_work(self.__task_refresh_calendar)
-		self.__tasks.del_work(self.__task_show_animation)
+		self.__erase_effect.stop()
+		self.__minute_crossfade.stop()
+		self.__hide_animation()
 
-		self.clean()
+		if clean:
+			self.clean()
+			self.__content_mode = None
 
 	def show_content(self):
 		'''显示当前工作模式下需要展示的内容'''
 		if not self.__powered_on or not self.__started:
 			return
 
-		print(f'showing {MatrixClock.MODE_LIST[self.mode]} content')
+		mode = self.mode
+		print(f'showing {MatrixClock.MODE_LIST[mode]} content')
 
-		if self.mode == MatrixClock.MODE_CLOCK:
-			self.show_time()
-		elif self.mode == MatrixClock.MODE_CALENDAR_1:
+		# 绘制期间定时器中的效果和动画不会输出绘制了一半的表盘，绘制结束时统一输出
+		self.begin_draw()
+
+		try:
+			self.__draw_content(mode)
+		finally:
+			self.end_draw()
+
+	def __draw_content(self, mode:int):
+		'''绘制指定模式的表盘内容，显示内容与缓存相同时直接复制缓存的像素数据'''
+		key   = self.__frame_key(mode)
+		cache = self.__frame_cache[mode]
+
+		if cache[0] == key:
+			self.buffer[:] = cache[1]
+			self.__content_mode = mode
+			return
+
+		# 不同模式点亮的灯珠不同，在其它模式的画面上绘制会残留旧内容，需要先清除，
+		# 保证写入缓存的画面只包含当前模式的内容
+		if self.__content_mode != mode:
+			self.clean(output=False)
+
+		if mode == MatrixClock.MODE_CLOCK:
+			# 表盘上是上一分钟的时钟画面时，以交叉淡入淡出过渡到新画面
+			self.show_time(cache[0] is not None and self.__content_mode == MatrixClock.MODE_CLOCK)
+		elif mode == MatrixClock.MODE_CALENDAR_1:
 			self.show_calendar_1()
-		elif self.mode == MatrixClock.MODE_CALENDAR_2:
+		elif mode == MatrixClock.MODE_CALENDAR_2:
 			self.show_calendar_2()
 
+		cache[0] = key
+		cache[1][:] = self.buffer
+		self.__content_mode = mode
+
 	def switch_power(self):
 		'''开启/关闭屏幕显示'''
 		self.__powered_on = not self.__powered_on
 
-		self.show_content() if self.__powered_on else self.clean()
+		if self.__powered_on:
+			self.show_content()
+		else:
+			# 正在播放的整点报时和表盘过渡效果立即结束，不在关闭的屏幕上继续绘制，
+			# 效果结束回调中的 show() 推迟到 end_draw()，只输出一次黑屏
+			self.begin_draw()
+
+			try:
+				self.__blink_effect.stop()
+				self.__erase_effect.stop()
+				self.__minute_crossfade.stop()
+
+				self.clean(output=False)
+				self.__content_mode = None
+			finally:
+				self.end_draw()
 
 	def switch_working_mode(self, mode):
 		'''切换工作模式，切换后需要手动调用 start() 函数'''
@@ -361,19 +485,14 @@ class MatrixClock(WS2812, DateTime):
 
 		print(f'switching to {MatrixClock.MODE_LIST[self.mode]} mode{suffix}')
 
-		self.stop()
+		self.stop(clean=False)
 
-		self.__model_clock = None
-		self.__model_calendar = None
+		model = self.__models[self.mode]
 
 		if self.mode == MatrixClock.MODE_CLOCK:
-			self.__model_clock = ModelClock()
-		elif self.mode == MatrixClock.MODE_CALENDAR_1:
-			self.__model_calendar = ModelCalendar_1()
-		elif self.mode == MatrixClock.MODE_CALENDAR_2:
-			self.__model_calendar = ModelCalendar_2()
-
-		gc.collect()
+			self.__model_clock = model
+		else:
+			self.__model_calendar = model
 
 	def switch_display_mode(self):
 		'''临时切换显示时钟和台历1'''
@@ -381,23 +500,34 @@ class MatrixClock(WS2812, DateTime):
 
 
 	def show_hide_menu(self, save:bool=True):
-		'''进入/退出菜单模式'''
+		'''
+		进入/退出菜单模式，菜单显示在动画图层，表盘内容在菜单下方继续刷新，
+		菜单模式下不播放整点报时和表盘过渡效果
+		'''
 		if self.__menu_mode:
+			self.__menu_mode = False
+
 			if save and\
 			   self.mode != self.__last_menu and\
 			   self.__last_menu in MatrixClock.MODE_LIST.keys():
 				self.__display_mode = self.__last_menu
 				self.switch_working_mode(self.__last_menu)
 				self.__output_matrix_mode_file()
-
-			self.__menu_mode = False
-			self.__last_menu = self.mode
-			self.stop()
-			self.start()
+				self.__last_menu = self.mode
+				self.start()
+			else:
+				# 工作模式没有变化，菜单淡出后隐藏即可显示表盘，不需要重新绘制
+				self.__last_menu = self.mode
+				self.__hide_menu()
 		else:
 			self.__menu_mode = True
 			self.__last_menu = self.mode
-			self.stop()
+
+			# 正在播放的效果立即结束，不覆盖在菜单上
+			self.__blink_effect.stop()
+			self.__erase_effect.stop()
+			self.__minute_crossfade.stop()
+
 			self.switch_menu(True)
 
 	def switch_menu(self, first=False):
@@ -412,37 +542,51 @@ class MatrixClock(WS2812, DateTime):
 		if not ONLINE_UPDATE_ENABLED and self.__last_menu == MatrixClock.MODE_UPDATE:
 			self.__last_menu = (self.__last_menu + 1) % len(MatrixClock.MENU_LIST)
 
-		self.__show_animation(MatrixClock.MENU_LIST[self.__last_menu], self.convert_color(CONFIG.COLORS.SKYBLUE))
+		self.__show_animation(MatrixClock.MENU_LIST[self.__last_menu], CONFIG.COLORS.SKYBLUE)
 
 
 	def sync_time(self):
-		self.__sync_time_cb()
+		self.__time_synced = Utilities.sync_time()
+		self.__start_sync_time()
+
+	async def sync_time_async(self):
+		'''异步联网校时，用于 asyncio 运行方式'''
+		self.__time_synced = await Utilities.sync_time_async()
+		self.__start_sync_time()
+
+	async def run_async(self):
+		'''在 asyncio 事件循环中运行所有定时任务，初始化时需要将 timer_id 设置为 None'''
+		await self.__tasks.run_async()
+
+	def run_pending(self) -> int:
+		'''执行到期的耗时任务，使用 Dispatcher.DEFER_LOOP 时需要在主循环中调用'''
+		return self.__tasks.run_pending()
 
 	def check_update(self):
-		self.__show_animation(Animation.UPDATING, self.convert_color(CONFIG.COLORS.SKYBLUE))
-		self.__tasks.add_work(self.__task_checking_update, len(self.__animation.__frames) * self.__animation.period)
+		self.__show_animation(Animation.UPDATING, CONFIG.COLORS.SKYBLUE)
+		self.__tasks.add_work(self.__task_checking_update, self.__animation.frame_count * self.__animation.period, deferred=True)
 
 
 	def show_blink(self):
-		'''用于整点报时的闪烁'''
+		'''用于整点报时的闪烁，在提示图层显示，不阻塞其它任务，结束后直接恢复原有内容'''
 		if not self.__powered_on:
 			return
 
-		color = CONFIG.COLORS.WHITE
+		notification = self.notification
 
-		self.fill(color)
-		utime.sleep(0.1)
-		self.clean()
-		utime.sleep(0.1)
-		self.fill(color)
-		utime.sleep(0.1)
-		self.clean()
-		utime.sleep(0.1)
-		self.fill(color)
-		utime.sleep(0.5)
-		self.clean()
+		def flash(color):
+			def work():
+				notification.visible = True
+				notification.fill(color)
+				self.show()
 
-		self.show_content()
+			return work
+
+		def done():
+			notification.visible = False
+			self.show()
+
+		self.__blink_effect.play([(flash(color), duration) for color, duration in MatrixClock.BLINK_STEPS], done)
 
 	def show_connecting_animation(self):
 		'''播放配网/联网简易动画'''
@@ -453,19 +597,19 @@ class MatrixClock(WS2812, DateTime):
 			__import__(WifiHandler.STA_CONFIG_IMPORT_NAME)
 
 			animation = Animation.CONNECT_WIFI
-			colors    = self.convert_color(CONFIG.COLORS.WHITE)
+			colors    = CONFIG.COLORS.WHITE
 		except ImportError:
 			animation = Animation.CONFIG_WIFI
 
 			if WifiHandler.is_ble_mode():
 				colors = (
-					self.convert_color(CONFIG.COLORS.BLACK),
-					self.convert_color(CONFIG.COLORS.SKYBLUE)
+					CONFIG.COLORS.BLACK,
+					CONFIG.COLORS.SKYBLUE
 				)
 			else:
 				colors = (
-					self.convert_color(CONFIG.COLORS.BLACK),
-					self.convert_color(CONFIG.COLORS.LIGHTGREEN)
+					CONFIG.COLORS.BLACK,
+					CONFIG.COLORS.LIGHTGREEN
 				)
 
 		self.__show_animation(animation, colors)
@@ -480,108 +624,192 @@ class MatrixClock(WS2812, DateTime):
 		if not isinstance(colors, (tuple, list)):
 			return
 
+		overlay = self.overlay
+
+		# 过渡的起始画面为正在显示的动画或者表盘
+		start = overlay.buffer if overlay.visible else self.buffer
+
 		self.__tasks.del_work(self.__task_show_animation)
+		self.__menu_transition.stop()
 		self.__animation.select_animation(animation, colors)
-		# self.__show_animation_cb()
-		self.__tasks.add_work(self.__task_show_animation, self.__animation.period)
+		overlay.set_opaque()
 
-	def __show_animation_async(self, animation:int, colors:tuple):
-		'''异步播放简易动画'''
-		if animation not in Animation.ANIMATION_LIST:
+		if self.__animation.loops:
+			self.__tasks.add_work(self.__task_show_animation, self.__animation.period)
+		else:
+			# 单次播放的菜单动画转换为关键帧，从起始画面淡入后逐帧平滑过渡，停留在最后一帧
+			self.__menu_transition.play(overlay, self.__animation.to_keyframes(start, MatrixClock.MENU_FADE_MS))
+
+	def __play_animation(self, animation:int, colors:tuple, done_cb=None):
+		'''单次播放简易动画，不阻塞其它任务，播放结束后调用 done_cb'''
+		steps = ()
+
+		self.__menu_transition.stop()
+
+		if animation in Animation.ANIMATION_LIST and isinstance(colors, (tuple, list)):
+			self.__animation.select_animation(animation, colors)
+			self.overlay.set_opaque()
+
+			steps = ((self.__task_show_animation, self.__animation.period),) * self.__animation.frame_count
+
+		self.__animation_effect.play(steps, done_cb)
+
+	def __hide_menu(self):
+		'''动画图层从当前菜单画面淡出到表盘，结束后隐藏动画图层'''
+		self.__tasks.del_work(self.__task_show_animation)
+
+		overlay = self.overlay
+
+		if not overlay.visible:
+			self.show()
 			return
 
-		if not isinstance(colors, (tuple, list)):
+		keyframes = Keyframes(bytes(overlay.buffer)).add(bytes(self.buffer), MatrixClock.MENU_FADE_MS, EASE_IN_OUT)
+
+		def done():
+			# 淡出期间重新进入菜单时保留动画图层
+			if self.__menu_mode:
+				return
+
+			overlay.visible = False
+			self.show()
+
+		self.__menu_transition.play(overlay, keyframes, done)
+
+	def __hide_animation(self):
+		'''停止播放动画并隐藏动画图层'''
+		self.__tasks.del_work(self.__task_show_animation)
+		self.__menu_transition.stop()
+		self.overlay.visible = False
+
+	def __play_erase(self, rounds:list):
+		'''
+		消除效果，效果图层保留当前画面并覆盖 rounds 中的全部灯珠，
+		之后每一步露出下方新画面中的一组灯珠，需要在绘制新画面前调用
+
+		参数：
+		- rounds：每一步露出的灯珠序号表
+
+		菜单模式下不播放，表盘直接显示新画面
+		'''
+		self.__erase_effect.stop()
+		self.__minute_crossfade.stop()
+
+		if self.__menu_mode:
 			return
 
-		self.__animation.select_animation(animation, colors)
+		effects = self.effects
+		effects.buffer[:] = self.buffer
+		effects.clear()
+
+		for indices in rounds:
+			effects.set_alpha(indices, Layer.OPAQUE)
+
+		effects.visible = True
+
+		def reveal(indices):
+			def work():
+				effects.set_alpha(indices, Layer.TRANSPARENT)
+				self.show()
+
+			return work
+
+		# 每一步先等待，再露出一组灯珠，第一步露出前新画面已经绘制完成
+		steps = []
+
+		for indices in rounds:
+			steps.append((None, MatrixClock.ERASE_STEP_MS))
+			steps.append((reveal(indices), 0))
+
+		self.__erase_effect.play(steps, self.__hide_effects)
+
+	def __play_crossfade(self):
+		'''效果图层从 __crossfade_from 渐变到表盘上的新画面，需要在绘制新画面后调用'''
+		self.__crossfade_to[:] = self.buffer
+
+		effects = self.effects
+		effects.set_opaque()
+
+		self.__minute_crossfade.play(effects, self.__crossfade_keyframes, self.__hide_effects)
 
-		for _ in range(len(self.__animation.__frames)):
-			self.__show_animation_cb()
-			utime.sleep_ms(self.__animation.period)
+	def __hide_effects(self):
+		'''消除效果或交叉淡入淡出结束，隐藏效果图层'''
+		self.effects.visible = False
+		self.show()
 
 
 	#region model clock related function
-	def show_time(self):
-		'''刷新时钟内容'''
+	def show_time(self, crossfade:bool=False):
+		'''
+		刷新时钟内容
+
+		参数：
+		- crossfade：从表盘上的当前画面交叉淡入淡出到新画面，播放消除效果或整点报时的时候不使用
+
+		菜单模式下表盘在菜单下方继续刷新，但不播放整点报时和过渡效果
+		'''
 		self.now()
 
+		if crossfade:
+			self.__crossfade_from[:] = self.buffer
+
 		is_new_hour = False
 
 		if self.__last_hour != self.__hour and self.__minute == 0:
 			self.__last_hour = self.__hour
 			is_new_hour = True
 
-			if self.hourly_chime:
+			if self.hourly_chime and not self.__menu_mode:
 				self.show_blink()
 
 		self.__set_hour()
 		self.__set_minute(is_new_hour)
-		self.show()
 
-	def __set_hour(self):
-		hour = self.__zfill_2int(self.__hour)
-		hour_tens = self.__zfile_15bin(ModelClock.NUMBERS_GLYPH[hour[0]])
-		hour_ones = self.__zfile_15bin(ModelClock.NUMBERS_GLYPH[hour[1]])
+		if crossfade and not self.__menu_mode and not self.__erase_effect.playing and not self.__blink_effect.playing:
+			self.__play_crossfade()
 
-		hour_color = self.convert_color(CONFIG.COLORS.TIME_HOUR)
+		self.show()
 
-		for index, bit in enumerate(hour_tens):
-			self.__neopixel[self.__model_clock.hour_tens_list[index]] = hour_color if bit == '1' else CONFIG.COLORS.BLACK
+	def __set_hour(self):
+		hour_color = CONFIG.COLORS.TIME_HOUR
 
-		for index, bit in enumerate(hour_ones):
-			self.__neopixel[self.__model_clock.hour_ones_list[index]] = hour_color if bit == '1' else CONFIG.COLORS.BLACK
+		self.blit_mask(self.__model_clock.hour_tens_list, ModelClock.NUMBERS_GLYPH[self.__hour // 10], hour_color)
+		self.blit_mask(self.__model_clock.hour_ones_list, ModelClock.NUMBERS_GLYPH[self.__hour % 10], hour_color)
 
 	def __set_minute(self, is_new_hour:bool):
 		if is_new_hour:
-			def clean_minute_tens():
-				for index in range(4, -1, -1):
-					self.__neopixel[self.__model_clock.minute_tens_list[index]] = CONFIG.COLORS.BLACK
-					yield
+			minute_tens_list = self.__model_clock.minute_tens_list
+			minute_ones_list = self.__model_clock.minute_ones_list
 
 			if not self.hourly_chime:
-				# 以动画效果消除分钟
-				minute_tens_gen = clean_minute_tens()
-				for index in range(8, -1, -1):
-					try:
-						next(minute_tens_gen)
-					except StopIteration:
-						pass
-
-					self.__neopixel[self.__model_clock.minute_ones_list[index]] = CONFIG.COLORS.BLACK
-					utime.sleep(0.05)
-					self.show()
+				# 以动画效果消除分钟，个位数和十位数从最后一个灯珠开始同时消除
+				self.__play_erase([
+					array('H', (minute_ones_list[index], minute_tens_list[index - 4])) if index >= 4 else array('H', (minute_ones_list[index],))
+					for index in range(8, -1, -1)
+				])
+
+			self.blit_bar(minute_tens_list, 0, CONFIG.COLORS.BLACK)
+			self.blit_bar(minute_ones_list, 0, CONFIG.COLORS.BLACK)
 		else:
-			minute = self.__zfill_2int(self.__minute)
-			minute_tens = int(minute[0])
-			minute_ones = int(minute[1])
-
-			minute_tens_color = self.convert_color(CONFIG.COLORS.TIME_MINUTE_TENS)
-			minute_ones_colors = {
-				0: self.convert_color(CONFIG.COLORS.TIME_MINUTE_ONES_1),
-				1: self.convert_color(CONFIG.COLORS.TIME_MINUTE_ONES_2),
-				2: self.convert_color(CONFIG.COLORS.TIME_MINUTE_ONES_3)
-			}
+			minute_tens = self.__minute // 10
+			minute_ones = self.__minute % 10
 
-			for count, index in enumerate(self.__model_clock.minute_tens_list):
-				self.__neopixel[index] = minute_tens_color if count < minute_tens else CONFIG.COLORS.BLACK
+			self.blit_bar(self.__model_clock.minute_tens_list, minute_tens, CONFIG.COLORS.TIME_MINUTE_TENS)
 
 			if self.__last_minute != self.__minute:
 				self.__last_minute = self.__minute
 
 				if minute_ones == 0:
-					for index in range(8, -1, -1):
-						self.__neopixel[self.__model_clock.minute_ones_list[index]] = CONFIG.COLORS.BLACK
-						utime.sleep(0.05)
-						self.show()
-
-			for count, index in enumerate(self.__model_clock.minute_ones_list):
-				'''
-				假设有一组连续的数字，把它们每 n 个分为一组，随意指定一个数字 x，求 x 在哪一组？
-				公式为：int((x + 1) // (n + 0.1))
-				感谢 Jason 提供的算法
-				'''
-				minute_ones_color = minute_ones_colors[int((count + 1) // 3.1)]
-				self.__neopixel[index] = minute_ones_color if count < minute_ones else CONFIG.COLORS.BLACK
+					# 以动画效果消除分钟个位数
+					minute_ones_list = self.__model_clock.minute_ones_list
+					self.__play_erase([array('H', (minute_ones_list[index],)) for index in range(8, -1, -1)])
+
+			# 分钟个位数每 3 个灯珠为一组，每组使用一种颜色
+			minute_ones_groups = self.__model_clock.minute_ones_groups
+
+			self.blit_bar(minute_ones_groups[0], minute_ones,     CONFIG.COLORS.TIME_MINUTE_ONES_1)
+			self.blit_bar(minute_ones_groups[1], minute_ones - 3, CONFIG.COLORS.TIME_MINUTE_ONES_2)
+			self.blit_bar(minute_ones_groups[2], minute_ones - 6, CONFIG.COLORS.TIME_MINUTE_ONES_3)
 	#endregion model clock related function
 
 
@@ -594,34 +822,28 @@ class MatrixClock(WS2812, DateTime):
 		self.show()
 
 	def __set_day_1(self):
-		day = self.__zfill_2int(self.__day)
-		day_tens = self.__zfile_15bin(ModelCalendar_1.NUMBERS_GLYPH[day[0]])
-		day_ones = self.__zfile_15bin(ModelCalendar_1.NUMBERS_GLYPH[day[1]])
-
-		day_color = self.convert_color(CONFIG.COLORS.DATE_DAY)
+		day_color = CONFIG.COLORS.DATE_DAY
 
-		for index, bit in enumerate(day_tens):
-			self.__neopixel[self.__model_calendar.__day_tens_list[index]] = day_color if bit == '1' else CONFIG.COLORS.BLACK
-
-		for index, bit in enumerate(day_ones):
-			self.__neopixel[self.__model_calendar.__day_ones_list[index]] = day_color if bit == '1' else CONFIG.COLORS.BLACK
+		self.blit_mask(self.__model_calendar.__day_tens_list, ModelCalendar_1.NUMBERS_GLYPH[self.__day // 10], day_color)
+		self.blit_mask(self.__model_calendar.__day_ones_list, ModelCalendar_1.NUMBERS_GLYPH[self.__day % 10], day_color)
 
 	def __set_weekday_month_1(self):
-		for index in self.__model_calendar.__weekday_list:
-			self.__neopixel[index] = CONFIG.COLORS.DATE_WEEKDAY_BG
-
-		self.__neopixel[self.__model_calendar.__weekday_list[self.__weekday]] = self.convert_color(CONFIG.COLORS.DATE_WEEKDAY)
-
-		month_colors = {
-			0: self.convert_color(CONFIG.COLORS.DATE_MONTH_1),
-			1: self.convert_color(CONFIG.COLORS.DATE_MONTH_2),
-			2: self.convert_color(CONFIG.COLORS.DATE_MONTH_3),
-			3: self.convert_color(CONFIG.COLORS.DATE_MONTH_4)
-		}
-
-		for count, index in enumerate(self.__model_calendar.__month_list):
-			month_color = month_colors[int((count + 1) // 3.1)]
-			self.__neopixel[index] = month_color if count < self.__month else CONFIG.COLORS.DATE_MONTH_BG
+		weekday_list = self.__model_calendar.__weekday_list
+
+		self.blit_mask(
+			weekday_list,
+			1 << (len(weekday_list) - 1 - self.__weekday),
+			CONFIG.COLORS.DATE_WEEKDAY,
+			CONFIG.COLORS.DATE_WEEKDAY_BG
+		)
+
+		# 月份每 3 个灯珠为一组，每组使用一种颜色
+		month_groups = self.__model_calendar.__month_groups
+
+		self.blit_bar(month_groups[0], self.__month,     CONFIG.COLORS.DATE_MONTH_1, CONFIG.COLORS.DATE_MONTH_BG)
+		self.blit_bar(month_groups[1], self.__month - 3, CONFIG.COLORS.DATE_MONTH_2, CONFIG.COLORS.DATE_MONTH_BG)
+		self.blit_bar(month_groups[2], self.__month - 6, CONFIG.COLORS.DATE_MONTH_3, CONFIG.COLORS.DATE_MONTH_BG)
+		self.blit_bar(month_groups[3], self.__month - 9, CONFIG.COLORS.DATE_MONTH_4, CONFIG.COLORS.DATE_MONTH_BG)
 	#endregion model calendar_1 related function
 
 
@@ -635,61 +857,83 @@ class MatrixClock(WS2812, DateTime):
 
 	def __set_day_2(self):
 		for index in self.__model_calendar.__days_list:
-			self.__neopixel[index] = CONFIG.COLORS.DATE_DAYS_BG
+			self[index] = CONFIG.COLORS.DATE_DAYS_BG
 
-		self.__neopixel[self.__model_calendar.__days_list[self.__day - 1]] = self.convert_color(CONFIG.COLORS.DATE_DAY)
+		self[self.__model_calendar.__days_list[self.__day - 1]] = CONFIG.COLORS.DATE_DAY
 
 	def __set_weekday_month_2(self):
 		for index in self.__model_calendar.__weekday_list:
-			self.__neopixel[index] = CONFIG.COLORS.DATE_WEEKDAY_BG
+			self[index] = CONFIG.COLORS.DATE_WEEKDAY_BG
 
-		self.__neopixel[self.__model_calendar.__weekday_list[self.__weekday]] = self.convert_color(CONFIG.COLORS.DATE_WEEKDAY)
+		self[self.__model_calendar.__weekday_list[self.__weekday]] = CONFIG.COLORS.DATE_WEEKDAY
 
 		for index in self.__model_calendar.__month_list:
-			self.__neopixel[index] = CONFIG.COLORS.DATE_MONTH_BG
+			self[index] = CONFIG.COLORS.DATE_MONTH_BG
 
-		self.__neopixel[self.__model_calendar.__month_list[self.__month - 1]] = self.convert_color(CONFIG.COLORS.DATE_MONTH)
+		self[self.__model_calendar.__month_list[self.__month - 1]] = CONFIG.COLORS.DATE_MONTH
 	#endregion model calendar_2 related function
 
 
 	#region callbacks function
 	def __sync_time_cb(self):
-		'''联网校时回调函数'''
-		self.__time_synced = Utilities.sync_time()
-		self.__tasks.add_work(self.__task_sync_ntp_time, self.milliseconds_until_next_hour())
+		'''联网校时回调函数，asyncio 运行方式下返回协程'''
+		if self.__tasks.is_async:
+			return self.sync_time_async()
 
-		print('sync time after:', self.format_ms(self.milliseconds_until_next_hour()))
+		self.sync_time()
 
 	def __auto_brightness_cb(self):
-		'''自动亮度回调函数'''
-		adc_level = self.__adc.level
-
-		if self.__last_adc_level == adc_level:
+		'''自动亮度回调函数，在输出级渐变亮度，不重新绘制显示内容'''
+		value = self.__adc.update()
+		shift = MatrixClock.BRIGHTNESS_CURVE_SHIFT
+		index = value >> shift
+		curve = self.__brightness_curve
+
+		# 相邻两项之间线性插值
+		level = curve[index] + ((curve[index + 1] - curve[index]) * (value & ((1 << shift) - 1)) >> shift)
+
+		if self.__auto_level is None:
+			self.__auto_level = level
+			self.output_level = level
 			return
 
-		self.__last_adc_level = adc_level
-		self.brightness = MatrixClock.BRIGHTNESS_LEVEL[adc_level]
+		if abs(level - self.__auto_level) >= MatrixClock.BRIGHTNESS_THRESHOLD:
+			self.__auto_level = level
+			self.fade_to(level)
 
-		self.show_content()
-		print(f'set brightness level to {adc_level} ({self.brightness}%)')
+		if self.is_fading and not self.__tasks.has_work(self.__task_fade_brightness):
+			self.__tasks.add_work(self.__task_fade_brightness, MatrixClock.FADE_PERIOD_MS, deferred=True)
+
+	def __fade_brightness_cb(self):
+		'''亮度渐变回调函数'''
+		if not self.step_fade():
+			self.__tasks.del_work(self.__task_fade_brightness)
+
+	def __schedule_frame_cb(self, delay_ms:int):
+		'''有帧等待输出时安排输出任务'''
+		self.__tasks.add_work(self.__task_present_frame, delay_ms if delay_ms > 0 else 1)
+
+	def __present_frame_cb(self):
+		'''输出等待中的帧回调函数'''
+		self.__tasks.del_work(self.__task_present_frame)
+		self.present()
 
 	def __refresh_time_cb(self):
 		'''刷新时间显示回调函数'''
 		self.show_content()
-		self.__tasks.add_work(self.__task_refresh_time, self.milliseconds_until_next_minute())
+		self.__tasks.add_work(self.__task_refresh_time, self.milliseconds_until_next_minute(), deferred=True)
 
 	def __refresh_calendar_cb(self):
 		'''刷新日历显示回调函数'''
 		self.show_content()
-		self.__tasks.add_work(self.__task_refresh_calendar, self.milliseconds_until_next_hour())
+		self.__tasks.add_work(self.__task_refresh_calendar, self.milliseconds_until_next_hour(), deferred=True)
 
 	def __show_animation_cb(self):
-		'''显示动画回调函数'''
-		remains, frame, color = self.__animation.get_frame_and_color()
-
-		for index, bit in enumerate(self.__zfill_54bin(frame)):
-			self.__neopixel[index] = color if bit == '1' else CONFIG.COLORS.BLACK
-
+		'''显示动画回调函数，动画绘制在动画图层，不修改表盘内容'''
+		overlay = self.overlay
+		remains = self.__animation.render_frame(overlay.buffer)
+		overlay.visible = True
+		overlay.touch()
 		self.show()
 
 		if not self.__animation.loops and remains == 0:
@@ -709,7 +953,7 @@ class MatrixClock(WS2812, DateTime):
 		if self.mode == self.__display_mode:
 			self.__tasks.del_work(self.__task_switch_display)
 		else:
-			self.__tasks.add_work(self.__task_switch_display, CONFIG.PERIOD.SWITCH_DISPLAY_MS)
+			self.__tasks.add_work(self.__task_switch_display, CONFIG.PERIOD.SWITCH_DISPLAY_MS, deferred=True)
 
 	def __online_update_check_cb(self):
 		'''检查在线更新回调函数，用于延迟启动'''
@@ -729,13 +973,16 @@ class MatrixClock(WS2812, DateTime):
 
 		if result == OnlineUpdater.ERROR_UPDATE_SUCCESS:
 			animation = Animation.SUCCESS
-			colors    = self.convert_color(CONFIG.COLORS.LIGHTGREEN)
+			colors    = CONFIG.COLORS.LIGHTGREEN
 		elif result in (OnlineUpdater.ERROR_UPDATE_FAILED, OnlineUpdater.ERROR_NO_INTERNET, OnlineUpdater.ERROR_NO_CONFIG_FILE):
 			animation = Animation.FAILED
-			colors    = self.convert_color(CONFIG.COLORS.RED)
+			colors    = CONFIG.COLORS.RED
 
-		self.__show_animation_async(animation, colors)
+		# 结果动画播放结束后再继续后续操作
+		self.__play_animation(animation, colors, lambda: self.__online_update_done(result, files))
 
+	def __online_update_done(self, result:int, files:dict):
+		'''在线更新结果动画播放结束后的操作'''
 		if result in (OnlineUpdater.ERROR_NO_INTERNET, OnlineUpdater.ERROR_NO_CONFIG_FILE) or\
 			(result == OnlineUpdater.ERROR_UPDATE_SUCCESS and not files):
 			self.show_hide_menu()
@@ -762,18 +1009,6 @@ class MatrixClock(WS2812, DateTime):
 
 
 	#region tools function
-	def __zfill_2int(self, value:int):
-		'''将时分、日期填充为 2 位数字符串'''
-		return f'{value:0>2}'
-
-	def __zfile_15bin(self, value:int):
-		'''将整型转为 15 位二进制字符串'''
-		return f'{value:0>15b}'
-
-	def __zfill_54bin(self, value:int):
-		'''将整型转为 54 位二进制字符串'''
-		return f'{value:0>54b}'
-
 	def __output_matrix_mode_file(self):
 		'''输出工作状态配置文件'''
 		with open(MatrixClock.MATRIX_MODE_FILENAME, 'w') as output:
@@ -797,10 +1032,25 @@ mode = {self.mode} # {MatrixClock.MODE_LIST[self.mode]}
 
 		return mode
 
+	def __frame_key(self, mode:int) -> int:
+		'''获取当前时间在指定模式下显示内容的标识，时钟模式为分钟，台历模式为日期'''
+		self.now()
+
+		if mode == MatrixClock.MODE_CLOCK:
+			return self.__hour * 60 + self.__minute
+
+		return (self.__year * 100 + self.__month) * 100 + self.__day
+
+	def __start_sync_time(self):
+		'''启动下一次联网校时任务回调'''
+		self.__tasks.add_work(self.__task_sync_ntp_time, self.milliseconds_until_next_hour(), deferred=True)
+
+		print('sync time after:', self.format_ms(self.milliseconds_until_next_hour()))
+
 	def __start_auto_brightness(self):
 		'''启动自动亮度任务回调'''
 		self.__auto_brightness_cb()
-		self.__tasks.add_work(self.__task_auto_brightness, CONFIG.PERIOD.UPDATE_ADC_MS)
+		self.__tasks.add_work(self.__task_auto_brightness, CONFIG.PERIOD.UPDATE_ADC_MS, deferred=True)
 
 	def set_time(self, minute, second=0):
 		# year, month, day, hour, minute, second, weekday, yearday
@@ -827,6 +1077,11 @@ mode = {self.mode} # {MatrixClock.MODE_LIST[self.mode]}
 		if value in MatrixClock.MODE_LIST.keys():
 			self.__working_mode = value
 
+	@property
+	def tasks(self) -> Dispatcher:
+		'''获取任务调度器，可在 REPL 中查看任务统计数据'''
+		return self.__tasks
+
 	@property
 	def is_menu_mode(self):
 		return self.__menu_mode
@@ -0,0 +1,177 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+"""
+__version__ = '0.1.3'
+__version_info__ = (0, 1, 3)
+
+
+class Palette(object):
+	'''
+	颜色亮度查找表
+
+	按照亮度百分比、亮度最大值、输出级亮度、白平衡和 gamma 校正
+	预先生成每个通道 256 项的整型查找表，之后的颜色转换只需要查表，不再需要浮点运算
+
+	参数：
+	- gamma：gamma 校正值，默认值 None 不做校正
+	- white_balance：(r, g, b) 各通道亮度百分比，默认值 None 不做调整
+	'''
+	# 输出级亮度最大值
+	LEVEL_MAX = 255
+
+	def __init__(self, gamma:float=None, white_balance:tuple=None):
+		self.__gamma_table = None
+
+		if gamma is not None and gamma > 0 and gamma != 1:
+			self.__gamma_table = bytes(int((index / 255) ** gamma * 255 + 0.5) for index in range(256))
+
+		if white_balance is not None and tuple(white_balance) == (100, 100, 100):
+			white_balance = None
+
+		self.__white_balance = white_balance
+
+		self.__tables = None
+		self.__percent = None
+		self.__max_percent = None
+		self.__level = None
+		self.__identity = False
+
+	def update(self, percent:int, max_percent:int, level:int=LEVEL_MAX) -> bool:
+		'''
+		亮度百分比、亮度最大值或输出级亮度变化时重新生成查找表
+
+		@return: 是否重新生成了查找表
+		'''
+		if percent == self.__percent and max_percent == self.__max_percent and level == self.__level:
+			return False
+
+		self.__percent = percent
+		self.__max_percent = max_percent
+		self.__level = level
+
+		# brightness = percent * max_percent / 10000 * level / 255
+		divisor = 10000 * Palette.LEVEL_MAX
+		scale = percent * max_percent * level
+
+		if self.__white_balance is None:
+			table = self.__build_table(scale, divisor)
+			self.__tables = (table, table, table)
+		else:
+			self.__tables = tuple(self.__build_table(scale * balance, divisor * 100) for balance in self.__white_balance)
+
+		self.__identity = self.__white_balance is None and self.__gamma_table is None and scale == divisor
+
+		return True
+
+	def __build_table(self, scale:int, divisor:int) -> bytes:
+		gamma = self.__gamma_table
+
+		if gamma is None:
+			return bytes(index * scale // divisor for index in range(256))
+		else:
+			return bytes(gamma[index] * scale // divisor for index in range(256))
+
+	def convert(self, color:tuple) -> tuple:
+		'''查表转换颜色亮度'''
+		red, green, blue = self.__tables
+		return (red[color[0]], green[color[1]], blue[color[2]])
+
+	@property
+	def tables(self) -> tuple:
+		'''获取 (r, g, b) 通道查找表'''
+		return self.__tables
+
+	@property
+	def is_identity(self) -> bool:
+		'''查找表是否不改变颜色'''
+		return self.__identity
+
+
+def lightness_to_luminance(lightness:float) -> float:
+	'''CIE L*（0~100）转换为相对亮度（0~1）'''
+	if lightness > 8:
+		return ((lightness + 16) / 116) ** 3
+
+	return lightness / 903.3
+
+def luminance_to_lightness(luminance:float) -> float:
+	'''相对亮度（0~1）转换为 CIE L*（0~100）'''
+	if luminance > 0.008856:
+		return 116 * luminance ** (1 / 3) - 16
+
+	return luminance * 903.3
+
+def lightness_curve(size:int, high:int, low:int) -> bytes:
+	'''
+	生成感知亮度曲线查找表
+
+	表的第一项对应亮度百分比 high，最后一项对应 low，
+	中间各项在 CIE L* 空间中线性变化，结果为 0~255 的输出亮度
+
+	参数：
+	- size：查找表大小
+	- high：第一项的亮度百分比
+	- low：最后一项的亮度百分比
+	'''
+	high = luminance_to_lightness(high / 100)
+	low  = luminance_to_lightness(low / 100)
+
+	return bytes(
+		int(lightness_to_luminance(high + (low - high) * index / (size - 1)) * 255 + 0.5)
+		for index in range(size)
+	)
+
+
+#region reference hsv path
+def rgb_to_hsv(r:int, g:int, b:int) -> tuple:
+	r, g, b = r / 255.0, g / 255.0, b / 255.0
+	max_value = max(r, g, b)
+	min_value = min(r, g, b)
+	delta = max_value - min_value
+	if delta == 0:
+		return 0, 0, max_value
+	elif max_value == r:
+		h = (g - b) / delta % 6
+	elif max_value == g:
+		h = (b - r) / delta + 2
+	elif max_value == b:
+		h = (r - g) / delta + 4
+	h = h * 60
+	if h < 0:
+		h += 360
+	s = delta / max_value
+	v = max_value
+	return h, s, v
+
+def hsv_to_rgb(h:float, s:float, v:float) -> tuple:
+	if s == 0:
+		r, g, b = v, v, v
+	else:
+		h = h / 60.0
+		i = int(h)
+		f = h - i
+		p = v * (1 - s)
+		q = v * (1 - s * f)
+		t = v * (1 - s * (1 - f))
+		if i == 0:
+			r, g, b = v, t, p
+		elif i == 1:
+			r, g, b = q, v, p
+		elif i == 2:
+			r, g, b = p, v, t
+		elif i == 3:
+			r, g, b = p, q, v
+		elif i == 4:
+			r, g, b = t, p, v
+		else:
+			r, g, b = v, p, q
+
+	return int(r * 255), int(g * 255), int(b * 255)
+
+def hsv_convert(color:tuple, percent:int, max_percent:int) -> tuple:
+	'''原有的 rgb -> hsv -> rgb 亮度转换方法，仅用于对比测试'''
+	h, s, v = rgb_to_hsv(*color)
+	v *= max_percent / 100 * percent / 100
+	return hsv_to_rgb(h, s, v)
+#endregion reference hsv path
@@ -0,0 +1,119 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+像素缓冲区基本操作
+
+所有颜色参数均为按照像素缓冲区通道顺序排列的 bytes，灯珠序号表均为 array('H')，
+设备支持 native/viper 代码生成时自动使用 pixelops_native 中的实现，
+否则（主机或不支持的固件）使用本模块的纯 Python 实现
+"""
+__version__ = '0.1.3'
+__version_info__ = (0, 1, 3)
+
+import sys
+from array import array
+
+
+def fill(buffer, pixel:bytes):
+	'''使用同一个像素数据填充整个缓冲区'''
+	bpp = len(pixel)
+
+	for offset in range(0, len(buffer), bpp):
+		buffer[offset:offset + bpp] = pixel
+
+def paint(buffer, indices:array, pixel:bytes):
+	'''将序号表中的灯珠设置为同一个像素数据'''
+	bpp = len(pixel)
+
+	for index in indices:
+		offset = index * bpp
+		buffer[offset:offset + bpp] = pixel
+
+def blit_mask(buffer, indices:array, mask:int, pixel:bytes, background:bytes):
+	'''按掩码绘制序号表中的灯珠，序号表第一项对应掩码最高位，掩码最多 30 位'''
+	bpp   = len(pixel)
+	index = len(indices)
+
+	while index > 0:
+		index -= 1
+		offset = indices[index] * bpp
+		buffer[offset:offset + bpp] = pixel if mask & 1 else background
+		mask >>= 1
+
+def scale(output, buffer, table:bytes, bpp:int):
+	'''
+	按通道查表缩放像素数据并写入输出缓冲区
+
+	参数：
+	- table：每个通道 256 项、按照像素中通道位置依次排列的查找表
+	'''
+	for channel in range(bpp):
+		base = channel << 8
+
+		for offset in range(channel, len(buffer), bpp):
+			output[offset] = table[base + buffer[offset]]
+
+def interpolate(table, offset:int, start:tuple, end:tuple, steps:int, order:tuple, bpp:int):
+	'''
+	生成 start 到 end 之间的渐变颜色，不包含 start，包含 end，
+	按照通道顺序从 offset 开始依次写入 steps 个像素数据
+	'''
+	for step in range(1, steps + 1):
+		for channel in range(3):
+			table[offset + order[channel]] = start[channel] + (end[channel] - start[channel]) * step // steps
+
+		offset += bpp
+
+def composite(output, layer, mask:bytes, bpp:int):
+	'''
+	按照每个灯珠的不透明度将图层像素数据叠加到输出缓冲区
+
+	参数：
+	- mask：每个灯珠一个字节的不透明度，0 为透明，255 为不透明
+	'''
+	offset = 0
+
+	for alpha in mask:
+		if alpha == 255:
+			output[offset:offset + bpp] = layer[offset:offset + bpp]
+		elif alpha:
+			for channel in range(offset, offset + bpp):
+				# 四舍五入除以 255
+				value = layer[channel] * alpha + output[channel] * (255 - alpha) + 128
+				output[channel] = (value + (value >> 8)) >> 8
+
+		offset += bpp
+
+def blend(output, start, end, weight:int):
+	'''
+	按照权重混合两帧像素数据，结果写入输出缓冲区
+
+	参数：
+	- weight：end 的权重，0 为 start，255 为 end
+	'''
+	inverse = 255 - weight
+
+	for index in range(len(output)):
+		# 四舍五入除以 255
+		value = end[index] * weight + start[index] * inverse + 128
+		output[index] = (value + (value >> 8)) >> 8
+
+
+PYTHON_OPS = (fill, paint, blit_mask, scale, interpolate, composite, blend)
+NATIVE_OPS = None
+
+if sys.implementation.name == 'micropython':
+	try:
+		try:
+			from matrix.pixelops_native import fill, paint, blit_mask, scale, interpolate, composite, blend
+		except ImportError:
+			_native = __import__('matrix/pixelops_native')
+			fill, paint, blit_mask, scale, interpolate, composite, blend = _native.fill, _native.paint, _native.blit_mask, _native.scale, _native.interpolate, _native.composite, _native.blend
+
+		NATIVE_OPS = (fill, paint, blit_mask, scale, interpolate, composite, blend)
+	except (ImportError, SyntaxError, AttributeError):
+		# 固件未启用 native/viper 代码生成
+		pass
+
+IS_NATIVE = NATIVE_OPS is not None
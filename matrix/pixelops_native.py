@@ -0,0 +1,114 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+像素缓冲区基本操作的 viper/native 实现，只能在设备上导入，
+接口与 pixelops 中的纯 Python 实现相同，灯珠序号表必须是 array('H')
+"""
+import micropython
+
+
+@micropython.viper
+def fill(buffer, pixel):
+	dst  = ptr8(buffer)
+	src  = ptr8(pixel)
+	size = int(len(buffer))
+	bpp  = int(len(pixel))
+	offset = 0
+
+	while offset < size:
+		for channel in range(bpp):
+			dst[offset + channel] = src[channel]
+
+		offset += bpp
+
+@micropython.viper
+def paint(buffer, indices, pixel):
+	dst   = ptr8(buffer)
+	index = ptr16(indices)
+	src   = ptr8(pixel)
+	count = int(len(indices))
+	bpp   = int(len(pixel))
+
+	for position in range(count):
+		offset = int(index[position]) * bpp
+
+		for channel in range(bpp):
+			dst[offset + channel] = src[channel]
+
+@micropython.viper
+def blit_mask(buffer, indices, mask:int, pixel, background):
+	dst   = ptr8(buffer)
+	index = ptr16(indices)
+	fg    = ptr8(pixel)
+	bg    = ptr8(background)
+	bpp   = int(len(pixel))
+	position = int(len(indices))
+
+	while position > 0:
+		position -= 1
+		offset = int(index[position]) * bpp
+
+		if mask & 1:
+			for channel in range(bpp):
+				dst[offset + channel] = fg[channel]
+		else:
+			for channel in range(bpp):
+				dst[offset + channel] = bg[channel]
+
+		mask >>= 1
+
+@micropython.viper
+def scale(output, buffer, table, bpp:int):
+	dst  = ptr8(output)
+	src  = ptr8(buffer)
+	lut  = ptr8(table)
+	size = int(len(buffer))
+	offset = 0
+
+	while offset < size:
+		for channel in range(bpp):
+			dst[offset + channel] = lut[(channel << 8) + int(src[offset + channel])]
+
+		offset += bpp
+
+@micropython.native
+def interpolate(table, offset, start, end, steps, order, bpp):
+	for step in range(1, steps + 1):
+		for channel in range(3):
+			table[offset + order[channel]] = start[channel] + (end[channel] - start[channel]) * step // steps
+
+		offset += bpp
+
+@micropython.viper
+def composite(output, layer, mask, bpp:int):
+	dst   = ptr8(output)
+	src   = ptr8(layer)
+	alpha = ptr8(mask)
+	count = int(len(mask))
+	offset = 0
+
+	for position in range(count):
+		value = int(alpha[position])
+
+		if value == 255:
+			for channel in range(bpp):
+				dst[offset + channel] = src[offset + channel]
+		elif value:
+			for channel in range(bpp):
+				mixed = int(src[offset + channel]) * value + int(dst[offset + channel]) * (255 - value) + 128
+				dst[offset + channel] = (mixed + (mixed >> 8)) >> 8
+
+		offset += bpp
+
+@micropython.viper
+def blend(output, start, end, weight:int):
+	dst   = ptr8(output)
+	src   = ptr8(start)
+	dest  = ptr8(end)
+	size  = int(len(output))
+	inverse = 255 - weight
+
+	for index in range(size):
+		value = int(dest[index]) * weight + int(src[index]) * inverse + 128
+		dst[index] = (value + (value >> 8)) >> 8
@@ -0,0 +1,93 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+"""
+__version__ = '0.1'
+__version_info__ = (0, 1)
+
+
+class Sequencer(object):
+	'''
+	非阻塞效果序列
+
+	序列由若干步骤 (操作, 时长) 组成，操作为无参数函数（可以为 None），时长单位为毫秒；
+	开始播放时立即执行第一步的操作，之后由调度器在每一步的时长结束后执行下一步，
+	步骤之间不阻塞其它任务和按键处理
+
+	序列结束或被中断时调用结束回调函数，用于隐藏图层或继续后续操作
+
+	参数：
+	- dispatcher：任务调度器
+	'''
+	def __init__(self, dispatcher):
+		self.__dispatcher = dispatcher
+		self.__steps      = None
+		self.__index      = 0
+		self.__done_cb    = None
+
+		# 保存绑定方法以保证任务 id 不变
+		self.__task_advance = self.__advance_cb
+
+	def play(self, steps:tuple, done_cb=None):
+		'''
+		播放序列，正在播放的序列立即结束
+
+		参数：
+		- steps：步骤列表，每一步为 (操作, 时长)
+		- done_cb：结束回调函数，序列播放完成或被中断时调用
+		'''
+		self.stop()
+
+		self.__steps   = steps
+		self.__index   = 0
+		self.__done_cb = done_cb
+
+		self.__run()
+
+	def stop(self):
+		'''中断正在播放的序列，跳过剩余步骤，结束回调函数仍然会被调用'''
+		if self.__steps is None:
+			return
+
+		self.__dispatcher.del_work(self.__task_advance)
+		self.__finish()
+
+	def __finish(self):
+		done_cb = self.__done_cb
+
+		self.__steps   = None
+		self.__done_cb = None
+
+		if done_cb is not None:
+			done_cb()
+
+	def __run(self):
+		'''执行到期的步骤，直到遇到需要等待的步骤'''
+		steps = self.__steps
+
+		while self.__index < len(steps):
+			work, duration = steps[self.__index]
+			self.__index += 1
+
+			if work is not None:
+				work()
+
+			# 操作中开始播放了新的序列或中断了当前序列
+			if self.__steps is not steps:
+				return
+
+			if duration > 0:
+				self.__dispatcher.add_work(self.__task_advance, duration)
+				return
+
+		self.__finish()
+
+	def __advance_cb(self):
+		'''一步的时长结束后执行下一步'''
+		self.__dispatcher.del_work(self.__task_advance)
+		self.__run()
+
+	@property
+	def playing(self) -> bool:
+		'''是否正在播放序列'''
+		return self.__steps is not None
@@ -0,0 +1,144 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+像素数据发送方式
+
+- NeoPixelTransmitter：使用 neopixel 模块（machine.bitstream）发送，调用时阻塞直到全部数据发送完成
+- RmtTransmitter：使用 esp32.RMT.write_pulses() 发送，开始发送后立即返回，
+  下一帧发送前才等待上一帧发送完成，等待期间可以继续准备下一帧，
+  等待时使用 wait_done(timeout) 阻塞，让出 CPU 给其它任务，不在 Python 中空转
+
+两种方式的 write() 参数都是每路输出一个的像素数据 memoryview，发送期间不能修改其内容
+"""
+__version__ = '0.2'
+__version_info__ = (0, 2)
+
+from array import array
+from machine import Pin
+from neopixel import NeoPixel
+from esp32 import RMT
+
+
+# 800kHz 数据位时序 (高电平, 低电平)，单位 100ns
+BIT_0 = (4, 8)
+BIT_1 = (8, 4)
+
+
+class NeoPixelTransmitter(object):
+	'''
+	参数：
+	- pins：每路输出的数据引脚
+	- counts：每路输出的灯珠数量
+	- bpp：每个灯珠的字节数
+	'''
+	def __init__(self, pins:tuple, counts:tuple, bpp:int=3):
+		self.__strips = [NeoPixel(Pin(pin), count, bpp=bpp) for pin, count in zip(pins, counts)]
+
+	def write(self, views:tuple):
+		'''依次发送每路输出的像素数据，发送完成后返回'''
+		for strip, view in zip(self.__strips, views):
+			strip.buf = view
+			strip.write()
+
+	def wait(self):
+		'''等待发送完成，阻塞发送时直接返回'''
+		pass
+
+	@property
+	def busy(self) -> bool:
+		return False
+
+
+class RmtTransmitter(object):
+	'''
+	参数：
+	- pins：每路输出的数据引脚
+	- counts：每路输出的灯珠数量
+	- channels：每路输出使用的 RMT 通道，不能与 esp32.RMT.bitstream_channel() 设置的通道相同
+	- bpp：每个灯珠的字节数
+
+	每个数据位编码为一个高电平和一个低电平脉冲，每个字节对应 16 个脉冲时长，
+	脉冲时长保存在初始化时分配的 array('H') 中，每帧只重新编码与上次发送不同的字节
+
+	固件的 write_pulses() 不接受 array 时，该路输出改为使用 list 保存脉冲时长
+	'''
+	# RMT 时钟 80MHz 8 分频，每个单位 100ns
+	CLOCK_DIV = 8
+
+	# 4 个数据位的脉冲时长，高位在前
+	NIBBLE_PULSES = tuple(
+		array('H', [duration for bit in range(3, -1, -1) for duration in (BIT_1 if nibble >> bit & 1 else BIT_0)])
+		for nibble in range(16)
+	)
+
+	# 每个数据位的发送时长，单位 us
+	BIT_US = (BIT_0[0] + BIT_0[1]) / 10
+
+	# 等待发送完成的额外时长，单位 毫秒
+	WAIT_MARGIN_MS = 2
+
+	def __init__(self, pins:tuple, counts:tuple, channels:tuple, bpp:int=3):
+		if len(channels) != len(pins):
+			raise ValueError(f'{len(pins)} outputs need {len(pins)} rmt channels, got {len(channels)}')
+
+		self.__rmts    = [RMT(channel, pin=Pin(pin, Pin.OUT), clock_div=RmtTransmitter.CLOCK_DIV) for pin, channel in zip(pins, channels)]
+
+		# 初始内容为全部字节为 0 的编码
+		self.__pulses  = [RmtTransmitter.NIBBLE_PULSES[0] * (count * bpp * 2) for count in counts]
+		self.__encoded = [bytearray(count * bpp) for count in counts]
+		self.__nibbles = [RmtTransmitter.NIBBLE_PULSES] * len(counts)
+
+		# 等待一帧发送完成的最长时长
+		self.__timeout_ms = int(max(counts) * bpp * 8 * RmtTransmitter.BIT_US) // 1000 + RmtTransmitter.WAIT_MARGIN_MS
+
+	def __encode(self, output:int, view:memoryview):
+		'''将像素数据编码为脉冲时长，只更新与上次编码不同的字节'''
+		pulses  = self.__pulses[output]
+		encoded = self.__encoded[output]
+		nibbles = self.__nibbles[output]
+
+		for index in range(len(view)):
+			value = view[index]
+
+			if value != encoded[index]:
+				position = index * 16
+
+				pulses[position:position + 8]      = nibbles[value >> 4]
+				pulses[position + 8:position + 16] = nibbles[value & 0x0f]
+				encoded[index] = value
+
+	def write(self, views:tuple):
+		'''编码并开始发送每路输出的像素数据，每路输出发送前等待该通道上一帧发送完成'''
+		for output, view in enumerate(views):
+			self.__encode(output, view)
+
+			rmt = self.__rmts[output]
+			self.__wait_done(rmt)
+
+			try:
+				rmt.write_pulses(self.__pulses[output], 1)
+			except TypeError:
+				# 固件只接受 list 或 tuple，开始发送之前就会报错，编码表同时改为 tuple
+				self.__pulses[output]  = list(self.__pulses[output])
+				self.__nibbles[output] = tuple(tuple(pulses) for pulses in RmtTransmitter.NIBBLE_PULSES)
+				rmt.write_pulses(self.__pulses[output], 1)
+
+	def __wait_done(self, rmt:RMT):
+		'''阻塞等待通道发送完成，等待期间其它任务可以运行'''
+		while not rmt.wait_done(timeout=self.__timeout_ms):
+			pass
+
+	def wait(self):
+		'''等待全部通道发送完成'''
+		for rmt in self.__rmts:
+			self.__wait_done(rmt)
+
+	@property
+	def busy(self) -> bool:
+		'''是否有通道正在发送'''
+		for rmt in self.__rmts:
+			if not rmt.wait_done():
+				return True
+
+		return False
@@ -2,104 +2,554 @@
 Copyright © 2023 Walkline Wang (https://walkline.wang)
 Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
 """
-from machine import Pin
 from neopixel import NeoPixel
+from array import array
+from utime import ticks_us, ticks_diff
 
 try:
 	from utils.utilities import Utilities
 except ImportError:
 	Utilities = __import__('utils/utilities').Utilities
 
+try:
+	from matrix.palette import Palette
+except ImportError:
+	Palette = __import__('matrix/palette').Palette
+
+try:
+	from matrix.blitter import Blitter
+except ImportError:
+	Blitter = __import__('matrix/blitter').Blitter
+
+try:
+	from matrix import pixelops
+except ImportError:
+	pixelops = __import__('matrix/pixelops')
+
+try:
+	from matrix.compositor import Compositor, Layer
+except ImportError:
+	_compositor = __import__('matrix/compositor')
+	Compositor, Layer = _compositor.Compositor, _compositor.Layer
+
+try:
+	from matrix.geometry import Geometry
+except ImportError:
+	Geometry = __import__('matrix/geometry').Geometry
+
+try:
+	from matrix.transmitter import NeoPixelTransmitter, RmtTransmitter
+except ImportError:
+	_transmitter = __import__('matrix/transmitter')
+	NeoPixelTransmitter, RmtTransmitter = _transmitter.NeoPixelTransmitter, _transmitter.RmtTransmitter
+
 
 CONFIG = Utilities.import_config()
 
 
 class WS2812(object):
-	def __init__(self, width, height, pin):
-		self.__width = width
-		self.__height = height
-		self.__neopixel = NeoPixel(Pin(pin), self.__width * self.__height)
+	'''
+	WS2812 灯板驱动
+
+	像素缓冲区保存原始颜色（全亮度），输出时一次完成亮度、
+	白平衡和 gamma 校正，亮度变化不需要重新绘制显示内容
+
+	像素缓冲区作为表盘（底层），其上依次为效果图层、动画图层和提示图层，
+	上层图层显示和隐藏时不需要重新绘制表盘内容
+
+	多块面板拼接时按照面板几何（Geometry）换算坐标，灯珠序号在全部面板上连续编号，
+	多路输出时每路输出使用输出缓冲区中对应的一段，依次写入
+
+	表盘在原位绘制，绘制期间使用 begin_draw() 和 end_draw() 标记：绘制期间其它上下文
+	（例如定时器回调中的效果和动画）调用的 show() 和 present() 不合成图层，推迟到绘制结束时输出，
+	输出的画面不会包含绘制了一半的表盘；绘制期间表盘本身调用的 show() 同样推迟到绘制结束时输出
+
+	使用 RMT 异步发送时输出缓冲区分为前后两个，校正后的像素数据写入后缓冲区，交换后发送，
+	准备下一帧时不会修改上一帧的数据；使用 neopixel 阻塞发送时发送完成才返回，只使用一个输出缓冲区
+
+	设置最高帧率并设置 frame_pending_cb 后，同一帧周期内的多次 show() 合并为一次输出：
+	距离上次输出不足一个帧周期时只标记有等待输出的帧，并通过 frame_pending_cb 通知调用者
+	在下一个帧周期调用 present() 输出，每秒输出次数不会超过最高帧率；还没有输出过时第一帧立即输出
+
+	参数：
+	- width, height：点阵尺寸，指定 geometry 时不使用
+	- pin：数据引脚，多路输出时为每路输出的引脚 tuple
+	- geometry：面板几何，默认为一块按列排列的面板
+	- rmt_channels：每路输出使用的 RMT 通道，设置后使用 RMT 异步发送，默认使用 neopixel 模块阻塞发送
+	'''
+	# 每个灯珠的字节数
+	LED_BPP = 3
+
+	# 输出级亮度最大值
+	OUTPUT_LEVEL_MAX = Palette.LEVEL_MAX
+
+	# 渐变默认帧数
+	FADE_FRAMES = 8
+
+	def __init__(self, width, height, pin, geometry:Geometry=None, rmt_channels:tuple=None):
+		if geometry is None:
+			geometry = Geometry(width, height)
+
+		pins = pin if isinstance(pin, tuple) else (pin,)
+
+		if len(pins) != len(geometry.outputs):
+			raise ValueError(f'{len(geometry.outputs)} outputs need {len(geometry.outputs)} pins, got {len(pins)}')
+
+		self.__geometry = geometry
+		self.__width    = geometry.width
+		self.__height   = geometry.height
+
+		bpp   = WS2812.LED_BPP
+		order = NeoPixel.ORDER
+
+		self.__led_count = geometry.led_count
+		self.__bpp       = bpp
+		self.__order     = order
+
+		# 表盘像素缓冲区，保存全部面板的原始颜色
+		self.__frame   = bytearray(self.__led_count * bpp)
+		self.__buffer  = memoryview(self.__frame)
+		self.__blitter = Blitter(self.__buffer, bpp, order)
+
+		# 前后输出缓冲区，保存校正后实际输出到灯珠的像素数据，每路输出发送其中对应的一段，
+		# 阻塞发送时前后缓冲区为同一个
+		front = bytearray(len(self.__frame))
+		back  = bytearray(len(self.__frame)) if rmt_channels else front
+
+		self.__output_buffers = (back, front)
+		self.__output_views   = tuple(self.__split_outputs(buffer) for buffer in self.__output_buffers)
+		self.__back_index     = 0
+
+		# 表盘绘制嵌套层数，以及绘制期间是否有被推迟的输出
+		self.__drawing      = 0
+		self.__draw_blocked = False
+
+		if rmt_channels:
+			self.__transmitter = RmtTransmitter(pins, geometry.outputs, rmt_channels, bpp)
+		else:
+			self.__transmitter = NeoPixelTransmitter(pins, geometry.outputs, bpp)
+
+		# 最后一帧和最长一帧的发送耗时（us），异步发送时为等待上一帧和开始发送的耗时
+		self.__transmit_us     = 0
+		self.__transmit_us_max = 0
+
+		# 帧率限制，frame_pending_cb(delay_ms) 用于安排在 delay_ms 毫秒后调用 present()
+		# 上次输出时间为 None 表示还没有输出过，第一帧立即输出
+		self.__frame_period_us = 0
+		self.__last_write_us   = None
+		self.__frame_pending   = False
+		self.__pending_cb      = None
+		self.__frames_merged   = 0
+		self.__frames_dropped  = 0
+		self.max_fps = getattr(CONFIG.WS2812_MATRIX, 'MAX_FPS', None)
 
 		# 设备当前亮度值（百分比）
 		# brightness = __bright_percent * bright_max
 		self.__bright_percent = 100
+		self.__bright_max     = CONFIG.BRIGHTNESS.MAX
+
+		# 输出级亮度，用于渐变
+		self.__output_level  = WS2812.OUTPUT_LEVEL_MAX
+		self.__output_target = WS2812.OUTPUT_LEVEL_MAX
+		self.__fade_step     = 0
+
+		# 表盘之上的效果图层、动画图层和提示图层
+		self.__compositor   = Compositor(self.__frame, bpp)
+		self.__effects      = self.__compositor.add_layer(Layer(self.__led_count, bpp, order))
+		self.__overlay      = self.__compositor.add_layer(Layer(self.__led_count, bpp, order))
+		self.__notification = self.__compositor.add_layer(Layer(self.__led_count, bpp, order))
+
+		self.__output_table  = None
+		self.__output_dirty  = True
+
+		# 颜色亮度查找表，亮度变化时重新生成
+		self.__palette = Palette(
+			getattr(CONFIG.BRIGHTNESS, 'GAMMA', None),
+			getattr(CONFIG.BRIGHTNESS, 'WHITE_BALANCE', None)
+		)
+		self.__update_palette()
+
+		# 最后一次输出到灯珠的像素数据，像素数据没有变化时跳过输出
+		self.__last_frame        = bytearray(len(self.__frame))
+		self.__last_frame_valid  = False
+		self.__writes_issued     = 0
+		self.__writes_suppressed = 0
+
+	def __split_outputs(self, buffer:bytearray) -> tuple:
+		'''将输出缓冲区按照每路输出的灯珠数量分段'''
+		view   = memoryview(buffer)
+		views  = []
+		offset = 0
+
+		for count in self.__geometry.outputs:
+			views.append(view[offset:offset + count * self.__bpp])
+			offset += count * self.__bpp
 
-	def clean(self):
-		'''清除屏幕（黑屏）'''
-		self.__neopixel.fill(CONFIG.COLORS.BLACK)
-		self.__neopixel.write()
+		return tuple(views)
+
+	def clean(self, output:bool=True):
+		'''
+		清除屏幕（黑屏）
+
+		参数：
+		- output：是否立即输出，设置为 False 时只清除表盘像素缓冲区，用于重新绘制前清除旧内容
+		'''
+		self.begin_draw()
+		pixelops.fill(self.__buffer, self.__blitter.to_pixel(CONFIG.COLORS.BLACK))
+		self.end_draw(output)
 
 	def fill(self, color:tuple):
 		'''填充指定颜色，参数支持 tuple(r, g, b)'''
 		if isinstance(color, tuple) and len(color) == 3:
-			self.__neopixel.fill(self.convert_color(color))
-			self.__neopixel.write()
+			self.begin_draw()
+			pixelops.fill(self.__buffer, self.__blitter.to_pixel(color))
+			self.end_draw()
+
+	def begin_draw(self):
+		'''开始绘制表盘，之后的 show() 和 present() 推迟到对应的 end_draw() 时输出，可以嵌套'''
+		self.__drawing += 1
+
+	def end_draw(self, output:bool=True):
+		'''
+		结束绘制表盘，最外层绘制结束时输出画面
+
+		参数：
+		- output：是否输出，设置为 False 时只输出绘制期间被推迟的画面
+		'''
+		self.__drawing -= 1
+
+		if self.__drawing > 0:
+			return
+
+		if output or self.__draw_blocked:
+			self.__draw_blocked = False
+
+			# 绘制期间推迟的帧已经由本次输出包含，重新按照帧率判断
+			self.__frame_pending = False
+			self.show()
+
+	def show(self, force:bool=False) -> bool:
+		'''
+		合成图层，校正像素数据并输出到灯珠，像素数据和查找表都与上次输出相同时跳过输出，
+		距离上次输出不足一个帧周期时推迟到下一个帧周期输出，绘制表盘期间推迟到绘制结束时输出
+
+		参数：
+		- force：强制立即输出，不受帧率限制，默认值 False
+
+		@return: 是否实际输出到灯珠
+		'''
+		if self.__drawing:
+			self.__draw_blocked = True
+			return False
+
+		if not force and self.__pending_cb is not None and self.__frame_period_us and self.__last_write_us is not None:
+			elapsed = ticks_diff(ticks_us(), self.__last_write_us)
+
+			# 计时回绕后 elapsed 可能为负数，此时直接输出
+			if 0 <= elapsed < self.__frame_period_us:
+				self.__frames_merged += 1
+
+				if self.__frame_pending:
+					# 上一个等待输出的画面被新画面覆盖，不会显示
+					self.__frames_dropped += 1
+				else:
+					self.__frame_pending = True
+					self.__pending_cb((self.__frame_period_us - elapsed + 999) // 1000)
+
+				return False
+
+		return self.__output(force)
+
+	def present(self) -> bool:
+		'''
+		输出等待中的帧，由 frame_pending_cb 安排的任务调用
+
+		@return: 是否实际输出到灯珠
+		'''
+		if not self.__frame_pending:
+			return False
+
+		if self.__drawing:
+			self.__draw_blocked = True
+			return False
+
+		if self.__last_write_us is not None:
+			elapsed = ticks_diff(ticks_us(), self.__last_write_us)
+
+			if 0 <= elapsed < self.__frame_period_us:
+				self.__pending_cb((self.__frame_period_us - elapsed + 999) // 1000)
+				return False
+
+		return self.__output(False)
+
+	def __output(self, force:bool) -> bool:
+		self.__frame_pending = False
+
+		if self.__bright_max != CONFIG.BRIGHTNESS.MAX:
+			self.__update_palette()
+
+		frame = self.__compositor.compose()
+
+		if not force and self.__last_frame_valid and not self.__output_dirty and frame == self.__last_frame:
+			self.__writes_suppressed += 1
+			return False
+
+		self.__last_frame[:] = frame
+		self.__last_frame_valid = True
+		self.__output_dirty = False
 
-	def show(self):
-		'''显示所有指定的颜色'''
-		self.__neopixel.write()
+		back_index = self.__back_index
+		back = self.__output_buffers[back_index]
+
+		if self.__palette.is_identity:
+			back[:] = frame
+		else:
+			pixelops.scale(back, frame, self.__output_table, self.__bpp)
+
+		# 交换前后缓冲区，发送新的前缓冲区
+		self.__back_index = back_index ^ 1
+
+		start = ticks_us()
+		self.__transmitter.write(self.__output_views[back_index])
+		self.__last_write_us = ticks_us()
+		self.__transmit_us = ticks_diff(self.__last_write_us, start)
+
+		if self.__transmit_us > self.__transmit_us_max:
+			self.__transmit_us_max = self.__transmit_us
+
+		self.__writes_issued += 1
+
+		return True
+
+	def fade_to(self, level:int, frames:int=FADE_FRAMES):
+		'''
+		设置输出级亮度渐变目标，之后每次调用 step_fade() 前进一帧
+
+		参数：
+		- level：目标输出级亮度，0~255
+		- frames：渐变帧数
+		'''
+		level = 0 if level < 0 else (WS2812.OUTPUT_LEVEL_MAX if level > WS2812.OUTPUT_LEVEL_MAX else level)
+		delta = level - self.__output_level
+
+		self.__output_target = level
+
+		if frames < 1 or delta == 0:
+			self.__fade_step = delta
+		elif delta > 0:
+			self.__fade_step = (delta + frames - 1) // frames
+		else:
+			self.__fade_step = -((frames - 1 - delta) // frames)
+
+	def step_fade(self) -> bool:
+		'''
+		输出级亮度前进一帧并重新输出当前像素数据
+
+		@return: 是否仍在渐变
+		'''
+		target = self.__output_target
+		level  = self.__output_level + self.__fade_step
+
+		if self.__fade_step >= 0 and level >= target or self.__fade_step < 0 and level <= target:
+			level = target
+
+		self.__set_output_level(level)
+		self.show()
+
+		return level != target
+
+	def __set_output_level(self, level:int):
+		if level == self.__output_level:
+			return
+
+		self.__output_level = level
+		self.__update_palette()
+
+	def __setitem__(self, index:int, color:tuple):
+		'''设置指定序号灯珠的颜色'''
+		offset = index * self.__bpp
+		self.__buffer[offset:offset + self.__bpp] = self.__blitter.to_pixel(color)
+
+	def set_pixel(self, x:int, y:int, color:tuple):
+		'''设置指定坐标灯珠的颜色'''
+		self[self.__geometry.index(x, y)] = color
+
+	def blit_mask(self, indices:array, mask:int, color:tuple, background:tuple=CONFIG.COLORS.BLACK):
+		'''按位图掩码绘制指定区域，序号表第一项对应掩码最高位'''
+		self.__blitter.blit(indices, mask, color, background)
+
+	def blit_bar(self, indices:array, count:int, color:tuple, background:tuple=CONFIG.COLORS.BLACK):
+		'''点亮序号表的前 count 个灯珠'''
+		self.__blitter.blit_bar(indices, count, color, background)
+
+	def invalidate(self):
+		'''标记灯珠显示内容失效，下次调用 show() 时一定会输出'''
+		self.__last_frame_valid = False
+
+	def flush(self):
+		'''等待最后一帧发送完成'''
+		self.__transmitter.wait()
+
+	def reset_write_stats(self):
+		'''清零输出统计计数'''
+		self.__writes_issued     = 0
+		self.__writes_suppressed = 0
+		self.__transmit_us_max   = 0
+		self.__frames_merged     = 0
+		self.__frames_dropped    = 0
 
 	def convert_color(self, color:tuple):
-		'''设置颜色亮度'''
+		'''
+		已弃用，直接返回原颜色
+
+		亮度在输出时统一处理，像素缓冲区保存原始颜色，写入像素时不需要转换，
+		需要实际输出颜色时使用 output_color()
+		'''
+		return color
+
+	def output_color(self, color:tuple) -> tuple:
+		'''获取颜色经过亮度、白平衡和 gamma 校正后实际输出的颜色'''
 		if isinstance(color, tuple) and len(color) == 3:
-			h, s, v = self.__rgb_to_hsv(*color)
-			v *= CONFIG.BRIGHTNESS.MAX / 100 * self.__bright_percent / 100
-			color = self.__hsv_to_rgb(h, s, v)
+			if self.__bright_max != CONFIG.BRIGHTNESS.MAX:
+				self.__update_palette()
+
+			color = self.__palette.convert(color)
 
 		return color
 
-	def __rgb_to_hsv(self, r:int, g:int, b:int) -> tuple:
-		r, g, b = r / 255.0, g / 255.0, b / 255.0
-		max_value = max(r, g, b)
-		min_value = min(r, g, b)
-		delta = max_value - min_value
-		if delta == 0:
-			return 0, 0, max_value
-		elif max_value == r:
-			h = (g - b) / delta % 6
-		elif max_value == g:
-			h = (b - r) / delta + 2
-		elif max_value == b:
-			h = (r - g) / delta + 4
-		h = h * 60
-		if h < 0:
-			h += 360
-		s = delta / max_value
-		v = max_value
-		return h, s, v
-
-	def __hsv_to_rgb(self, h:float, s:float, v:float) -> tuple:
-		if s == 0:
-			r, g, b = v, v, v
-		else:
-			h = h / 60.0
-			i = int(h)
-			f = h - i
-			p = v * (1 - s)
-			q = v * (1 - s * f)
-			t = v * (1 - s * (1 - f))
-			if i == 0:
-				r, g, b = v, t, p
-			elif i == 1:
-				r, g, b = q, v, p
-			elif i == 2:
-				r, g, b = p, v, t
-			elif i == 3:
-				r, g, b = p, q, v
-			elif i == 4:
-				r, g, b = t, p, v
-			else:
-				r, g, b = v, p, q
-
-		return int(r * 255), int(g * 255), int(b * 255)
+	def __update_palette(self):
+		'''亮度百分比、亮度最大值或输出级亮度变化后重新生成颜色查找表'''
+		self.__bright_max = CONFIG.BRIGHTNESS.MAX
+
+		if self.__palette.update(self.__bright_percent, self.__bright_max, self.__output_level):
+			tables = self.__palette.tables
+			order  = self.__order
+			output_tables = [None] * self.__bpp
+
+			# 按照通道在像素中的位置排列查找表，白色通道使用红色通道的亮度
+			for channel in range(self.__bpp):
+				output_tables[order[channel]] = tables[channel if channel < 3 else 0]
+
+			# 合并为一个查找表，第 n 个 256 字节对应像素中的第 n 个字节
+			self.__output_table = b''.join(output_tables)
+			self.__output_dirty  = True
 
 	@property
 	def led_count(self):
-		return self.__neopixel.n
+		return self.__led_count
 
 	@property
 	def led_bpp(self):
-		return self.__neopixel.bpp
+		return self.__bpp
+
+	@property
+	def led_order(self) -> tuple:
+		'''获取颜色通道在像素缓冲区中的顺序'''
+		return self.__order
+
+	@property
+	def geometry(self) -> Geometry:
+		'''获取面板几何'''
+		return self.__geometry
+
+	@property
+	def buffer(self) -> memoryview:
+		'''获取像素缓冲区，可直接写入按通道顺序排列的像素数据'''
+		return self.__buffer
+
+	@property
+	def effects(self) -> Layer:
+		'''获取效果图层，位于表盘之上、动画图层之下，用于表盘内容的过渡效果'''
+		return self.__effects
+
+	@property
+	def overlay(self) -> Layer:
+		'''获取动画图层，位于表盘之上'''
+		return self.__overlay
+
+	@property
+	def notification(self) -> Layer:
+		'''获取提示图层，位于最上层'''
+		return self.__notification
+
+	@property
+	def writes_issued(self) -> int:
+		'''获取实际输出到灯珠的次数'''
+		return self.__writes_issued
+
+	@property
+	def writes_suppressed(self) -> int:
+		'''获取因像素数据未变化而跳过输出的次数'''
+		return self.__writes_suppressed
+
+	@property
+	def transmit_us(self) -> int:
+		'''获取最后一帧的发送耗时（us）'''
+		return self.__transmit_us
+
+	@property
+	def transmit_us_max(self) -> int:
+		'''获取上次清零统计后最长一帧的发送耗时（us）'''
+		return self.__transmit_us_max
+
+	@property
+	def frames_merged(self) -> int:
+		'''获取因帧率限制合并到下一帧输出的 show() 次数'''
+		return self.__frames_merged
+
+	@property
+	def frames_dropped(self) -> int:
+		'''获取等待输出期间被新画面覆盖、没有显示的画面数量'''
+		return self.__frames_dropped
+
+	@property
+	def frame_pending(self) -> bool:
+		'''是否有等待输出的帧'''
+		return self.__frame_pending
+
+	@property
+	def max_fps(self) -> int:
+		return 1_000_000 // self.__frame_period_us if self.__frame_period_us else None
+
+	@max_fps.setter
+	def max_fps(self, value:int):
+		'''获取/设置最高帧率，None 或 0 表示不限制'''
+		self.__frame_period_us = 1_000_000 // value if value else 0
+
+	@property
+	def frame_pending_cb(self):
+		return self.__pending_cb
+
+	@frame_pending_cb.setter
+	def frame_pending_cb(self, callback):
+		'''
+		获取/设置有帧等待输出时的回调函数 callback(delay_ms)，
+		回调函数需要安排在 delay_ms 毫秒后调用 present()，设置为 None 时不限制帧率
+		'''
+		self.__pending_cb = callback
+
+	@property
+	def front_buffer(self) -> bytearray:
+		'''获取最后一次发送的输出缓冲区'''
+		return self.__output_buffers[self.__back_index ^ 1]
+
+	@property
+	def output_level(self) -> int:
+		return self.__output_level
+
+	@output_level.setter
+	def output_level(self, value:int):
+		'''获取/设置输出级亮度（0~255），设置后立即生效，不渐变'''
+		value = 0 if value < 0 else (WS2812.OUTPUT_LEVEL_MAX if value > WS2812.OUTPUT_LEVEL_MAX else value)
+
+		self.__output_target = value
+		self.__fade_step = 0
+		self.__set_output_level(value)
+
+	@property
+	def is_fading(self) -> bool:
+		'''输出级亮度是否正在渐变'''
+		return self.__output_level != self.__output_target
 
 	@property
 	def brightness(self) -> int:
@@ -109,6 +559,7 @@ class WS2812(object):
 	def brightness(self, value:int):
 		'''获取/设置亮度百分比'''
 		self.__bright_percent = 1 if value < 1 else (100 if value > 100 else value)
+		self.__update_palette()
 
 
 if __name__ == '__main__':
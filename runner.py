@@ -2,15 +2,20 @@
 Copyright © 2023 Walkline Wang (https://walkline.wang)
 Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
 """
-__version__ = '0.1.1'
-__version_info__ = (0, 1, 1)
+__version__ = '0.1.6'
+__version_info__ = (0, 1, 6)
 print('module runner version:', __version__)
 
 
 import gc
-from utime import sleep
+from utime import sleep_ms
 from drivers.button import Button
 
+try:
+	from utils.dispatcher import Dispatcher
+except ImportError:
+	Dispatcher = __import__('utils/dispatcher').Dispatcher
+
 try:
 	from utils.utilities import Utilities
 except ImportError:
@@ -33,20 +38,54 @@ CONFIG = Utilities.import_config()
 
 
 class Runner(object):
-	def __init__(self):
-		self.__clock = MatrixClock()
+	# 主循环检查待执行任务的间隔时长
+	LOOP_PERIOD_MS = 50
+
+	def __init__(self, async_runtime:bool=None):
+		'''
+		参数：
+		- async_runtime：是否使用 asyncio 运行，默认使用 CONFIG.ASYNC_RUNTIME
+		'''
+		if async_runtime is None:
+			async_runtime = getattr(CONFIG, 'ASYNC_RUNTIME', False)
+
+		self.__async_runtime = async_runtime
+
+		# 耗时任务在主循环中执行，不阻塞定时器回调
+		# 使用 asyncio 运行时不使用硬件定时器
+		self.__clock = MatrixClock(
+			defer_mode=Dispatcher.DEFER_LOOP,
+			timer_id=None if async_runtime else 0
+		)
+		# 按键事件写入队列，在主循环中处理，不在定时器回调中切换模式或写文件
 		self.__buttons = Button(
 			CONFIG.KEYS.KEY_LIST,
-			click_cb=self.__buttons_click_cb,
-			press_cb=self.__buttons_press_cb,
 			timeout=2000,
+			timer_id=None if async_runtime else 10,
+			irq=getattr(CONFIG.KEYS, 'IRQ_MODE', False),
+			queue_size=8,
+			chords=((CONFIG.KEYS.KEY_1, CONFIG.KEYS.KEY_2),)
 		)
 
 	def start(self):
+		if self.__async_runtime:
+			try:
+				import uasyncio as asyncio
+			except ImportError:
+				import asyncio
+
+			try:
+				asyncio.run(self.__start_async(asyncio))
+			except KeyboardInterrupt:
+				if self.__clock: self.__clock.stop()
+				if self.__buttons: self.__buttons.deinit()
+
+			return
+
 		try:
 			self.__clock.show_connecting_animation()
 
-			if WifiHandler.STATION_CONNECTED == WifiHandler.set_sta_mode(timeout_sec=120):
+			if WifiHandler.STATION_CONNECTED == WifiHandler.set_sta_mode(timeout_sec=120, idle_cb=self.__handle_button_events):
 				self.__clock.sync_time()
 				self.__clock.stop()
 				self.__clock.show_blink()
@@ -55,13 +94,62 @@ class Runner(object):
 				gc.collect()
 
 				while True:
-					sleep(1)
+					self.__handle_button_events()
+
+					if not self.__clock.run_pending():
+						sleep_ms(Runner.LOOP_PERIOD_MS)
 			else:
 				Utilities.hard_reset()
 		except KeyboardInterrupt:
 			if self.__clock: self.__clock.stop()
 			if self.__buttons: self.__buttons.deinit()
 
+	async def __start_async(self, asyncio):
+		'''使用 asyncio 运行，联网、校时、定时任务和按键轮询均为协程'''
+		clock_task = asyncio.create_task(self.__clock.run_async())
+		asyncio.create_task(self.__buttons.run_async())
+		asyncio.create_task(self.__button_events_async(asyncio))
+
+		self.__clock.show_connecting_animation()
+
+		if WifiHandler.STATION_CONNECTED == await WifiHandler.set_sta_mode_async(timeout_sec=120):
+			await self.__clock.sync_time_async()
+			self.__clock.stop()
+			self.__clock.show_blink()
+			self.__clock.start()
+
+			gc.collect()
+
+			await clock_task
+		else:
+			Utilities.hard_reset()
+
+	async def __button_events_async(self, asyncio):
+		while True:
+			self.__handle_button_events()
+			await asyncio.sleep(Runner.LOOP_PERIOD_MS / 1000)
+
+	def __handle_button_events(self):
+		'''处理按键事件队列中的全部事件'''
+		while True:
+			event = self.__buttons.get_event()
+
+			if event is None:
+				break
+
+			event, pin, value = event
+
+			if event == Button.EVENT_CLICK:
+				self.__buttons_click_cb(pin)
+			elif event == Button.EVENT_LONG_PRESS:
+				self.__buttons_press_cb(value, pin)
+			elif event == Button.EVENT_CHORD:
+				self.__buttons_chord_cb()
+
+	def __buttons_chord_cb(self):
+		self.__clock.hourly_chime = not self.__clock.hourly_chime
+		print(f'Key 1 + Key 2 pressed, hourly chime: {self.__clock.hourly_chime}')
+
 	def __buttons_click_cb(self, pin):
 		print(f'Key {CONFIG.KEYS.KEY_MAP[pin]} clicked')
 
@@ -0,0 +1,68 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+CPython 主机模拟器
+
+使用虚拟时钟模拟 machine、neopixel、network、ntptime、uasyncio 等固件模块，
+在电脑上运行项目代码，可以在几秒钟内模拟数小时的运行过程，用于调试定时任务、按键和显示逻辑
+
+使用方法：
+
+	import simulator
+	simulator.install()
+
+	from runner import Runner
+	Runner().start()
+
+也可以直接运行 python -m simulator，参数说明见 python -m simulator --help
+"""
+__version__ = '0.1.1'
+__version_info__ = (0, 1, 1)
+
+
+import gc
+import os
+import sys
+
+from simulator import board
+from simulator.board import SimulatedReset
+from simulator.clock import VirtualClock, SimulationComplete
+from simulator import loader
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 模拟的固件模块名称：simulator.hal 中的模块名称
+HAL_MODULES = ('utime', 'machine', 'neopixel', 'network', 'ntptime', 'mip', 'esp', 'esp32', 'micropython', 'smartconfig', 'uasyncio', 'usocket')
+
+
+def install(world_time:int=None, speed:float=None) -> board.Board:
+	'''
+	创建虚拟时钟和模拟开发板，并注册模拟的固件模块
+
+	参数：
+	- world_time：真实世界的 UTC 时间（从 2000 年开始的秒数），默认使用电脑当前时间
+	- speed：相对实际时间的加速倍数，默认不等待
+	'''
+	if world_time is None:
+		import time
+		world_time = int(time.time()) - board.EPOCH_2000
+
+	clock = VirtualClock(world_time=world_time, speed=speed)
+	result = board.create(clock)
+
+	for name in HAL_MODULES:
+		sys.modules[name] = __import__(f'simulator.hal.{name}', None, None, [name])
+
+	if not hasattr(gc, 'mem_alloc'):
+		gc.mem_alloc = lambda: 0
+		gc.mem_free = lambda: 400 * 1024
+
+	if PROJECT_ROOT not in sys.path:
+		sys.path.insert(0, PROJECT_ROOT)
+
+	if not any(isinstance(finder, loader.ProjectFinder) for finder in sys.meta_path):
+		loader.install(PROJECT_ROOT)
+
+	return result
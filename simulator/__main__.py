@@ -0,0 +1,102 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+在电脑上运行项目代码，模拟指定时长后输出统计信息和最后一帧画面
+
+	python -m simulator --hours 24
+	python -m simulator --hours 1 --start "2023-06-01 07:30" --press 2@60 --press 3@120:3000
+	python -m simulator --hours 1 --async-runtime
+"""
+import argparse
+import calendar
+import os
+import sys
+import tempfile
+import time
+
+import simulator
+
+
+def parse_start(value:str) -> int:
+	'''将 "YYYY-MM-DD HH:MM" 格式的 UTC 时间转换为从 2000 年开始的秒数'''
+	value = time.strptime(value, '%Y-%m-%d %H:%M')
+
+	return calendar.timegm(value) - simulator.board.EPOCH_2000
+
+def parse_press(value:str) -> tuple:
+	'''将 "引脚@秒数[:按下毫秒数]" 格式的按键操作转换为 (pin, delay_ms, duration_ms)'''
+	pin, _, when = value.partition('@')
+	when, _, duration = when.partition(':')
+
+	return int(pin), int(float(when) * 1000), int(duration or 100)
+
+def parse_args():
+	parser = argparse.ArgumentParser(prog='python -m simulator', description='MicroPython WS2812 Led Clock host simulator')
+	parser.add_argument('--hours', type=float, default=24, help='simulated duration in hours (default: 24)')
+	parser.add_argument('--speed', type=float, default=None, help='run at N times real time (default: as fast as possible)')
+	parser.add_argument('--start', type=parse_start, default=None, help='UTC start time "YYYY-MM-DD HH:MM" (default: now)')
+	parser.add_argument('--workdir', default=None, help='directory for files written by the clock (default: a temporary directory)')
+	parser.add_argument('--press', type=parse_press, action='append', default=[], help='press a key: PIN@SECONDS[:DURATION_MS]')
+	parser.add_argument('--no-wifi', action='store_true', help='wireless network is not available')
+	parser.add_argument('--no-ntp', action='store_true', help='ntp server is not reachable')
+	parser.add_argument('--async-runtime', action='store_true', help='run with the asyncio runtime (CONFIG.ASYNC_RUNTIME)')
+	parser.add_argument('--quiet', action='store_true', help='hide output printed by the clock')
+
+	return parser.parse_args()
+
+def main():
+	args = parse_args()
+	board = simulator.install(world_time=args.start, speed=args.speed)
+	board.wifi_available = not args.no_wifi
+	board.ntp_available = not args.no_ntp
+
+	workdir = args.workdir or tempfile.mkdtemp(prefix='ws2812-clock-')
+	os.makedirs(workdir, exist_ok=True)
+	os.chdir(workdir)
+	sys.path.insert(0, workdir)
+
+	# 预先保存配网信息，跳过配网过程
+	if not os.path.exists('sta_config.py'):
+		with open('sta_config.py', 'w') as output:
+			output.write("essid = 'simulator'\npassword = 'simulator'\n")
+
+	for pin, delay_ms, duration_ms in args.press:
+		board.press(pin, duration_ms, delay_ms)
+
+	board.clock.stop_after(args.hours * 3600)
+
+	stdout = sys.stdout
+
+	if args.quiet:
+		sys.stdout = open(os.devnull, 'w')
+
+	result = 'completed'
+
+	try:
+		from runner import Runner
+
+		Runner(async_runtime=args.async_runtime).start()
+	except simulator.SimulationComplete:
+		pass
+	except simulator.SimulatedReset as reset:
+		result = f'stopped by {reset}'
+	finally:
+		if args.quiet:
+			sys.stdout.close()
+			sys.stdout = stdout
+
+	clock = board.clock
+
+	print(f'\nsimulation {result}')
+	print(f'- virtual time: {clock.now_us / 1_000_000 / 3600:.2f} h')
+	print(f'- real time: {clock.elapsed:.2f} s')
+	print(f'- callbacks: {clock.callbacks}')
+	print(f'- neopixel writes: {sum(neopixel.writes for neopixel in board.neopixels)}')
+	print(f'- resets: {board.resets}')
+	print(f'- workdir: {workdir}')
+	print(f'\nlast frame:\n{board.render_text()}')
+
+
+if __name__ == '__main__':
+	main()
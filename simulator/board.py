@@ -0,0 +1,120 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+模拟开发板状态
+
+保存虚拟时钟、引脚、ADC、灯珠、网络和 ntp 服务器的状态，
+测试代码通过本模块设置输入（按键、环境光）并读取输出（灯珠像素数据）
+"""
+import math
+
+from simulator.clock import VirtualClock
+
+
+# 2000-01-01 00:00:00 UTC 对应的 unix 时间戳
+EPOCH_2000 = 946684800
+
+
+class SimulatedReset(BaseException):
+	'''被模拟代码调用了 machine.reset()'''
+	pass
+
+
+class Board(object):
+	'''
+	模拟开发板
+
+	- clock：虚拟时钟
+	- rtc_offset：RTC 时间（从 2000 年开始的秒数）减去开机后经过的秒数
+	- wifi_available：是否可以连接无线网络
+	- wifi_connect_ms：连接无线网络所需时长
+	- ntp_available：ntp 服务器是否可以访问
+	- ntp_latency_ms：ntp 请求耗时
+	'''
+	def __init__(self, clock:VirtualClock):
+		self.clock = clock
+		self.rtc_offset = 0
+
+		self.wifi_available  = True
+		self.wifi_connect_ms = 1500
+		self.ntp_available   = True
+		self.ntp_latency_ms  = 20
+
+		self.pins      = {} # pin id: Pin
+		self.adcs      = {} # pin id: 数值或 callable(board) -> int
+		self.neopixels = []
+		self.wlans     = {} # interface: WLAN
+		self.resets    = 0
+
+	#region time
+	@property
+	def rtc_seconds(self) -> int:
+		'''RTC 当前时间（从 2000 年开始的秒数）'''
+		return self.rtc_offset + self.clock.now_us // 1_000_000
+
+	@rtc_seconds.setter
+	def rtc_seconds(self, value:int):
+		self.rtc_offset = value - self.clock.now_us // 1_000_000
+	#endregion time
+
+	#region inputs
+	def set_pin(self, pin:int, value:int):
+		'''设置输入引脚电平，电平变化时触发引脚中断'''
+		self.pins[pin].set_input(value)
+
+	def press(self, pin:int, duration_ms:int=100, delay_ms:int=0, pressed_level:int=0):
+		'''在 delay_ms 之后按下按键，持续 duration_ms 后释放'''
+		clock = self.clock
+		clock.call_later(delay_ms * 1000, lambda: self.set_pin(pin, pressed_level))
+		clock.call_later((delay_ms + duration_ms) * 1000, lambda: self.set_pin(pin, 1 - pressed_level))
+
+	def set_adc(self, pin:int, source):
+		'''设置 ADC 读数（0~4095），参数可以是数值或者 callable(board) -> int'''
+		self.adcs[pin] = source
+
+	def read_adc(self, pin:int) -> int:
+		source = self.adcs.get(pin, daylight_adc)
+		value  = source(self) if callable(source) else source
+
+		return 0 if value < 0 else (4095 if value > 4095 else int(value))
+	#endregion inputs
+
+	#region outputs
+	def render_text(self, neopixel=None, width:int=9) -> str:
+		'''将灯珠像素数据按照序号顺序输出为文本，点亮的灯珠显示为 #'''
+		if neopixel is None:
+			if not self.neopixels:
+				return ''
+
+			neopixel = self.neopixels[-1]
+
+		frame = neopixel.last_frame or bytes(len(neopixel.buf))
+		bpp   = neopixel.bpp
+		lines = []
+
+		for start in range(0, neopixel.n, width):
+			lines.append(''.join(
+				'#' if any(frame[index * bpp:(index + 1) * bpp]) else '.'
+				for index in range(start, min(start + width, neopixel.n))
+			))
+
+		return '\n'.join(lines)
+	#endregion outputs
+
+
+def daylight_adc(board:Board) -> int:
+	'''按照 UTC 时间模拟的环境光，白天读数小，夜间读数大'''
+	seconds = board.clock.world_time % 86400
+	light   = max(0.0, math.sin((seconds / 86400 - 0.25) * 2 * math.pi))
+
+	return int(4000 - light * 3800)
+
+
+board = None
+
+def create(clock:VirtualClock) -> Board:
+	global board
+	board = Board(clock)
+
+	return board
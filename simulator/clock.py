@@ -0,0 +1,144 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+虚拟时钟
+
+虚拟时间只在代码调用 sleep 系列函数或手动调用 advance() 时前进，
+前进过程中按照时间顺序依次执行到期的定时器回调和 micropython.schedule() 回调，
+执行代码本身不消耗虚拟时间，所以模拟结果是确定的，并且可以远快于实际时间
+"""
+import time
+from heapq import heappush, heappop
+
+
+class SimulationComplete(BaseException):
+	'''虚拟时间到达设定的结束时间'''
+	pass
+
+
+class VirtualClock(object):
+	'''
+	虚拟时钟
+
+	参数：
+	- world_time：模拟开始时的真实世界时间（UTC，从 2000 年开始的秒数），ntp 服务器返回该时间
+	- speed：相对实际时间的加速倍数，默认值 None 表示不等待，尽可能快地运行
+	- schedule_depth：micropython.schedule() 队列长度
+	'''
+	def __init__(self, world_time:int=0, speed:float=None, schedule_depth:int=8):
+		self.__now_us     = 0
+		self.__world_time = world_time
+		self.__speed      = speed
+		self.__stop_us    = None
+
+		self.__events    = [] # (due_us, seq, callback)
+		self.__pending   = set()
+		self.__cancelled = set()
+		self.__seq       = 0
+
+		self.__scheduled      = []
+		self.__schedule_depth = schedule_depth
+		self.__running_events = False
+
+		self.__callbacks = 0
+		self.__started   = time.perf_counter()
+
+	def call_at(self, due_us:int, callback) -> int:
+		'''在指定的虚拟时间执行回调函数，返回可用于 cancel() 的编号'''
+		self.__seq += 1
+		self.__pending.add(self.__seq)
+		heappush(self.__events, (max(due_us, self.__now_us), self.__seq, callback))
+
+		return self.__seq
+
+	def call_later(self, delay_us:int, callback) -> int:
+		'''在指定时长之后执行回调函数'''
+		return self.call_at(self.__now_us + delay_us, callback)
+
+	def cancel(self, handle:int):
+		'''取消尚未执行的回调函数'''
+		if handle in self.__pending:
+			self.__cancelled.add(handle)
+
+	def schedule(self, func, arg):
+		'''模拟 micropython.schedule()，队列已满时抛出 RuntimeError'''
+		if len(self.__scheduled) >= self.__schedule_depth:
+			raise RuntimeError('schedule queue full')
+
+		self.__scheduled.append((func, arg))
+
+	def advance(self, us:int):
+		'''虚拟时间前进指定时长，依次执行期间到期的回调函数'''
+		target = self.__now_us + max(0, int(us))
+
+		if self.__stop_us is not None and target > self.__stop_us:
+			target = self.__stop_us
+
+		self.__run_until(target)
+
+		if self.__speed:
+			time.sleep(us / 1_000_000 / self.__speed)
+
+		if self.__stop_us is not None and self.__now_us >= self.__stop_us:
+			raise SimulationComplete(self.__now_us)
+
+	def __run_until(self, target:int):
+		events = self.__events
+
+		# 回调函数中调用 sleep 时只移动时间，避免重入
+		if self.__running_events:
+			self.__now_us = max(self.__now_us, target)
+			return
+
+		self.__running_events = True
+
+		try:
+			self.__run_scheduled()
+
+			while events and events[0][0] <= target:
+				due, seq, callback = heappop(events)
+				self.__pending.discard(seq)
+
+				if seq in self.__cancelled:
+					self.__cancelled.discard(seq)
+					continue
+
+				self.__now_us = max(self.__now_us, due)
+				self.__callbacks += 1
+				callback()
+				self.__run_scheduled()
+
+			self.__now_us = max(self.__now_us, target)
+		finally:
+			self.__running_events = False
+
+	def __run_scheduled(self):
+		while self.__scheduled:
+			func, arg = self.__scheduled.pop(0)
+			self.__callbacks += 1
+			func(arg)
+
+	def stop_after(self, seconds:float):
+		'''设置从当前时间开始的模拟时长，到达后 advance() 抛出 SimulationComplete'''
+		self.__stop_us = self.__now_us + int(seconds * 1_000_000)
+
+	@property
+	def now_us(self) -> int:
+		'''开机后经过的虚拟时间（微秒）'''
+		return self.__now_us
+
+	@property
+	def world_time(self) -> int:
+		'''当前真实世界时间（UTC，从 2000 年开始的秒数）'''
+		return self.__world_time + self.__now_us // 1_000_000
+
+	@property
+	def callbacks(self) -> int:
+		'''已执行的回调函数数量'''
+		return self.__callbacks
+
+	@property
+	def elapsed(self) -> float:
+		'''模拟开始后经过的实际时间（秒）'''
+		return time.perf_counter() - self.__started
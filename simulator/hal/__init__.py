@@ -0,0 +1,6 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+固件模块的模拟实现，由 simulator.install() 注册到 sys.modules
+"""
@@ -0,0 +1,22 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+esp 模拟模块
+"""
+LOG_NONE    = 0
+LOG_ERROR   = 1
+LOG_WARNING = 2
+LOG_INFO    = 3
+LOG_DEBUG   = 4
+LOG_VERBOSE = 5
+
+
+def osdebug(level:int=None, *args):
+	pass
+
+def flash_size() -> int:
+	return 4 * 1024 * 1024
+
+def flash_id() -> int:
+	return 0
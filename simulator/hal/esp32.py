@@ -0,0 +1,60 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+esp32 模拟模块
+"""
+
+
+class RMT(object):
+	__bitstream_channel = None
+
+	def __init__(self, channel:int, pin=None, clock_div:int=8, idle_level:bool=False, tx_carrier:tuple=None):
+		if channel == RMT.__bitstream_channel:
+			raise ValueError('channel used by bitstream')
+
+		self.__channel = channel
+
+		self.writes = 0
+		self.last_pulses = None
+
+	def write_pulses(self, duration, data=True):
+		'''记录发送的脉冲时长，模拟器中发送立即完成'''
+		self.writes += 1
+		self.last_pulses = tuple(duration)
+
+	def wait_done(self, timeout:int=0) -> bool:
+		return True
+
+	def decode(self) -> bytes:
+		'''将最后一次发送的脉冲（高电平、低电平交替）还原为字节，高电平较长的为 1'''
+		pulses = self.last_pulses or ()
+		result = bytearray(len(pulses) // 16)
+
+		for index in range(len(result)):
+			value = 0
+
+			for bit in range(8):
+				position = index * 16 + bit * 2
+				value = value << 1 | (1 if pulses[position] > pulses[position + 1] else 0)
+
+			result[index] = value
+
+		return bytes(result)
+
+	@staticmethod
+	def bitstream_channel(value:int=None):
+		if value is None:
+			return RMT.__bitstream_channel
+
+		RMT.__bitstream_channel = value
+
+	def deinit(self):
+		pass
+
+
+def raw_temperature() -> int:
+	return 120
+
+def idf_heap_info(capabilities:int) -> list:
+	return []
@@ -0,0 +1,184 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+machine 模拟模块，提供 Pin、Timer、ADC、RTC 和复位函数
+"""
+from simulator import board as _board
+from simulator.board import SimulatedReset
+from simulator.hal import utime as _utime
+
+
+class Pin(object):
+	IN  = 1
+	OUT = 3
+	OPEN_DRAIN = 7
+
+	PULL_UP   = 2
+	PULL_DOWN = 1
+
+	IRQ_RISING  = 1
+	IRQ_FALLING = 2
+
+	def __init__(self, id:int, mode:int=-1, pull:int=-1, value:int=None):
+		self.__id      = id
+		self.__mode    = mode
+		self.__handler = None
+		self.__trigger = 0
+		self.__value   = 1 if pull == Pin.PULL_UP else 0
+
+		if value is not None:
+			self.__value = 1 if value else 0
+
+		_board.board.pins[id] = self
+
+	def __repr__(self):
+		return f'Pin({self.__id})'
+
+	def init(self, mode:int=-1, pull:int=-1, value:int=None):
+		self.__init__(self.__id, mode, pull, value)
+
+	def value(self, value:int=None):
+		if value is None:
+			return self.__value
+
+		self.__value = 1 if value else 0
+
+	def on(self):
+		self.value(1)
+
+	def off(self):
+		self.value(0)
+
+	def irq(self, handler=None, trigger:int=IRQ_FALLING | IRQ_RISING, hard:bool=False):
+		self.__handler = handler
+		self.__trigger = trigger
+
+	def set_input(self, value:int):
+		'''模拟外部电路改变引脚电平，电平变化时按照触发条件调用中断回调'''
+		value = 1 if value else 0
+		edge  = Pin.IRQ_RISING if value > self.__value else (Pin.IRQ_FALLING if value < self.__value else 0)
+		self.__value = value
+
+		if edge & self.__trigger and self.__handler is not None:
+			self.__handler(self)
+
+	@property
+	def id(self) -> int:
+		return self.__id
+
+
+class Timer(object):
+	ONE_SHOT = 0
+	PERIODIC = 1
+
+	def __init__(self, id:int, mode:int=PERIODIC, period:int=-1, callback=None):
+		self.__id       = id
+		self.__handle   = None
+		self.__callback = None
+		self.__period   = 0
+		self.__mode     = mode
+
+		if callback is not None:
+			self.init(mode=mode, period=period, callback=callback)
+
+	def __repr__(self):
+		return f'Timer({self.__id})'
+
+	def init(self, mode:int=PERIODIC, period:int=-1, callback=None, freq:int=None):
+		self.deinit()
+
+		if freq is not None:
+			period = 1000 // freq
+
+		self.__mode     = mode
+		self.__period   = max(1, period)
+		self.__callback = callback
+		self.__handle   = _board.board.clock.call_later(self.__period * 1000, self.__fire)
+
+	def deinit(self):
+		_board.board.clock.cancel(self.__handle)
+		self.__handle = None
+
+	def __fire(self):
+		self.__handle = None
+
+		if self.__mode == Timer.PERIODIC:
+			self.__handle = _board.board.clock.call_later(self.__period * 1000, self.__fire)
+
+		if self.__callback is not None:
+			self.__callback(self)
+
+	def value(self) -> int:
+		return 0
+
+
+class ADC(object):
+	ATTN_0DB   = 0
+	ATTN_2_5DB = 1
+	ATTN_6DB   = 2
+	ATTN_11DB  = 3
+
+	WIDTH_12BIT = 3
+
+	def __init__(self, pin, atten:int=None):
+		self.__pin = pin.id if isinstance(pin, Pin) else pin
+
+	def atten(self, value:int):
+		pass
+
+	def width(self, value:int):
+		pass
+
+	def read(self) -> int:
+		return _board.board.read_adc(self.__pin)
+
+	def read_u16(self) -> int:
+		value = self.read()
+		return (value << 4) | (value >> 8)
+
+	def read_uv(self) -> int:
+		return self.read() * 2_500_000 // 4095
+
+
+class RTC(object):
+	def init(self, datetime:tuple):
+		self.datetime(datetime)
+
+	def datetime(self, datetime:tuple=None):
+		'''(year, month, day, weekday, hours, minutes, seconds, subseconds)'''
+		board = _board.board
+
+		if datetime is None:
+			year, month, mday, hour, minute, second, weekday, _ = _utime.localtime(board.rtc_seconds)
+
+			return (year, month, mday, weekday, hour, minute, second, board.clock.now_us % 1_000_000)
+
+		year, month, day, _, hour, minute, second = datetime[:7]
+		board.rtc_seconds = _utime.mktime((year, month, day, hour, minute, second, 0, 0))
+
+
+def reset():
+	_board.board.resets += 1
+	raise SimulatedReset('machine.reset()')
+
+def soft_reset():
+	raise SimulatedReset('machine.soft_reset()')
+
+def freq(value:int=None) -> int:
+	return 160_000_000
+
+def unique_id() -> bytes:
+	return b'\x7c\xdf\xa1\x00\x00\x01'
+
+def idle():
+	_board.board.clock.advance(1000)
+
+def reset_cause() -> int:
+	return 1
+
+def disable_irq() -> int:
+	return 0
+
+def enable_irq(state:int=0):
+	pass
@@ -0,0 +1,27 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+micropython 模拟模块，schedule() 回调由虚拟时钟在定时器回调之后执行
+"""
+from simulator import board as _board
+
+
+def const(value):
+	return value
+
+def schedule(func, arg):
+	_board.board.clock.schedule(func, arg)
+
+def alloc_emergency_exception_buf(size:int):
+	pass
+
+def opt_level(level:int=None) -> int:
+	return 0
+
+def mem_info(verbose:bool=False):
+	pass
+
+def native(func):
+	return func
+viper = native
@@ -0,0 +1,12 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+mip 模拟模块，只记录安装请求，不下载文件
+"""
+installed = []
+
+
+def install(package:str, index:str=None, target:str=None, version:str=None, mpy:bool=True):
+	installed.append((package, target))
+	print(f'mip (simulated): skip installing {package}')
@@ -0,0 +1,50 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+neopixel 模拟模块，接口与固件中的 neopixel.py 相同，write() 时记录输出的像素数据
+"""
+from simulator import board as _board
+
+
+class NeoPixel(object):
+	# G R B W
+	ORDER = (1, 0, 2, 3)
+
+	def __init__(self, pin, n:int, bpp:int=3, timing:int=1):
+		self.pin = pin
+		self.n = n
+		self.bpp = bpp
+		self.buf = bytearray(n * bpp)
+		self.timing = timing
+
+		self.writes = 0
+		self.last_frame = None
+		self.write_cb = None # write_cb(neopixel, frame)
+
+		_board.board.neopixels.append(self)
+
+	def __len__(self):
+		return self.n
+
+	def __setitem__(self, index:int, value:tuple):
+		offset = index * self.bpp
+
+		for channel in range(self.bpp):
+			self.buf[offset + self.ORDER[channel]] = value[channel]
+
+	def __getitem__(self, index:int) -> tuple:
+		offset = index * self.bpp
+
+		return tuple(self.buf[offset + self.ORDER[channel]] for channel in range(self.bpp))
+
+	def fill(self, value:tuple):
+		for index in range(self.n):
+			self[index] = value
+
+	def write(self):
+		self.writes += 1
+		self.last_frame = bytes(self.buf)
+
+		if self.write_cb is not None:
+			self.write_cb(self, self.last_frame)
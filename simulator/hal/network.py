@@ -0,0 +1,106 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+network 模拟模块，连接结果由 board.wifi_available 决定，连接耗时 board.wifi_connect_ms
+"""
+from simulator import board as _board
+
+
+STA_IF = 0
+AP_IF  = 1
+
+STAT_IDLE              = 1000
+STAT_CONNECTING        = 1001
+STAT_GOT_IP            = 1010
+STAT_BEACON_TIMEOUT    = 200
+STAT_NO_AP_FOUND       = 201
+STAT_WRONG_PASSWORD    = 202
+STAT_ASSOC_FAIL        = 203
+STAT_HANDSHAKE_TIMEOUT = 204
+
+AUTH_OPEN     = 0
+AUTH_WPA2_PSK = 3
+
+
+class WLAN(object):
+	def __new__(cls, interface:int=STA_IF):
+		# 与固件相同，同一个接口返回同一个对象
+		interfaces = _board.board.wlans
+
+		if interface not in interfaces:
+			instance = object.__new__(cls)
+			instance.__setup(interface)
+			interfaces[interface] = instance
+
+		return interfaces[interface]
+
+	def __init__(self, interface:int=STA_IF):
+		pass
+
+	def __setup(self, interface:int):
+		self.__interface = interface
+		self.__active    = False
+		self.__status    = STAT_IDLE
+		self.__essid     = None
+		self.__handle    = None
+		self.__mac       = bytes((0x7c, 0xdf, 0xa1, 0x00, 0x00, 0x01 + interface))
+
+	def active(self, value:bool=None):
+		if value is None:
+			return self.__active
+
+		self.__active = bool(value)
+
+		if not self.__active:
+			self.disconnect()
+
+	def connect(self, essid:str=None, password:str=None, bssid=None):
+		board = _board.board
+		self.__essid  = essid
+		self.__status = STAT_CONNECTING
+
+		board.clock.cancel(self.__handle)
+		self.__handle = board.clock.call_later(board.wifi_connect_ms * 1000, self.__connected)
+
+	def __connected(self):
+		self.__handle = None
+		self.__status = STAT_GOT_IP if _board.board.wifi_available else STAT_NO_AP_FOUND
+
+	def disconnect(self):
+		_board.board.clock.cancel(self.__handle)
+		self.__handle = None
+		self.__status = STAT_IDLE
+
+	def isconnected(self) -> bool:
+		return self.__active and self.__status == STAT_GOT_IP and _board.board.wifi_available
+
+	def status(self, param:str=None):
+		if param == 'rssi':
+			return -50
+
+		return self.__status
+
+	def ifconfig(self, config:tuple=None) -> tuple:
+		if self.isconnected():
+			return ('192.168.1.100', '255.255.255.0', '192.168.1.1', '192.168.1.1')
+
+		return ('0.0.0.0', '0.0.0.0', '0.0.0.0', '0.0.0.0')
+
+	def config(self, *params, **kwargs):
+		if kwargs:
+			return
+
+		param = params[0] if params else None
+
+		if param == 'mac':
+			return self.__mac
+		elif param in ('essid', 'ssid'):
+			return self.__essid or ''
+		elif param == 'hostname':
+			return 'mpy-esp32c3'
+		elif param == 'channel':
+			return 1
+
+	def scan(self) -> list:
+		return []
@@ -0,0 +1,32 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+ntptime 模拟模块，返回虚拟时钟的真实世界时间，网络未连接或 board.ntp_available 为 False 时超时
+"""
+from simulator import board as _board
+from simulator.hal import network as _network
+from simulator.hal import utime as _utime
+from simulator.hal.machine import RTC
+
+
+host = 'pool.ntp.org'
+timeout = 1
+
+
+def time() -> int:
+	'''获取 UTC 时间（从 2000 年开始的秒数）'''
+	board = _board.board
+
+	if not _network.WLAN(_network.STA_IF).isconnected() or not board.ntp_available:
+		board.clock.advance(timeout * 1_000_000)
+		raise OSError(116, 'ETIMEDOUT')
+
+	board.clock.advance(board.ntp_latency_ms * 1000)
+
+	return board.clock.world_time
+
+def settime():
+	'''将 RTC 设置为 UTC 时间'''
+	value = _utime.gmtime(time())
+	RTC().datetime((value[0], value[1], value[2], value[6] + 1, value[3], value[4], value[5], 0))
@@ -0,0 +1,22 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+smartconfig 模拟模块，配网永远不会成功，模拟时需要预先生成 sta_config.py
+"""
+TYPE_ESPTOUCH    = 0
+TYPE_AIRKISS     = 1
+TYPE_ESPTOUCH_V2 = 3
+
+
+def start():
+	pass
+
+def stop():
+	pass
+
+def success() -> bool:
+	return False
+
+def info() -> tuple:
+	return ('', '', TYPE_ESPTOUCH, 0)
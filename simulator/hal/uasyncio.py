@@ -0,0 +1,230 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+uasyncio 模拟模块，事件循环使用虚拟时钟
+
+只实现项目用到的部分：run()、create_task()、sleep()、sleep_ms()、wait_for()、wait_for_ms() 和 Event，
+所有任务都在等待时虚拟时钟直接前进到最近的唤醒时间，期间照常执行定时器和引脚中断回调
+"""
+import sys
+from collections import deque
+from heapq import heappush, heappop
+
+from simulator import board as _board
+
+
+# 没有任务等待定时唤醒时虚拟时钟每次前进的时长（微秒）
+IDLE_US = 10_000
+
+TimeoutError = TimeoutError
+
+
+class CancelledError(BaseException):
+	pass
+
+
+def _now_us() -> int:
+	return _board.board.clock.now_us
+
+
+class _Suspend(object):
+	'''挂起当前任务，到达 due_us 或者 waitable 完成时恢复，两者都为 None 时只让出执行权'''
+	def __init__(self, due_us:int=None, waitable=None):
+		self.due_us   = due_us
+		self.waitable = waitable
+
+	def __await__(self):
+		yield self
+
+
+class _Loop(object):
+	def __init__(self):
+		self.ready  = deque() # (task, error)
+		self.timers = []      # (due_us, seq, task, token)
+		self.seq    = 0
+
+	def wake(self, task, token:int=None, error:BaseException=None):
+		'''恢复挂起的任务，token 与任务当前的挂起序号不同时说明任务已经被其它方式恢复'''
+		if task.done or task.queued or (token is not None and token != task.token):
+			return
+
+		task.token += 1
+		task.queued = True
+
+		if task.waiting is not None:
+			waiters = task.waiting.waiters
+
+			if task in waiters:
+				waiters.remove(task)
+
+			task.waiting = None
+
+		self.ready.append((task, error))
+
+	def step(self, task, error:BaseException):
+		task.queued = False
+
+		if task.cancelling:
+			task.cancelling = False
+			error = CancelledError()
+
+		try:
+			request = task.coro.send(None) if error is None else task.coro.throw(error)
+		except StopIteration as result:
+			task.finish(result.value, None)
+		except CancelledError as e:
+			task.finish(None, e)
+		except Exception as e:
+			task.finish(None, e)
+		else:
+			if not isinstance(request, _Suspend):
+				self.wake(task, error=TypeError(f'unsupported awaitable: {request!r}'))
+			elif request.waitable is None and request.due_us is None:
+				self.wake(task)
+			else:
+				if request.waitable is not None:
+					task.waiting = request.waitable
+					request.waitable.waiters.append(task)
+
+				if request.due_us is not None:
+					self.seq += 1
+					heappush(self.timers, (request.due_us, self.seq, task, task.token))
+
+	def run_until_done(self, main):
+		clock  = _board.board.clock
+		timers = self.timers
+
+		while not main.done:
+			if self.ready:
+				self.step(*self.ready.popleft())
+				continue
+
+			while timers and timers[0][3] != timers[0][2].token:
+				heappop(timers)
+
+			if not timers:
+				clock.advance(IDLE_US)
+				continue
+
+			if timers[0][0] > clock.now_us:
+				clock.advance(timers[0][0] - clock.now_us)
+
+			while timers and timers[0][0] <= clock.now_us:
+				_, _, task, token = heappop(timers)
+				self.wake(task, token)
+
+
+_loop = None
+
+
+class Task(object):
+	def __init__(self, coro):
+		self.coro       = coro
+		self.done       = False
+		self.value      = None
+		self.error      = None
+		self.waiters    = []   # 等待本任务完成的任务
+		self.waiting    = None # 本任务正在等待的对象
+		self.token      = 0
+		self.queued     = False
+		self.cancelling = False
+
+	def finish(self, value, error:BaseException):
+		self.done  = True
+		self.value = value
+		self.error = error
+
+		waiters, self.waiters = self.waiters, []
+
+		if error is not None and not waiters and not isinstance(error, CancelledError):
+			print(f'Task exception wasn\'t retrieved: {error!r}', file=sys.stderr)
+
+		for task in waiters:
+			_loop.wake(task, task.token)
+
+	def cancel(self) -> bool:
+		if self.done:
+			return False
+
+		if self.queued:
+			self.cancelling = True
+		else:
+			_loop.wake(self, error=CancelledError())
+
+		return True
+
+	def __await__(self):
+		if not self.done:
+			yield _Suspend(waitable=self)
+
+		if self.error is not None:
+			raise self.error
+
+		return self.value
+
+
+class Event(object):
+	def __init__(self):
+		self.state   = False
+		self.waiters = []
+
+	def is_set(self) -> bool:
+		return self.state
+
+	def set(self):
+		self.state = True
+		waiters, self.waiters = self.waiters, []
+
+		for task in waiters:
+			_loop.wake(task, task.token)
+
+	def clear(self):
+		self.state = False
+
+	async def wait(self) -> bool:
+		if not self.state:
+			await _Suspend(waitable=self)
+
+		return True
+
+
+def create_task(coro) -> Task:
+	task = Task(coro)
+	_loop.wake(task)
+
+	return task
+
+async def sleep(seconds:float):
+	await _Suspend(due_us=_now_us() + int(seconds * 1_000_000) if seconds > 0 else None)
+
+async def sleep_ms(ms:int):
+	await sleep(ms / 1000)
+
+async def wait_for(awaitable, timeout:float):
+	task = awaitable if isinstance(awaitable, Task) else create_task(awaitable)
+
+	if timeout is not None and not task.done:
+		await _Suspend(due_us=_now_us() + int(timeout * 1_000_000), waitable=task)
+
+		if not task.done:
+			task.cancel()
+			raise TimeoutError
+
+	return await task
+
+async def wait_for_ms(awaitable, timeout:int):
+	return await wait_for(awaitable, timeout / 1000)
+
+def run(coro):
+	'''运行协程直到结束，虚拟时钟到达结束时间或调用 machine.reset() 时抛出的异常不被拦截'''
+	global _loop
+	_loop = _Loop()
+
+	main = create_task(coro)
+	_loop.run_until_done(main)
+
+	if main.error is not None:
+		raise main.error
+
+	return main.value
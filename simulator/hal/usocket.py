@@ -0,0 +1,76 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+usocket 模拟模块，只模拟 ntp 服务器的 UDP 应答
+
+网络已连接并且 board.ntp_available 为 True 时，发送请求 board.ntp_latency_ms 之后可以收到虚拟时钟的真实世界时间，
+否则一直收不到应答，阻塞模式下等待 ntptime.timeout 秒后抛出 ETIMEDOUT
+"""
+import struct
+
+from simulator import board as _board
+from simulator.hal import network as _network
+from simulator.hal import ntptime as _ntptime
+
+
+AF_INET     = 2
+SOCK_STREAM = 1
+SOCK_DGRAM  = 2
+
+EAGAIN    = 11
+ETIMEDOUT = 116
+
+# ntp 时间从 1900 年开始计算，与 2000 年相差的秒数
+NTP_DELTA = 3155673600
+
+
+def getaddrinfo(host:str, port:int, af:int=0, type:int=0, proto:int=0, flags:int=0) -> list:
+	return [(AF_INET, SOCK_DGRAM, 0, host, ('10.0.0.123', port))]
+
+
+class socket(object):
+	def __init__(self, af:int=AF_INET, type:int=SOCK_STREAM, proto:int=0):
+		self.__blocking = True
+		self.__reply_us = None
+
+	def setblocking(self, flag:bool):
+		self.__blocking = bool(flag)
+
+	def settimeout(self, value:float):
+		self.__blocking = value is None or value > 0
+
+	def sendto(self, data:bytes, address:tuple) -> int:
+		board = _board.board
+
+		if _network.WLAN(_network.STA_IF).isconnected() and board.ntp_available:
+			self.__reply_us = board.clock.now_us + board.ntp_latency_ms * 1000
+
+		return len(data)
+
+	def recv(self, size:int) -> bytes:
+		clock = _board.board.clock
+
+		if self.__reply_us is None or clock.now_us < self.__reply_us:
+			if not self.__blocking:
+				raise OSError(EAGAIN)
+
+			if self.__reply_us is None:
+				clock.advance(_ntptime.timeout * 1_000_000)
+				raise OSError(ETIMEDOUT)
+
+			clock.advance(self.__reply_us - clock.now_us)
+
+		self.__reply_us = None
+
+		message = bytearray(48)
+		message[0] = 0x24 # LI = 0，VN = 4，Mode = 4 (server)
+		struct.pack_into('!I', message, 40, clock.world_time + NTP_DELTA)
+
+		return bytes(message[:size])
+
+	def recvfrom(self, size:int) -> tuple:
+		return self.recv(size), ('10.0.0.123', 123)
+
+	def close(self):
+		self.__reply_us = None
@@ -0,0 +1,71 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+utime 模拟模块，使用虚拟时钟，时间戳从 2000 年开始计算（与 ESP32 固件相同）
+"""
+import calendar
+import time as _time
+
+from simulator import board as _board
+from simulator.board import EPOCH_2000
+
+
+# ticks 系列函数的取值范围与固件相同
+TICKS_PERIOD = 1 << 30
+TICKS_MAX    = TICKS_PERIOD - 1
+TICKS_HALF   = TICKS_PERIOD >> 1
+
+
+def _clock():
+	return _board.board.clock
+
+def time() -> int:
+	return _board.board.rtc_seconds
+
+def time_ns() -> int:
+	board = _board.board
+	return board.rtc_offset * 1_000_000_000 + board.clock.now_us * 1000
+
+def localtime(secs:int=None) -> tuple:
+	'''(year, month, mday, hour, minute, second, weekday, yearday)，weekday 0 为星期一'''
+	if secs is None:
+		secs = time()
+
+	value = _time.gmtime(int(secs) + EPOCH_2000)
+
+	return (value.tm_year, value.tm_mon, value.tm_mday, value.tm_hour, value.tm_min, value.tm_sec, value.tm_wday, value.tm_yday)
+
+gmtime = localtime
+
+def mktime(value:tuple) -> int:
+	'''按照线性方式计算秒数，超出范围的时、分、秒会自动进位'''
+	year, month, mday, hour, minute, second = value[:6]
+
+	days = calendar.timegm((year, month, 1, 0, 0, 0, 0, 0, 0)) // 86400 + mday - 1
+
+	return days * 86400 + hour * 3600 + minute * 60 + second - EPOCH_2000
+
+def sleep(seconds:float):
+	_clock().advance(int(seconds * 1_000_000))
+
+def sleep_ms(ms:int):
+	_clock().advance(int(ms) * 1000)
+
+def sleep_us(us:int):
+	_clock().advance(int(us))
+
+def ticks_us() -> int:
+	return _clock().now_us & TICKS_MAX
+
+def ticks_ms() -> int:
+	return (_clock().now_us // 1000) & TICKS_MAX
+
+def ticks_cpu() -> int:
+	return ticks_us()
+
+def ticks_add(ticks:int, delta:int) -> int:
+	return (ticks + delta) & TICKS_MAX
+
+def ticks_diff(ticks1:int, ticks2:int) -> int:
+	return ((ticks1 - ticks2 + TICKS_HALF) & TICKS_MAX) - TICKS_HALF
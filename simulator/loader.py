@@ -0,0 +1,120 @@
+"""
+Copyright © 2023 Walkline Wang (https://walkline.wang)
+Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
+
+项目源码导入钩子
+
+MicroPython 不会改写类中以双下划线开头的名称，项目代码依赖这一点在类之间访问 __xxx 属性
+（例如 Runner 中的 self.__clock.__menu_mode），CPython 则会将其改写为 _ClassName__xxx。
+本模块在编译项目源码之前，将所有非 dunder 的 __xxx 名称统一改写为 _mp__xxx，
+同时去掉函数参数和返回值的类型注解（部分注解写法只有 MicroPython 可以接受）
+"""
+import ast
+import os
+import sys
+from importlib.abc import MetaPathFinder
+from importlib.machinery import PathFinder, SourceFileLoader
+
+
+PRIVATE_PREFIX = '_mp'
+
+
+def _rename(name:str) -> str:
+	if name and name.startswith('__') and not name.endswith('__'):
+		return PRIVATE_PREFIX + name
+
+	return name
+
+
+class _Transformer(ast.NodeTransformer):
+	def visit_Name(self, node):
+		node.id = _rename(node.id)
+		return node
+
+	def visit_Attribute(self, node):
+		self.generic_visit(node)
+		node.attr = _rename(node.attr)
+		return node
+
+	def visit_FunctionDef(self, node):
+		node.name = _rename(node.name)
+		node.returns = None
+		self.generic_visit(node)
+		return node
+
+	visit_AsyncFunctionDef = visit_FunctionDef
+
+	def visit_ClassDef(self, node):
+		node.name = _rename(node.name)
+		self.generic_visit(node)
+		return node
+
+	def visit_arg(self, node):
+		node.arg = _rename(node.arg)
+		node.annotation = None
+		return node
+
+	def visit_keyword(self, node):
+		self.generic_visit(node)
+		node.arg = _rename(node.arg)
+		return node
+
+	def visit_Global(self, node):
+		node.names = [_rename(name) for name in node.names]
+		return node
+
+	visit_Nonlocal = visit_Global
+
+	def visit_alias(self, node):
+		node.asname = _rename(node.asname)
+		return node
+
+	def visit_AnnAssign(self, node):
+		if node.value is None:
+			return ast.Pass()
+
+		self.generic_visit(node)
+
+		return ast.Assign(targets=[node.target], value=node.value)
+
+
+class _SourceLoader(SourceFileLoader):
+	def source_to_code(self, data, path, *, _optimize=-1):
+		tree = _Transformer().visit(ast.parse(data, filename=path))
+		ast.fix_missing_locations(tree)
+
+		return compile(tree, path, 'exec', dont_inherit=True, optimize=_optimize)
+
+	def get_code(self, fullname):
+		# 不使用 __pycache__ 中的缓存，保证每次导入都经过改写
+		source = self.get_data(self.get_filename(fullname))
+		return self.source_to_code(source, self.get_filename(fullname))
+
+
+class ProjectFinder(MetaPathFinder):
+	'''只处理项目目录中的 .py 文件，simulator 包本身除外'''
+	def __init__(self, root:str):
+		self.__root = os.path.abspath(root)
+		self.__excluded = os.path.join(self.__root, 'simulator')
+
+	def find_spec(self, fullname, path=None, target=None):
+		spec = PathFinder.find_spec(fullname, path)
+
+		if spec is None or not spec.origin or not spec.origin.endswith('.py'):
+			return None
+
+		origin = os.path.abspath(spec.origin)
+
+		if not origin.startswith(self.__root + os.sep) or origin.startswith(self.__excluded + os.sep):
+			return None
+
+		spec.loader = _SourceLoader(fullname, origin)
+
+		return spec
+
+
+def install(root:str) -> ProjectFinder:
+	finder = ProjectFinder(root)
+	sys.meta_path.insert(0, finder)
+
+	return finder
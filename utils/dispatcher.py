@@ -2,82 +2,360 @@
 Copyright © 2022 Walkline Wang (https://walkline.wang)
 Gitee: https://gitee.com/walkline/micropython-timer-dispatcher
 """
-__version__ = 'v1.1'
-__version_info__ = (1, 1)
+__version__ = 'v1.8'
+__version_info__ = (1, 8)
 
+import gc
+import micropython
 from machine import Timer
+from utime import ticks_ms, ticks_us, ticks_diff
+
+try:
+	from heapq import heappush, heappop
+except ImportError:
+	from uheapq import heappush, heappop
 
 
 class Worker(object):
 	'''定时器任务'''
-	def __init__(self, work:function, period:int, *params):
-		self.__counter = 0
+	def __init__(self, work:function, period:int, *params, deferred:bool=False, name:str=None):
 		self.__work = work
 		self.__period = period
 		self.__params = params
+		self.__name = name
 
-	@property
-	def counter(self):
-		return self.__counter
-	
-	@counter.setter
-	def counter(self, count):
-		self.__counter = count
+		# 任务被删除或替换后不再执行
+		self.active = True
+
+		# 延迟执行的任务到期后只加入待执行队列，不在定时器回调中执行
+		self.deferred = deferred
+		self.pending  = False
 
 	@property
 	def period(self):
 		return self.__period
 
+	@property
+	def work(self):
+		return self.__work
+
+	@property
+	def name(self) -> str:
+		if self.__name is None:
+			self.__name = getattr(self.__work, '__name__', None) or f'work_{id(self.__work):x}'
+
+		return self.__name
+
 	def do_work(self):
-		self.__work(*self.__params)
+		return self.__work(*self.__params)
 
 
 class Dispatcher(object):
-	'''定时器任务调度器'''
-	__DEFAULT_PERIOD = 20
+	'''
+	定时器任务调度器
+
+	所有任务按照截止时间保存在最小堆中，单次定时器只在最近的任务到期时唤醒，
+	截止时间使用 ticks_ms() 累计的调度器内部时钟计算，不会因为计数取整产生偏差
+
+	主循环中添加任务或重新设置定时器时会占用调度标记，期间到期的定时器回调直接返回，
+	由随后的重新设置定时器补上，任务堆和内部时钟只会被一方修改
+
+	延迟执行的任务到期后加入有界的待执行队列，由以下方式之一执行：
+	- DEFER_SCHEDULE：使用 micropython.schedule() 在定时器回调结束后执行
+	- DEFER_LOOP：在主循环中调用 run_pending() 执行
+
+	timer_id 为 None 时不使用硬件定时器，需要在 asyncio 事件循环中运行 run_async()
+
+	开启 profiling 后按任务统计执行次数、执行时长、错过的截止时间和内存分配，
+	可以在 REPL 中使用 dump_stats() 查看，关闭时几乎没有额外开销
+	'''
+	DEFER_SCHEDULE = 0
+	DEFER_LOOP     = 1
+
+	# 内部时钟超过该值时整体平移所有截止时间，避免整型数值过大
+	__REBASE_MS = 1 << 28
 
-	def __init__(self, adjusting_rate=1, timer_id=0):
+	# 任务统计数据序号
+	STAT_COUNT       = 0 # 执行次数
+	STAT_LAST_US     = 1 # 最后一次执行时长
+	STAT_TOTAL_US    = 2 # 累计执行时长
+	STAT_MAX_US      = 3 # 最长执行时长
+	STAT_MISSED      = 4 # 错过的截止时间次数
+	STAT_LAST_ALLOC  = 5 # 最后一次执行的内存分配
+	STAT_MAX_ALLOC   = 6 # 最大内存分配
+
+	def __init__(self, adjusting_rate=1, timer_id=0, defer_mode=DEFER_SCHEDULE, queue_size=8):
 		'''
 		初始化任务调度器
 
 		参数：
 		- adjusting_rate：时间间隔调整倍率，默认值 1。
-		- timer_id：定时器 ID，默认值 0。
+		- timer_id：定时器 ID，默认值 0，设置为 None 时使用 asyncio 驱动。
+		- defer_mode：延迟任务执行方式，默认值 DEFER_SCHEDULE。
+		- queue_size：待执行队列长度，默认值 8。
 		'''
 		if not isinstance(adjusting_rate, int) or adjusting_rate < 1:
 			adjusting_rate = 1
 
-		if not isinstance(timer_id, int):
+		if timer_id is not None and not isinstance(timer_id, int):
 			timer_id = 0
 
+		if not isinstance(queue_size, int) or queue_size < 1:
+			queue_size = 8
+
 		self.__workers = {}
-		self.__timer = Timer(timer_id)
+		self.__queue = [] # (deadline, sequence, worker) 最小堆
+		self.__sequence = 0
+		self.__timer = Timer(timer_id) if timer_id is not None else None
 		self.__adjusting_rate = adjusting_rate
 		self.__paused = False
+		self.__dispatching = False
+
+		# 调度器内部时钟，单位 毫秒
+		self.__now = 0
+		self.__last_ticks = ticks_ms()
+
+		# 待执行队列，定时器回调只移动 tail，执行队列只移动 head
+		self.__defer_mode = defer_mode
+		self.__pending = [None] * (queue_size + 1)
+		self.__head = 0
+		self.__tail = 0
+		self.__overruns = 0 # 任务再次到期时上一次仍未执行
+		self.__dropped  = 0 # 队列已满被丢弃的任务
+		self.__drain_scheduled = False
+		self.__drain_cb = self.__drain_pending_cb
+
+		# asyncio 驱动时使用
+		self.__asyncio = None
+		self.__wakeup  = None
+
+		# 任务统计数据，{id(work): (task_id, name, [stats])}，task_id 为首次统计的顺序
+		self.__profiling = False
+		self.__stats = {}
+
+	def deinit(self):
+		if self.__timer is not None:
+			self.__timer.deinit()
+
+		self.__workers = {}
+		self.__queue = []
+		self.__clear_pending()
+
+	def __update_clock(self) -> int:
+		'''更新并返回调度器内部时钟'''
+		current = ticks_ms()
+		self.__now += ticks_diff(current, self.__last_ticks)
+		self.__last_ticks = current
+
+		return self.__now
+
+	def __rebase(self):
+		'''内部时钟过大时整体平移所有截止时间，只在执行任务时调用'''
+		offset = self.__now
+		self.__now = 0
+
+		# 所有截止时间减去相同的值，堆的顺序保持不变
+		queue = self.__queue
+
+		for index in range(len(queue)):
+			deadline, sequence, worker = queue[index]
+			queue[index] = (deadline - offset, sequence, worker)
+
+	def __schedule(self, worker:Worker, deadline:int):
+		self.__sequence += 1
+		heappush(self.__queue, (deadline, self.__sequence, worker))
+
+	def __interval(self, worker:Worker) -> int:
+		interval = worker.period // self.__adjusting_rate
+		return interval if interval > 0 else 1
+
+	def __next_delay(self) -> int:
+		'''获取距离最近的任务截止时间的毫秒数，没有任务时返回 None'''
+		queue = self.__queue
+
+		while queue and not queue[0][2].active:
+			heappop(queue)
+
+		if not queue:
+			return None
+
+		delay = queue[0][0] - self.__update_clock()
+
+		return delay if delay > 0 else 0
+
+	def __arm(self):
+		'''按照最近的截止时间重新设置单次定时器'''
+		if self.__dispatching or self.__paused:
+			return
+
+		if self.__timer is None:
+			if self.__wakeup is not None:
+				self.__wakeup.set()
+
+			return
+
+		# 计算等待时长期间阻止定时器回调修改任务堆，被跳过的回调由下面的定时器设置补上
+		self.__dispatching = True
+		delay = self.__next_delay()
+		self.__dispatching = False
+
+		if delay is None:
+			self.__timer.deinit()
+			return
 
 		self.__timer.init(
-			mode=Timer.PERIODIC,
-			period=Dispatcher.__DEFAULT_PERIOD,
+			mode=Timer.ONE_SHOT,
+			period=delay if delay > 0 else 1,
 			callback=self.__worker_callback
 		)
 
-	def deinit(self):
-		self.__timer.deinit()
-		self.__workers = {}
-
 	def __worker_callback(self, _):
-		if self.__paused: return
-
-		for worker in self.__workers.values():
+		if self.__paused or self.__dispatching: return
+
+		self.__dispatch()
+		self.__arm()
+
+		if self.__defer_mode == Dispatcher.DEFER_SCHEDULE and\
+		   self.__head != self.__tail and\
+		   not self.__drain_scheduled:
+			try:
+				micropython.schedule(self.__drain_cb, None)
+				self.__drain_scheduled = True
+			except RuntimeError:
+				# 系统调度队列已满，下次定时器回调时重试
+				pass
+
+	def __dispatch(self):
+		'''执行或延迟执行所有到期的任务，并按照执行间隔重新排队'''
+		self.__dispatching = True
+		queue = self.__queue
+
+		if self.__update_clock() >= Dispatcher.__REBASE_MS:
+			self.__rebase()
+
+		while queue and queue[0][0] <= self.__update_clock():
 			if self.__paused: break
 
-			worker.counter += 1
+			deadline, _, worker = heappop(queue)
+
+			if not worker.active:
+				continue
+
+			if worker.deferred:
+				self.__enqueue(worker)
+			else:
+				self.__run(worker)
+
+			# 任务执行期间可能被删除或替换
+			if worker.active:
+				interval = self.__interval(worker)
+				deadline += interval
+
+				if deadline <= self.__update_clock():
+					deadline = self.__now + interval
+
+					if self.__profiling:
+						self.__get_stats(worker)[Dispatcher.STAT_MISSED] += 1
+
+				self.__schedule(worker, deadline)
+
+		self.__dispatching = False
+
+	def __run(self, worker:Worker):
+		profiling = self.__profiling
+
+		if profiling:
+			alloc = gc.mem_alloc()
+			start = ticks_us()
+
+		try:
+			result = worker.do_work()
+
+			# asyncio 驱动时，任务返回的协程作为新的 asyncio 任务运行
+			if self.__asyncio is not None and result is not None and hasattr(result, 'send'):
+				self.__asyncio.create_task(result)
+		except Exception as e:
+			print(f'worker error: {e}')
+
+		if profiling:
+			elapsed = ticks_diff(ticks_us(), start)
+			alloc = gc.mem_alloc() - alloc
+			stats = self.__get_stats(worker)
+
+			stats[Dispatcher.STAT_COUNT] += 1
+			stats[Dispatcher.STAT_LAST_US] = elapsed
+			stats[Dispatcher.STAT_TOTAL_US] += elapsed
+			stats[Dispatcher.STAT_LAST_ALLOC] = alloc
+
+			if elapsed > stats[Dispatcher.STAT_MAX_US]:
+				stats[Dispatcher.STAT_MAX_US] = elapsed
 
-			if (worker.counter * Dispatcher.__DEFAULT_PERIOD * self.__adjusting_rate) % worker.period == 0:
-				worker.counter = 0
-				worker.do_work()
+			if alloc > stats[Dispatcher.STAT_MAX_ALLOC]:
+				stats[Dispatcher.STAT_MAX_ALLOC] = alloc
 
-	def add_work(self, work:function, period:int, *params) -> bool:
+	def __get_stats(self, worker:Worker) -> list:
+		'''获取任务统计数据，任务被替换后继续累计'''
+		key = id(worker.work)
+		item = self.__stats.get(key)
+
+		if item is None:
+			item = self.__stats[key] = (len(self.__stats) + 1, worker.name, [0] * 7)
+
+		return item[2]
+
+	def __enqueue(self, worker:Worker):
+		'''将到期的延迟任务加入待执行队列'''
+		if worker.pending:
+			self.__overruns += 1
+
+			if self.__profiling:
+				self.__get_stats(worker)[Dispatcher.STAT_MISSED] += 1
+
+			return
+
+		tail = (self.__tail + 1) % len(self.__pending)
+
+		if tail == self.__head:
+			self.__dropped += 1
+			return
+
+		worker.pending = True
+		self.__pending[self.__tail] = worker
+		self.__tail = tail
+
+	def __drain_pending_cb(self, _):
+		self.__drain_scheduled = False
+		self.run_pending()
+
+	def __clear_pending(self):
+		for index in range(len(self.__pending)):
+			self.__pending[index] = None
+
+		self.__head = self.__tail
+
+	def run_pending(self) -> int:
+		'''
+		执行待执行队列中的所有任务，DEFER_LOOP 模式下需要在主循环中调用
+
+		@return: 执行的任务数量
+		'''
+		count = 0
+
+		while self.__head != self.__tail:
+			head = self.__head
+			worker = self.__pending[head]
+			self.__pending[head] = None
+			self.__head = (head + 1) % len(self.__pending)
+
+			worker.pending = False
+
+			if worker.active:
+				self.__run(worker)
+				count += 1
+
+		return count
+
+	def add_work(self, work:function, period:int, *params, deferred:bool=False, name:str=None) -> bool:
 		'''
 		添加/更新一个调度任务
 
@@ -85,11 +363,28 @@ class Dispatcher(object):
 		- work：任务函数
 		- period：任务执行间隔，单位 毫秒
 		- params：任务函数参数列表
+		- deferred：是否延迟执行，耗时任务应设置为 True，默认值 False
+		- name：任务名称，用于统计数据，默认使用任务函数名称
 		'''
 		result = False
 
 		if callable(work):
-			self.__workers[id(work)] = Worker(work, period, *params)
+			last_worker = self.__workers.get(id(work))
+
+			if last_worker is not None:
+				last_worker.active = False
+
+			worker = Worker(work, period, *params, deferred=deferred, name=name)
+			self.__workers[id(work)] = worker
+
+			# 在主循环中调用时，排队期间定时器回调不能同时修改任务堆
+			dispatching = self.__dispatching
+			self.__dispatching = True
+			self.__schedule(worker, self.__update_clock() + self.__interval(worker))
+			self.__dispatching = dispatching
+
+			self.__arm()
+
 			result = True
 		else:
 			print('work must be a function')
@@ -117,31 +412,142 @@ class Dispatcher(object):
 		参数：
 		- work：任务函数，默认值 None
 		'''
+		worker = None
+
 		if work is None:
 			if len(self.__workers) > 0:
-				self.pause()
-				self.__workers.popitem()
-				self.pause()
+				worker = self.__workers.popitem()[1]
 		elif callable(work):
-			if self.has_work(work):
-				self.pause()
-				self.__workers.pop(id(work))
-				self.pause()
+			worker = self.__workers.pop(id(work), None)
+
+		# 已删除的任务留在堆中，到期或位于堆顶时再移除
+		if worker is not None:
+			worker.active = False
 
 	def del_works(self):
 		'''删除所有任务'''
-		self.pause()
+		for worker in self.__workers.values():
+			worker.active = False
+
 		self.__workers.clear()
-		self.pause()
+		self.__queue = []
+		self.__clear_pending()
+
+		if self.__timer is not None:
+			self.__timer.deinit()
 
 	def pause(self):
 		'''暂停/开启 所有任务'''
 		self.__paused = not self.__paused
-	
+
+		if not self.__paused:
+			self.__arm()
+
 	def is_paused(self):
 		'''判断所有任务是否正在运行'''
 		return self.__paused
 
+	async def run_async(self):
+		'''
+		在 asyncio 事件循环中运行调度器，初始化时需要将 timer_id 设置为 None
+
+		任务在事件循环中执行，返回协程的任务会作为新的 asyncio 任务运行
+		'''
+		try:
+			import uasyncio as asyncio
+		except ImportError:
+			import asyncio
+
+		self.__asyncio = asyncio
+		self.__wakeup  = asyncio.Event()
+
+		while True:
+			if not self.__paused:
+				self.__dispatch()
+				self.run_pending()
+
+			# 添加任务或恢复运行时会重新计算等待时长
+			self.__wakeup.clear()
+			delay = None if self.__paused else self.__next_delay()
+
+			if delay is None:
+				await self.__wakeup.wait()
+			elif delay > 0:
+				try:
+					await asyncio.wait_for(self.__wakeup.wait(), delay / 1000)
+				except asyncio.TimeoutError:
+					pass
+			else:
+				await asyncio.sleep(0)
+
+	def get_stats(self) -> dict:
+		'''
+		获取任务统计数据，同名的不同任务分别统计
+
+		@return: {task_id: (name, count, last_us, avg_us, max_us, missed, last_alloc, max_alloc)}
+		'''
+		result = {}
+
+		for task_id, name, stats in self.__stats.values():
+			count = stats[Dispatcher.STAT_COUNT]
+
+			result[task_id] = (
+				name,
+				count,
+				stats[Dispatcher.STAT_LAST_US],
+				stats[Dispatcher.STAT_TOTAL_US] // count if count else 0,
+				stats[Dispatcher.STAT_MAX_US],
+				stats[Dispatcher.STAT_MISSED],
+				stats[Dispatcher.STAT_LAST_ALLOC],
+				stats[Dispatcher.STAT_MAX_ALLOC]
+			)
+
+		return result
+
+	def dump_stats(self):
+		'''在 REPL 中输出任务统计数据'''
+		print(f'{"id":>4} {"task":<28}{"count":>8}{"last_us":>10}{"avg_us":>10}{"max_us":>10}{"missed":>8}{"alloc":>8}{"max_alloc":>10}')
+
+		for task_id, stats in sorted(self.get_stats().items()):
+			print(f'{task_id:>4} {stats[0]:<28}{stats[1]:>8}{stats[2]:>10}{stats[3]:>10}{stats[4]:>10}{stats[5]:>8}{stats[6]:>8}{stats[7]:>10}')
+
+		print(f'overruns: {self.__overruns}, dropped: {self.__dropped}, pending: {self.pending_count}')
+
+	def reset_stats(self):
+		'''清除任务统计数据'''
+		self.__stats = {}
+		self.__overruns = 0
+		self.__dropped = 0
+
+	@property
+	def profiling(self) -> bool:
+		return self.__profiling
+
+	@profiling.setter
+	def profiling(self, value:bool):
+		'''获取/设置是否统计任务执行数据'''
+		self.__profiling = bool(value)
+
+	@property
+	def is_async(self) -> bool:
+		'''判断调度器是否由 asyncio 驱动'''
+		return self.__timer is None
+
+	@property
+	def pending_count(self) -> int:
+		'''获取待执行队列中的任务数量'''
+		return (self.__tail - self.__head) % len(self.__pending)
+
+	@property
+	def overruns(self) -> int:
+		'''获取延迟任务再次到期时上一次仍未执行的次数'''
+		return self.__overruns
+
+	@property
+	def dropped(self) -> int:
+		'''获取因待执行队列已满被丢弃的任务次数'''
+		return self.__dropped
+
 
 def run_test():
 	from machine import RTC
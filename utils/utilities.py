@@ -3,16 +3,25 @@ Copyright © 2023 Walkline Wang (https://walkline.wang)
 Gitee: https://gitee.com/walkline/micropython-ws2812-led-clock
 """
 import utime
+import struct
 import ntptime
 import network
 from machine import RTC
 
+try:
+	import usocket as socket
+except ImportError:
+	import socket
+
 ntptime.host = 'ntp1.aliyun.com'
 # ntptime.host = 'ntp.ntsc.ac.cn'
 ntptime.timeout = 2
 
 
 class Utilities(object):
+	# 缓存的 ntp 服务器地址 (域名, 地址)
+	__ntp_address = None
+
 	@staticmethod
 	def import_config():
 		try:
@@ -35,17 +44,12 @@ class Utilities(object):
 	@staticmethod
 	def sync_time(retry=5) -> bool:
 		if network.WLAN(network.STA_IF).isconnected():
-			TIMEZONE = Utilities.import_config().TIMEZONE
-
 			print('syncing time...')
 
 			for _ in range(retry):
 				try:
 					ntptime.settime()
-					time = utime.localtime() # (year, month, mday, hour, minute, second, weekday, yearday)
-					RTC().datetime((time[0], time[1], time[2], time[6], time[3] + TIMEZONE, time[4], time[5], 0))
-					time = utime.localtime()
-					print(f'- success: {time[0]}-{time[1]:02d}-{time[2]:02d} {time[3]:02d}:{time[4]:02d}:{time[5]:02d}')
+					Utilities.__apply_timezone()
 					return True
 				except OSError as ose:
 					if str(ose) == '[Errno 116] ETIMEDOUT':
@@ -57,18 +61,107 @@ class Utilities(object):
 
 				utime.sleep(0.2)
 
-			if utime.time() < 60 * 60 * 2:
-				# first time sync time failed, reset
-				Utilities.hard_reset()
-			else:
-				print(f'- Cannot reach ntp host: {ntptime.host}, sync time failed')
-				time = utime.localtime()
-				print(f'- RTC: {time[0]}-{time[1]:02d}-{time[2]:02d} {time[3]:02d}:{time[4]:02d}:{time[5]:02d}')
+			Utilities.__sync_time_failed()
+		else:
+			print('- No wifi connected, sync time cancelled')
+
+		return False
+
+	@staticmethod
+	async def sync_time_async(retry=5) -> bool:
+		'''异步联网校时，等待服务器响应期间不阻塞 asyncio 事件循环'''
+		try:
+			import uasyncio as asyncio
+		except ImportError:
+			import asyncio
+
+		if network.WLAN(network.STA_IF).isconnected():
+			print('syncing time...')
+
+			try:
+				address = Utilities.__resolve_ntp_host()
+			except Exception as e:
+				print(e)
+				address = None
+
+			for _ in range(retry if address is not None else 0):
+				try:
+					seconds = await Utilities.__query_ntp_async(asyncio, address)
+
+					if seconds is not None:
+						# 与 ntptime.settime() 相同，先将 RTC 设置为 UTC 时间
+						time = utime.gmtime(seconds)
+						RTC().datetime((time[0], time[1], time[2], time[6] + 1, time[3], time[4], time[5], 0))
+						Utilities.__apply_timezone()
+						return True
+				except Exception as e:
+					print(e)
+
+				await asyncio.sleep(0.2)
+
+			Utilities.__sync_time_failed()
 		else:
 			print('- No wifi connected, sync time cancelled')
 
 		return False
 
+	@staticmethod
+	def __resolve_ntp_host():
+		'''获取 ntp 服务器地址，域名解析会阻塞，只在第一次使用或服务器变化时解析'''
+		if Utilities.__ntp_address is None or Utilities.__ntp_address[0] != ntptime.host:
+			Utilities.__ntp_address = (ntptime.host, socket.getaddrinfo(ntptime.host, 123)[0][-1])
+
+		return Utilities.__ntp_address[1]
+
+	@staticmethod
+	async def __query_ntp_async(asyncio, address) -> int:
+		'''使用非阻塞 socket 获取 ntp 服务器时间，超时返回 None'''
+		query = bytearray(48)
+		query[0] = 0x1B
+		udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		message = None
+
+		try:
+			udp.setblocking(False)
+			udp.sendto(query, address)
+			start = utime.ticks_ms()
+
+			while message is None:
+				try:
+					message = udp.recv(48)
+				except OSError:
+					if utime.ticks_diff(utime.ticks_ms(), start) >= ntptime.timeout * 1000:
+						return None
+
+					await asyncio.sleep(0.02)
+		finally:
+			udp.close()
+
+		# ntp 时间从 1900 年开始计算
+		ntp_delta = 3155673600 if utime.gmtime(0)[0] == 2000 else 2208988800
+
+		return struct.unpack('!I', message[40:44])[0] - ntp_delta
+
+	@staticmethod
+	def __apply_timezone():
+		'''将已同步为 UTC 时间的 RTC 调整为本地时间'''
+		TIMEZONE = Utilities.import_config().TIMEZONE
+
+		time = utime.localtime() # (year, month, mday, hour, minute, second, weekday, yearday)
+		RTC().datetime((time[0], time[1], time[2], time[6], time[3] + TIMEZONE, time[4], time[5], 0))
+		time = utime.localtime()
+		print(f'- success: {time[0]}-{time[1]:02d}-{time[2]:02d} {time[3]:02d}:{time[4]:02d}:{time[5]:02d}')
+
+	@staticmethod
+	def __sync_time_failed():
+		if utime.time() < 60 * 60 * 2:
+			# first time sync time failed, reset
+			Utilities.hard_reset()
+		else:
+			print(f'- Cannot reach ntp host: {ntptime.host}, sync time failed')
+			time = utime.localtime()
+			print(f'- RTC: {time[0]}-{time[1]:02d}-{time[2]:02d} {time[3]:02d}:{time[4]:02d}:{time[5]:02d}')
+
 
 if __name__ == '__main__':
 	from utils.wifihandler import WifiHandler
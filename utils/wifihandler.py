@@ -43,8 +43,47 @@ class WifiHandler(object):
 		return station.config('mac')
 
 	@staticmethod
-	def set_sta_mode(essid=None, password='', timeout_sec=600):
-		sleep_ms(1000)
+	def set_sta_mode(essid=None, password='', timeout_sec=600, idle_cb=None):
+		'''
+		联网，等待期间阻塞
+
+		参数：
+		- idle_cb：每次等待前调用的回调函数，用于在联网期间处理其它事件
+		'''
+		connecting = WifiHandler.__connecting(essid, password, timeout_sec)
+
+		try:
+			while True:
+				delay = next(connecting)
+
+				if idle_cb is not None:
+					idle_cb()
+
+				sleep_ms(delay)
+		except StopIteration as result:
+			return result.value
+
+	@staticmethod
+	async def set_sta_mode_async(essid=None, password='', timeout_sec=600):
+		'''异步联网，等待期间不阻塞 asyncio 事件循环'''
+		try:
+			import uasyncio as asyncio
+		except ImportError:
+			import asyncio
+
+		connecting = WifiHandler.__connecting(essid, password, timeout_sec)
+
+		try:
+			while True:
+				await asyncio.sleep(next(connecting) / 1000)
+		except StopIteration as result:
+			return result.value
+
+	@staticmethod
+	def __connecting(essid, password, timeout_sec):
+		'''联网过程生成器，每次返回需要等待的毫秒数，结束时返回联网状态'''
+		yield 1000
+
 		station = network.WLAN(network.STA_IF)
 		station.active(False)
 		station.active(True)
@@ -70,7 +109,7 @@ class WifiHandler(object):
 						bleconfig = BLEConfig()
 
 						while not bleconfig.success():
-							sleep_ms(100)
+							yield 100
 
 						essid = bleconfig.ssid
 						password = bleconfig.password
@@ -84,7 +123,7 @@ class WifiHandler(object):
 						smartconfig.start()
 
 						while not smartconfig.success():
-							sleep_ms(100)
+							yield 100
 
 						essid, password, sc_type, token = smartconfig.info()
 						using_smartconfig = True
@@ -110,7 +149,7 @@ class WifiHandler(object):
 					pass
 
 				retry_count += 1
-				sleep_ms(500)
+				yield 500
 
 		status_code = station.status()
 